@@ -52,6 +52,7 @@ set pi [expr 2.0*asin(1.0)];
 set n 10.0; # stiffness multiplier for CPH elements
 set addBasicRecorders 1
 set addDetailedRecorders 0
+if {![info exists binaryRecorders]} {set binaryRecorders 0}; # 1: element and drift recorders write binary .bin files
 
 # FRAME CENTERLINE DIMENSIONS
 set num_stories 17;
@@ -4511,10 +4512,19 @@ region 4 -nodes 4020103 4020203 4020303 4020403 4020503 4020603 4020703 4020803
 #                                     DETAILED RECORDERS                                          #
 ###################################################################################################
 
+# Recorder output format (binary files are read directly by frame_postprocess)
+if {$binaryRecorders == 1} {
+	set recorderOption -binary
+	set recorderExt bin
+} else {
+	set recorderOption -file
+	set recorderExt out
+}
+
 if {$addBasicRecorders == 1} {
 
 	# Recorders for lateral displacement on each panel zone
-	recorder Node -file $outdir/all_disp.out -dT 0.01 -time -nodes 4020103 4020203 4020303 4020403 4020503 4020603 4020703 4020803 4020903 4021003 4030103 4030203 4030303 4030403 4030503 4030603 4030703 4030803 4030903 4031003 4040103 4040203 4040303 4040403 4040503 4040603 4040703 4040803 4040903 4041003 4050103 4050203 4050303 4050403 4050503 4050603 4050703 4050803 4050903 4051003 4060103 4060203 4060303 4060403 4060503 4060603 4060703 4060803 4060903 4061003 4070103 4070203 4070303 4070403 4070503 4070603 4070703 4070803 4070903 4071003 4080103 4080203 4080303 4080403 4080503 4080603 4080703 4080803 4080903 4081003 4090103 4090203 4090303 4090403 4090503 4090603 4090703 4090803 4090903 4091003 4100103 4100203 4100303 4100403 4100503 4100603 4100703 4100803 4100903 4101003 4110203 4110303 4110403 4110503 4110603 4110703 4110803 4110903 4111003 4120303 4120403 4120503 4120603 4120703 4120803 4120903 4121003 4130403 4130503 4130603 4130703 4130803 4130903 4131003 4140603 4140703 4140803 4140903 4141003 4150603 4150703 4150803 4150903 4151003 4160603 4160703 4160803 4160903 4161003 4170603 4170703 4170803 4170903 4171003 4180603 4180703 4180803 4180903 4181003 -dof 1 disp;
+	recorder Node $recorderOption $outdir/all_disp.$recorderExt -dT 0.01 -time -nodes 4020103 4020203 4020303 4020403 4020503 4020603 4020703 4020803 4020903 4021003 4030103 4030203 4030303 4030403 4030503 4030603 4030703 4030803 4030903 4031003 4040103 4040203 4040303 4040403 4040503 4040603 4040703 4040803 4040903 4041003 4050103 4050203 4050303 4050403 4050503 4050603 4050703 4050803 4050903 4051003 4060103 4060203 4060303 4060403 4060503 4060603 4060703 4060803 4060903 4061003 4070103 4070203 4070303 4070403 4070503 4070603 4070703 4070803 4070903 4071003 4080103 4080203 4080303 4080403 4080503 4080603 4080703 4080803 4080903 4081003 4090103 4090203 4090303 4090403 4090503 4090603 4090703 4090803 4090903 4091003 4100103 4100203 4100303 4100403 4100503 4100603 4100703 4100803 4100903 4101003 4110203 4110303 4110403 4110503 4110603 4110703 4110803 4110903 4111003 4120303 4120403 4120503 4120603 4120703 4120803 4120903 4121003 4130403 4130503 4130603 4130703 4130803 4130903 4131003 4140603 4140703 4140803 4140903 4141003 4150603 4150703 4150803 4150903 4151003 4160603 4160703 4160803 4160903 4161003 4170603 4170703 4170803 4170903 4171003 4180603 4180703 4180803 4180903 4181003 -dof 1 disp;
 
 }
 
@@ -4522,29 +4532,29 @@ if {$addBasicRecorders == 1} {
 
 	# Recorders for beam fracture boolean
 	# Left-bottom flange
-	recorder Element -file $outdir/frac_LB.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 failure;
+	recorder Element $recorderOption $outdir/frac_LB.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 failure;
 
 	# Left-top flange
-	recorder Element -file $outdir/frac_LT.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 failure;
+	recorder Element $recorderOption $outdir/frac_LT.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 failure;
 
 	# Right-bottom flange
-	recorder Element -file $outdir/frac_RB.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 failure;
+	recorder Element $recorderOption $outdir/frac_RB.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 failure;
 
 	# Right-top flange
-	recorder Element -file $outdir/frac_RT.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 failure;
+	recorder Element $recorderOption $outdir/frac_RT.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 failure;
 
 	# Recorders for beam fracture index
 	# Left-bottom flange
-	recorder Element -file $outdir/FI_LB.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 damage;
+	recorder Element $recorderOption $outdir/FI_LB.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 damage;
 
 	# Left-top flange
-	recorder Element -file $outdir/FI_LT.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 damage;
+	recorder Element $recorderOption $outdir/FI_LT.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 damage;
 
 	# Right-bottom flange
-	recorder Element -file $outdir/FI_RB.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 damage;
+	recorder Element $recorderOption $outdir/FI_RB.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 damage;
 
 	# Right-top flange
-	recorder Element -file $outdir/FI_RT.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 damage;
+	recorder Element $recorderOption $outdir/FI_RT.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 damage;
 
 }
 
@@ -4552,67 +4562,67 @@ if {$addDetailedRecorders == 1} {
 
 	# Recorders for beam fracture index
 	# Left-bottom flange
-	recorder Element -file $outdir/ss_LB.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 stressStrain;
+	recorder Element $recorderOption $outdir/ss_LB.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 7 stressStrain;
 
 	# Left-top flange
-	recorder Element -file $outdir/ss_LT.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 stressStrain;
+	recorder Element $recorderOption $outdir/ss_LT.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 2 stressStrain;
 
 	# Right-bottom flange
-	recorder Element -file $outdir/ss_RB.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 stressStrain;
+	recorder Element $recorderOption $outdir/ss_RB.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 7 stressStrain;
 
 	# Right-top flange
-	recorder Element -file $outdir/ss_RT.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 stressStrain;
+	recorder Element $recorderOption $outdir/ss_RT.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 2 stressStrain;
 
 	# Recorders for slab fiber stressStrain
 
 	# Left-Concrete
-	recorder Element -file $outdir/slabComp_L.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 10 stressStrain;
+	recorder Element $recorderOption $outdir/slabComp_L.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 10 stressStrain;
 
 	# Left-Steel
-	recorder Element -file $outdir/slabTen_L.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 11 stressStrain;
+	recorder Element $recorderOption $outdir/slabTen_L.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 11 stressStrain;
 
 	# Right-Concrete
-	recorder Element -file $outdir/slabComp_R.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 10 stressStrain;
+	recorder Element $recorderOption $outdir/slabComp_R.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 10 stressStrain;
 
 	# Right-Steel
-	recorder Element -file $outdir/slabTen_R.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 11 stressStrain;
+	recorder Element $recorderOption $outdir/slabTen_R.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 11 stressStrain;
 
 	# Recorders for web fibers
 
 	# Left-web1
-	recorder Element -file $outdir/webfiber_L1.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 12 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_L1.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 12 stressStrain;
 
 	# Left-web2
-	recorder Element -file $outdir/webfiber_L2.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 13 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_L2.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 13 stressStrain;
 
 	# Left-web3
-	recorder Element -file $outdir/webfiber_L3.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 14 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_L3.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 14 stressStrain;
 
 
 	# Left-web4
-	recorder Element -file $outdir/webfiber_L4.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 15 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_L4.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section fiber 15 stressStrain;
 
 
 	# Right-web1
-	recorder Element -file $outdir/webfiber_R1.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 12 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_R1.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 12 stressStrain;
 
 	# Right-web2
-	recorder Element -file $outdir/webfiber_R2.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 13 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_R2.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 13 stressStrain;
 
 	# Right-web3
-	recorder Element -file $outdir/webfiber_R3.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 14 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_R3.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 14 stressStrain;
 
 
 	# Right-web4
-	recorder Element -file $outdir/webfiber_R4.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 15 stressStrain;
+	recorder Element $recorderOption $outdir/webfiber_R4.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section fiber 15 stressStrain;
 
 	# Recorders beam fiber-section element
 
 	# Left
-	recorder Element -file $outdir/def_left.out -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section deformation;
+	recorder Element $recorderOption $outdir/def_left.$recorderExt -dT 0.01 -ele 1020105 1020205 1020305 1020405 1020505 1020705 1020805 1020905 1030105 1030205 1030305 1030405 1030505 1030605 1030705 1030805 1030905 1040105 1040205 1040305 1040405 1040505 1040605 1040705 1040805 1040905 1050105 1050205 1050305 1050405 1050505 1050605 1050705 1050805 1050905 1060105 1060205 1060305 1060405 1060505 1060605 1060705 1060805 1060905 1070105 1070205 1070305 1070405 1070505 1070605 1070705 1070805 1070905 1080105 1080205 1080305 1080405 1080505 1080605 1080705 1080805 1080905 1090105 1090205 1090305 1090405 1090505 1090605 1090705 1090805 1090905 1100105 1100205 1100305 1100405 1100505 1100605 1100705 1100805 1100905 1110205 1110305 1110405 1110505 1110605 1110705 1110805 1110905 1120305 1120405 1120505 1120605 1120705 1120805 1120905 1130405 1130505 1130605 1130705 1130805 1130905 1140605 1140705 1140805 1140905 1150605 1150705 1150805 1150905 1160605 1160705 1160805 1160905 1170605 1170705 1170805 1170905 1180605 1180705 1180805 1180905 section deformation;
 
 	# Right
-	recorder Element -file $outdir/def_right.out -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section deformation;
+	recorder Element $recorderOption $outdir/def_right.$recorderExt -dT 0.01 -ele 1020106 1020206 1020306 1020406 1020506 1020706 1020806 1020906 1030106 1030206 1030306 1030406 1030506 1030606 1030706 1030806 1030906 1040106 1040206 1040306 1040406 1040506 1040606 1040706 1040806 1040906 1050106 1050206 1050306 1050406 1050506 1050606 1050706 1050806 1050906 1060106 1060206 1060306 1060406 1060506 1060606 1060706 1060806 1060906 1070106 1070206 1070306 1070406 1070506 1070606 1070706 1070806 1070906 1080106 1080206 1080306 1080406 1080506 1080606 1080706 1080806 1080906 1090106 1090206 1090306 1090406 1090506 1090606 1090706 1090806 1090906 1100106 1100206 1100306 1100406 1100506 1100606 1100706 1100806 1100906 1110206 1110306 1110406 1110506 1110606 1110706 1110806 1110906 1120306 1120406 1120506 1120606 1120706 1120806 1120906 1130406 1130506 1130606 1130706 1130806 1130906 1140606 1140706 1140806 1140906 1150606 1150706 1150806 1150906 1160606 1160706 1160806 1160906 1170606 1170706 1170806 1170906 1180606 1180706 1180806 1180906 section deformation;
 
 }
 
@@ -4621,41 +4631,41 @@ if {$addBasicRecorders == 1} {
 	# Recorders beam hinge element
 
 	# Left
-	recorder Element -file $outdir/hinge_left.out -dT 0.01 -ele 1020102 1020202 1020302 1020402 1020502 1020702 1020802 1020902 1030102 1030202 1030302 1030402 1030502 1030602 1030702 1030802 1030902 1040102 1040202 1040302 1040402 1040502 1040602 1040702 1040802 1040902 1050102 1050202 1050302 1050402 1050502 1050602 1050702 1050802 1050902 1060102 1060202 1060302 1060402 1060502 1060602 1060702 1060802 1060902 1070102 1070202 1070302 1070402 1070502 1070602 1070702 1070802 1070902 1080102 1080202 1080302 1080402 1080502 1080602 1080702 1080802 1080902 1090102 1090202 1090302 1090402 1090502 1090602 1090702 1090802 1090902 1100102 1100202 1100302 1100402 1100502 1100602 1100702 1100802 1100902 1110202 1110302 1110402 1110502 1110602 1110702 1110802 1110902 1120302 1120402 1120502 1120602 1120702 1120802 1120902 1130402 1130502 1130602 1130702 1130802 1130902 1140602 1140702 1140802 1140902 1150602 1150702 1150802 1150902 1160602 1160702 1160802 1160902 1170602 1170702 1170802 1170902 1180602 1180702 1180802 1180902 deformation;
+	recorder Element $recorderOption $outdir/hinge_left.$recorderExt -dT 0.01 -ele 1020102 1020202 1020302 1020402 1020502 1020702 1020802 1020902 1030102 1030202 1030302 1030402 1030502 1030602 1030702 1030802 1030902 1040102 1040202 1040302 1040402 1040502 1040602 1040702 1040802 1040902 1050102 1050202 1050302 1050402 1050502 1050602 1050702 1050802 1050902 1060102 1060202 1060302 1060402 1060502 1060602 1060702 1060802 1060902 1070102 1070202 1070302 1070402 1070502 1070602 1070702 1070802 1070902 1080102 1080202 1080302 1080402 1080502 1080602 1080702 1080802 1080902 1090102 1090202 1090302 1090402 1090502 1090602 1090702 1090802 1090902 1100102 1100202 1100302 1100402 1100502 1100602 1100702 1100802 1100902 1110202 1110302 1110402 1110502 1110602 1110702 1110802 1110902 1120302 1120402 1120502 1120602 1120702 1120802 1120902 1130402 1130502 1130602 1130702 1130802 1130902 1140602 1140702 1140802 1140902 1150602 1150702 1150802 1150902 1160602 1160702 1160802 1160902 1170602 1170702 1170802 1170902 1180602 1180702 1180802 1180902 deformation;
 
 	# Right
-	recorder Element -file $outdir/hinge_right.out -dT 0.01 -ele 1020104 1020204 1020304 1020404 1020504 1020704 1020804 1020904 1030104 1030204 1030304 1030404 1030504 1030604 1030704 1030804 1030904 1040104 1040204 1040304 1040404 1040504 1040604 1040704 1040804 1040904 1050104 1050204 1050304 1050404 1050504 1050604 1050704 1050804 1050904 1060104 1060204 1060304 1060404 1060504 1060604 1060704 1060804 1060904 1070104 1070204 1070304 1070404 1070504 1070604 1070704 1070804 1070904 1080104 1080204 1080304 1080404 1080504 1080604 1080704 1080804 1080904 1090104 1090204 1090304 1090404 1090504 1090604 1090704 1090804 1090904 1100104 1100204 1100304 1100404 1100504 1100604 1100704 1100804 1100904 1110204 1110304 1110404 1110504 1110604 1110704 1110804 1110904 1120304 1120404 1120504 1120604 1120704 1120804 1120904 1130404 1130504 1130604 1130704 1130804 1130904 1140604 1140704 1140804 1140904 1150604 1150704 1150804 1150904 1160604 1160704 1160804 1160904 1170604 1170704 1170804 1170904 1180604 1180704 1180804 1180904 deformation;
+	recorder Element $recorderOption $outdir/hinge_right.$recorderExt -dT 0.01 -ele 1020104 1020204 1020304 1020404 1020504 1020704 1020804 1020904 1030104 1030204 1030304 1030404 1030504 1030604 1030704 1030804 1030904 1040104 1040204 1040304 1040404 1040504 1040604 1040704 1040804 1040904 1050104 1050204 1050304 1050404 1050504 1050604 1050704 1050804 1050904 1060104 1060204 1060304 1060404 1060504 1060604 1060704 1060804 1060904 1070104 1070204 1070304 1070404 1070504 1070604 1070704 1070804 1070904 1080104 1080204 1080304 1080404 1080504 1080604 1080704 1080804 1080904 1090104 1090204 1090304 1090404 1090504 1090604 1090704 1090804 1090904 1100104 1100204 1100304 1100404 1100504 1100604 1100704 1100804 1100904 1110204 1110304 1110404 1110504 1110604 1110704 1110804 1110904 1120304 1120404 1120504 1120604 1120704 1120804 1120904 1130404 1130504 1130604 1130704 1130804 1130904 1140604 1140704 1140804 1140904 1150604 1150704 1150804 1150904 1160604 1160704 1160804 1160904 1170604 1170704 1170804 1170904 1180604 1180704 1180804 1180904 deformation;
 }
 
 if {$addDetailedRecorders == 1} {
 
-	recorder Element -file $outdir/hinge_right_force.out -dT 0.01 -ele 1020104 1020204 1020304 1020404 1020504 1020704 1020804 1020904 1030104 1030204 1030304 1030404 1030504 1030604 1030704 1030804 1030904 1040104 1040204 1040304 1040404 1040504 1040604 1040704 1040804 1040904 1050104 1050204 1050304 1050404 1050504 1050604 1050704 1050804 1050904 1060104 1060204 1060304 1060404 1060504 1060604 1060704 1060804 1060904 1070104 1070204 1070304 1070404 1070504 1070604 1070704 1070804 1070904 1080104 1080204 1080304 1080404 1080504 1080604 1080704 1080804 1080904 1090104 1090204 1090304 1090404 1090504 1090604 1090704 1090804 1090904 1100104 1100204 1100304 1100404 1100504 1100604 1100704 1100804 1100904 1110204 1110304 1110404 1110504 1110604 1110704 1110804 1110904 1120304 1120404 1120504 1120604 1120704 1120804 1120904 1130404 1130504 1130604 1130704 1130804 1130904 1140604 1140704 1140804 1140904 1150604 1150704 1150804 1150904 1160604 1160704 1160804 1160904 1170604 1170704 1170804 1170904 1180604 1180704 1180804 1180904 force;
+	recorder Element $recorderOption $outdir/hinge_right_force.$recorderExt -dT 0.01 -ele 1020104 1020204 1020304 1020404 1020504 1020704 1020804 1020904 1030104 1030204 1030304 1030404 1030504 1030604 1030704 1030804 1030904 1040104 1040204 1040304 1040404 1040504 1040604 1040704 1040804 1040904 1050104 1050204 1050304 1050404 1050504 1050604 1050704 1050804 1050904 1060104 1060204 1060304 1060404 1060504 1060604 1060704 1060804 1060904 1070104 1070204 1070304 1070404 1070504 1070604 1070704 1070804 1070904 1080104 1080204 1080304 1080404 1080504 1080604 1080704 1080804 1080904 1090104 1090204 1090304 1090404 1090504 1090604 1090704 1090804 1090904 1100104 1100204 1100304 1100404 1100504 1100604 1100704 1100804 1100904 1110204 1110304 1110404 1110504 1110604 1110704 1110804 1110904 1120304 1120404 1120504 1120604 1120704 1120804 1120904 1130404 1130504 1130604 1130704 1130804 1130904 1140604 1140704 1140804 1140904 1150604 1150704 1150804 1150904 1160604 1160704 1160804 1160904 1170604 1170704 1170804 1170904 1180604 1180704 1180804 1180904 force;
 
-	recorder Element -file $outdir/hinge_left_force.out -dT 0.01 -ele 1020102 1020202 1020302 1020402 1020502 1020702 1020802 1020902 1030102 1030202 1030302 1030402 1030502 1030602 1030702 1030802 1030902 1040102 1040202 1040302 1040402 1040502 1040602 1040702 1040802 1040902 1050102 1050202 1050302 1050402 1050502 1050602 1050702 1050802 1050902 1060102 1060202 1060302 1060402 1060502 1060602 1060702 1060802 1060902 1070102 1070202 1070302 1070402 1070502 1070602 1070702 1070802 1070902 1080102 1080202 1080302 1080402 1080502 1080602 1080702 1080802 1080902 1090102 1090202 1090302 1090402 1090502 1090602 1090702 1090802 1090902 1100102 1100202 1100302 1100402 1100502 1100602 1100702 1100802 1100902 1110202 1110302 1110402 1110502 1110602 1110702 1110802 1110902 1120302 1120402 1120502 1120602 1120702 1120802 1120902 1130402 1130502 1130602 1130702 1130802 1130902 1140602 1140702 1140802 1140902 1150602 1150702 1150802 1150902 1160602 1160702 1160802 1160902 1170602 1170702 1170802 1170902 1180602 1180702 1180802 1180902 force;
+	recorder Element $recorderOption $outdir/hinge_left_force.$recorderExt -dT 0.01 -ele 1020102 1020202 1020302 1020402 1020502 1020702 1020802 1020902 1030102 1030202 1030302 1030402 1030502 1030602 1030702 1030802 1030902 1040102 1040202 1040302 1040402 1040502 1040602 1040702 1040802 1040902 1050102 1050202 1050302 1050402 1050502 1050602 1050702 1050802 1050902 1060102 1060202 1060302 1060402 1060502 1060602 1060702 1060802 1060902 1070102 1070202 1070302 1070402 1070502 1070602 1070702 1070802 1070902 1080102 1080202 1080302 1080402 1080502 1080602 1080702 1080802 1080902 1090102 1090202 1090302 1090402 1090502 1090602 1090702 1090802 1090902 1100102 1100202 1100302 1100402 1100502 1100602 1100702 1100802 1100902 1110202 1110302 1110402 1110502 1110602 1110702 1110802 1110902 1120302 1120402 1120502 1120602 1120702 1120802 1120902 1130402 1130502 1130602 1130702 1130802 1130902 1140602 1140702 1140802 1140902 1150602 1150702 1150802 1150902 1160602 1160702 1160802 1160902 1170602 1170702 1170802 1170902 1180602 1180702 1180802 1180902 force;
 }
 
 if {$addDetailedRecorders == 1} {
 
 	# Recorders for beam internal forces
-	recorder Element -file $outdir/beam_forces.out -dT 0.01 -ele 1020100 1020200 1020300 1020400 1020500 1020700 1020800 1020900 1030100 1030200 1030300 1030400 1030500 1030600 1030700 1030800 1030900 1040100 1040200 1040300 1040400 1040500 1040600 1040700 1040800 1040900 1050100 1050200 1050300 1050400 1050500 1050600 1050700 1050800 1050900 1060100 1060200 1060300 1060400 1060500 1060600 1060700 1060800 1060900 1070100 1070200 1070300 1070400 1070500 1070600 1070700 1070800 1070900 1080100 1080200 1080300 1080400 1080500 1080600 1080700 1080800 1080900 1090100 1090200 1090300 1090400 1090500 1090600 1090700 1090800 1090900 1100100 1100200 1100300 1100400 1100500 1100600 1100700 1100800 1100900 1110200 1110300 1110400 1110500 1110600 1110700 1110800 1110900 1120300 1120400 1120500 1120600 1120700 1120800 1120900 1130400 1130500 1130600 1130700 1130800 1130900 1140600 1140700 1140800 1140900 1150600 1150700 1150800 1150900 1160600 1160700 1160800 1160900 1170600 1170700 1170800 1170900 1180600 1180700 1180800 1180900 globalForce;
+	recorder Element $recorderOption $outdir/beam_forces.$recorderExt -dT 0.01 -ele 1020100 1020200 1020300 1020400 1020500 1020700 1020800 1020900 1030100 1030200 1030300 1030400 1030500 1030600 1030700 1030800 1030900 1040100 1040200 1040300 1040400 1040500 1040600 1040700 1040800 1040900 1050100 1050200 1050300 1050400 1050500 1050600 1050700 1050800 1050900 1060100 1060200 1060300 1060400 1060500 1060600 1060700 1060800 1060900 1070100 1070200 1070300 1070400 1070500 1070600 1070700 1070800 1070900 1080100 1080200 1080300 1080400 1080500 1080600 1080700 1080800 1080900 1090100 1090200 1090300 1090400 1090500 1090600 1090700 1090800 1090900 1100100 1100200 1100300 1100400 1100500 1100600 1100700 1100800 1100900 1110200 1110300 1110400 1110500 1110600 1110700 1110800 1110900 1120300 1120400 1120500 1120600 1120700 1120800 1120900 1130400 1130500 1130600 1130700 1130800 1130900 1140600 1140700 1140800 1140900 1150600 1150700 1150800 1150900 1160600 1160700 1160800 1160900 1170600 1170700 1170800 1170900 1180600 1180700 1180800 1180900 globalForce;
 
 }
 
 if {$addDetailedRecorders == 1} {
 
 	# Recorders for column internal forces
-	recorder Element -file $outdir/column_forces.out -dT 0.01 -ele 2010100 2020100 2030100 2040100 2050100 2060100 2070100 2080100 2090100 2010200 2020200 2030200 2040200 2050200 2060200 2070200 2080200 2090200 2100200 2010300 2020300 2030300 2040300 2050300 2060300 2070300 2080300 2090300 2100300 2110300 2010400 2020400 2030400 2040400 2050400 2060400 2070400 2080400 2090400 2100400 2110400 2120400 2010500 2020500 2030500 2040500 2050500 2060500 2070500 2080500 2090500 2100500 2110500 2120500 2010600 2020600 2030600 2040600 2050600 2060600 2070600 2080600 2090600 2100600 2110600 2120600 2130600 2140600 2150600 2160600 2170600 2010700 2020700 2030700 2040700 2050700 2060700 2070700 2080700 2090700 2100700 2110700 2120700 2130700 2140700 2150700 2160700 2170700 2010800 2020800 2030800 2040800 2050800 2060800 2070800 2080800 2090800 2100800 2110800 2120800 2130800 2140800 2150800 2160800 2170800 2010900 2020900 2030900 2040900 2050900 2060900 2070900 2080900 2090900 2100900 2110900 2120900 2130900 2140900 2150900 2160900 2170900 2011000 2021000 2031000 2041000 2051000 2061000 2071000 2081000 2091000 2101000 2111000 2121000 2131000 2141000 2151000 2161000 2171000 globalForce;
+	recorder Element $recorderOption $outdir/column_forces.$recorderExt -dT 0.01 -ele 2010100 2020100 2030100 2040100 2050100 2060100 2070100 2080100 2090100 2010200 2020200 2030200 2040200 2050200 2060200 2070200 2080200 2090200 2100200 2010300 2020300 2030300 2040300 2050300 2060300 2070300 2080300 2090300 2100300 2110300 2010400 2020400 2030400 2040400 2050400 2060400 2070400 2080400 2090400 2100400 2110400 2120400 2010500 2020500 2030500 2040500 2050500 2060500 2070500 2080500 2090500 2100500 2110500 2120500 2010600 2020600 2030600 2040600 2050600 2060600 2070600 2080600 2090600 2100600 2110600 2120600 2130600 2140600 2150600 2160600 2170600 2010700 2020700 2030700 2040700 2050700 2060700 2070700 2080700 2090700 2100700 2110700 2120700 2130700 2140700 2150700 2160700 2170700 2010800 2020800 2030800 2040800 2050800 2060800 2070800 2080800 2090800 2100800 2110800 2120800 2130800 2140800 2150800 2160800 2170800 2010900 2020900 2030900 2040900 2050900 2060900 2070900 2080900 2090900 2100900 2110900 2120900 2130900 2140900 2150900 2160900 2170900 2011000 2021000 2031000 2041000 2051000 2061000 2071000 2081000 2091000 2101000 2111000 2121000 2131000 2141000 2151000 2161000 2171000 globalForce;
 
 }
 
 if {$addBasicRecorders == 1} {
 
 	# Recorders column splices
-	recorder Element -file $outdir/ss_splice.out -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005 section fiber 0 stressStrain;
+	recorder Element $recorderOption $outdir/ss_splice.$recorderExt -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005 section fiber 0 stressStrain;
 
-	recorder Element -file $outdir/def_splice.out -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005  deformation;
+	recorder Element $recorderOption $outdir/def_splice.$recorderExt -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005  deformation;
 
-	recorder Element -file $outdir/force_splice.out -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005  localForce;
+	recorder Element $recorderOption $outdir/force_splice.$recorderExt -dT 0.01 -ele 2020105 2040105 2060105 2080105 2020205 2040205 2060205 2080205 2100205 2020305 2040305 2060305 2080305 2100305 2020405 2040405 2060405 2080405 2100405 2120405 2020505 2040505 2060505 2080505 2100505 2120505 2020605 2040605 2060605 2080605 2100605 2120605 2140605 2160605 2020705 2040705 2060705 2080705 2100705 2120705 2140705 2160705 2020805 2040805 2060805 2080805 2100805 2120805 2140805 2160805 2020905 2040905 2060905 2080905 2100905 2120905 2140905 2160905 2021005 2041005 2061005 2081005 2101005 2121005 2141005 2161005  localForce;
 
 }
 
@@ -4663,27 +4673,27 @@ if {$addBasicRecorders == 1} {
 
 	# Recorders column hinges
 	# Bottom
-	recorder Element -file $outdir/hinge_bot.out -dT 0.01 -ele 2020103 2040103 2060103 2080103 2020203 2040203 2060203 2080203 2100203 2020303 2040303 2060303 2080303 2100303 2020403 2040403 2060403 2080403 2100403 2120403 2020503 2040503 2060503 2080503 2100503 2120503 2020603 2040603 2060603 2080603 2100603 2120603 2140603 2160603 2020703 2040703 2060703 2080703 2100703 2120703 2140703 2160703 2020803 2040803 2060803 2080803 2100803 2120803 2140803 2160803 2020903 2040903 2060903 2080903 2100903 2120903 2140903 2160903 2021003 2041003 2061003 2081003 2101003 2121003 2141003 2161003 2010101 2010201 2010301 2010401 2010501 2010601 2010701 2010801 2010901 2011001 2030101 2030201 2030301 2030401 2030501 2030601 2030701 2030801 2030901 2031001 2050101 2050201 2050301 2050401 2050501 2050601 2050701 2050801 2050901 2051001 2070101 2070201 2070301 2070401 2070501 2070601 2070701 2070801 2070901 2071001 2090101 2090201 2090301 2090401 2090501 2090601 2090701 2090801 2090901 2091001 2110301 2110401 2110501 2110601 2110701 2110801 2110901 2111001 2130601 2130701 2130801 2130901 2131001 2150601 2150701 2150801 2150901 2151001 2170601 2170701 2170801 2170901 2171001 deformation;
+	recorder Element $recorderOption $outdir/hinge_bot.$recorderExt -dT 0.01 -ele 2020103 2040103 2060103 2080103 2020203 2040203 2060203 2080203 2100203 2020303 2040303 2060303 2080303 2100303 2020403 2040403 2060403 2080403 2100403 2120403 2020503 2040503 2060503 2080503 2100503 2120503 2020603 2040603 2060603 2080603 2100603 2120603 2140603 2160603 2020703 2040703 2060703 2080703 2100703 2120703 2140703 2160703 2020803 2040803 2060803 2080803 2100803 2120803 2140803 2160803 2020903 2040903 2060903 2080903 2100903 2120903 2140903 2160903 2021003 2041003 2061003 2081003 2101003 2121003 2141003 2161003 2010101 2010201 2010301 2010401 2010501 2010601 2010701 2010801 2010901 2011001 2030101 2030201 2030301 2030401 2030501 2030601 2030701 2030801 2030901 2031001 2050101 2050201 2050301 2050401 2050501 2050601 2050701 2050801 2050901 2051001 2070101 2070201 2070301 2070401 2070501 2070601 2070701 2070801 2070901 2071001 2090101 2090201 2090301 2090401 2090501 2090601 2090701 2090801 2090901 2091001 2110301 2110401 2110501 2110601 2110701 2110801 2110901 2111001 2130601 2130701 2130801 2130901 2131001 2150601 2150701 2150801 2150901 2151001 2170601 2170701 2170801 2170901 2171001 deformation;
 	# Top
-	recorder Element -file $outdir/hinge_top.out -dT 0.01 -ele 2020104 2040104 2060104 2080104 2020204 2040204 2060204 2080204 2100204 2020304 2040304 2060304 2080304 2100304 2020404 2040404 2060404 2080404 2100404 2120404 2020504 2040504 2060504 2080504 2100504 2120504 2020604 2040604 2060604 2080604 2100604 2120604 2140604 2160604 2020704 2040704 2060704 2080704 2100704 2120704 2140704 2160704 2020804 2040804 2060804 2080804 2100804 2120804 2140804 2160804 2020904 2040904 2060904 2080904 2100904 2120904 2140904 2160904 2021004 2041004 2061004 2081004 2101004 2121004 2141004 2161004 2010102 2010202 2010302 2010402 2010502 2010602 2010702 2010802 2010902 2011002 2030102 2030202 2030302 2030402 2030502 2030602 2030702 2030802 2030902 2031002 2050102 2050202 2050302 2050402 2050502 2050602 2050702 2050802 2050902 2051002 2070102 2070202 2070302 2070402 2070502 2070602 2070702 2070802 2070902 2071002 2090102 2090202 2090302 2090402 2090502 2090602 2090702 2090802 2090902 2091002 2110302 2110402 2110502 2110602 2110702 2110802 2110902 2111002 2130602 2130702 2130802 2130902 2131002 2150602 2150702 2150802 2150902 2151002 2170602 2170702 2170802 2170902 2171002 deformation;
+	recorder Element $recorderOption $outdir/hinge_top.$recorderExt -dT 0.01 -ele 2020104 2040104 2060104 2080104 2020204 2040204 2060204 2080204 2100204 2020304 2040304 2060304 2080304 2100304 2020404 2040404 2060404 2080404 2100404 2120404 2020504 2040504 2060504 2080504 2100504 2120504 2020604 2040604 2060604 2080604 2100604 2120604 2140604 2160604 2020704 2040704 2060704 2080704 2100704 2120704 2140704 2160704 2020804 2040804 2060804 2080804 2100804 2120804 2140804 2160804 2020904 2040904 2060904 2080904 2100904 2120904 2140904 2160904 2021004 2041004 2061004 2081004 2101004 2121004 2141004 2161004 2010102 2010202 2010302 2010402 2010502 2010602 2010702 2010802 2010902 2011002 2030102 2030202 2030302 2030402 2030502 2030602 2030702 2030802 2030902 2031002 2050102 2050202 2050302 2050402 2050502 2050602 2050702 2050802 2050902 2051002 2070102 2070202 2070302 2070402 2070502 2070602 2070702 2070802 2070902 2071002 2090102 2090202 2090302 2090402 2090502 2090602 2090702 2090802 2090902 2091002 2110302 2110402 2110502 2110602 2110702 2110802 2110902 2111002 2130602 2130702 2130802 2130902 2131002 2150602 2150702 2150802 2150902 2151002 2170602 2170702 2170802 2170902 2171002 deformation;
 }
 
 if {$addDetailedRecorders == 1} {
 
 	# Bottom
-	recorder Element -file $outdir/hinge_bot_force.out -dT 0.01 -ele 2020103 2040103 2060103 2080103 2020203 2040203 2060203 2080203 2100203 2020303 2040303 2060303 2080303 2100303 2020403 2040403 2060403 2080403 2100403 2120403 2020503 2040503 2060503 2080503 2100503 2120503 2020603 2040603 2060603 2080603 2100603 2120603 2140603 2160603 2020703 2040703 2060703 2080703 2100703 2120703 2140703 2160703 2020803 2040803 2060803 2080803 2100803 2120803 2140803 2160803 2020903 2040903 2060903 2080903 2100903 2120903 2140903 2160903 2021003 2041003 2061003 2081003 2101003 2121003 2141003 2161003 2010101 2010201 2010301 2010401 2010501 2010601 2010701 2010801 2010901 2011001 2030101 2030201 2030301 2030401 2030501 2030601 2030701 2030801 2030901 2031001 2050101 2050201 2050301 2050401 2050501 2050601 2050701 2050801 2050901 2051001 2070101 2070201 2070301 2070401 2070501 2070601 2070701 2070801 2070901 2071001 2090101 2090201 2090301 2090401 2090501 2090601 2090701 2090801 2090901 2091001 2110301 2110401 2110501 2110601 2110701 2110801 2110901 2111001 2130601 2130701 2130801 2130901 2131001 2150601 2150701 2150801 2150901 2151001 2170601 2170701 2170801 2170901 2171001 force;
+	recorder Element $recorderOption $outdir/hinge_bot_force.$recorderExt -dT 0.01 -ele 2020103 2040103 2060103 2080103 2020203 2040203 2060203 2080203 2100203 2020303 2040303 2060303 2080303 2100303 2020403 2040403 2060403 2080403 2100403 2120403 2020503 2040503 2060503 2080503 2100503 2120503 2020603 2040603 2060603 2080603 2100603 2120603 2140603 2160603 2020703 2040703 2060703 2080703 2100703 2120703 2140703 2160703 2020803 2040803 2060803 2080803 2100803 2120803 2140803 2160803 2020903 2040903 2060903 2080903 2100903 2120903 2140903 2160903 2021003 2041003 2061003 2081003 2101003 2121003 2141003 2161003 2010101 2010201 2010301 2010401 2010501 2010601 2010701 2010801 2010901 2011001 2030101 2030201 2030301 2030401 2030501 2030601 2030701 2030801 2030901 2031001 2050101 2050201 2050301 2050401 2050501 2050601 2050701 2050801 2050901 2051001 2070101 2070201 2070301 2070401 2070501 2070601 2070701 2070801 2070901 2071001 2090101 2090201 2090301 2090401 2090501 2090601 2090701 2090801 2090901 2091001 2110301 2110401 2110501 2110601 2110701 2110801 2110901 2111001 2130601 2130701 2130801 2130901 2131001 2150601 2150701 2150801 2150901 2151001 2170601 2170701 2170801 2170901 2171001 force;
 	# Top
-	recorder Element -file $outdir/hinge_top_force.out -dT 0.01 -ele 2020104 2040104 2060104 2080104 2020204 2040204 2060204 2080204 2100204 2020304 2040304 2060304 2080304 2100304 2020404 2040404 2060404 2080404 2100404 2120404 2020504 2040504 2060504 2080504 2100504 2120504 2020604 2040604 2060604 2080604 2100604 2120604 2140604 2160604 2020704 2040704 2060704 2080704 2100704 2120704 2140704 2160704 2020804 2040804 2060804 2080804 2100804 2120804 2140804 2160804 2020904 2040904 2060904 2080904 2100904 2120904 2140904 2160904 2021004 2041004 2061004 2081004 2101004 2121004 2141004 2161004 2010102 2010202 2010302 2010402 2010502 2010602 2010702 2010802 2010902 2011002 2030102 2030202 2030302 2030402 2030502 2030602 2030702 2030802 2030902 2031002 2050102 2050202 2050302 2050402 2050502 2050602 2050702 2050802 2050902 2051002 2070102 2070202 2070302 2070402 2070502 2070602 2070702 2070802 2070902 2071002 2090102 2090202 2090302 2090402 2090502 2090602 2090702 2090802 2090902 2091002 2110302 2110402 2110502 2110602 2110702 2110802 2110902 2111002 2130602 2130702 2130802 2130902 2131002 2150602 2150702 2150802 2150902 2151002 2170602 2170702 2170802 2170902 2171002 force;
+	recorder Element $recorderOption $outdir/hinge_top_force.$recorderExt -dT 0.01 -ele 2020104 2040104 2060104 2080104 2020204 2040204 2060204 2080204 2100204 2020304 2040304 2060304 2080304 2100304 2020404 2040404 2060404 2080404 2100404 2120404 2020504 2040504 2060504 2080504 2100504 2120504 2020604 2040604 2060604 2080604 2100604 2120604 2140604 2160604 2020704 2040704 2060704 2080704 2100704 2120704 2140704 2160704 2020804 2040804 2060804 2080804 2100804 2120804 2140804 2160804 2020904 2040904 2060904 2080904 2100904 2120904 2140904 2160904 2021004 2041004 2061004 2081004 2101004 2121004 2141004 2161004 2010102 2010202 2010302 2010402 2010502 2010602 2010702 2010802 2010902 2011002 2030102 2030202 2030302 2030402 2030502 2030602 2030702 2030802 2030902 2031002 2050102 2050202 2050302 2050402 2050502 2050602 2050702 2050802 2050902 2051002 2070102 2070202 2070302 2070402 2070502 2070602 2070702 2070802 2070902 2071002 2090102 2090202 2090302 2090402 2090502 2090602 2090702 2090802 2090902 2091002 2110302 2110402 2110502 2110602 2110702 2110802 2110902 2111002 2130602 2130702 2130802 2130902 2131002 2150602 2150702 2150802 2150902 2151002 2170602 2170702 2170802 2170902 2171002 force;
 }
 
 if {$addBasicRecorders == 1} {
 
 	# Recorders panel zone elements
-	recorder Element -file $outdir/pz_rot.out -dT 0.01 -ele 9010100 9010200 9010300 9010400 9010500 9010600 9010700 9010800 9010900 9011000 9020100 9020200 9020300 9020400 9020500 9020600 9020700 9020800 9020900 9021000 9030100 9030200 9030300 9030400 9030500 9030600 9030700 9030800 9030900 9031000 9040100 9040200 9040300 9040400 9040500 9040600 9040700 9040800 9040900 9041000 9050100 9050200 9050300 9050400 9050500 9050600 9050700 9050800 9050900 9051000 9060100 9060200 9060300 9060400 9060500 9060600 9060700 9060800 9060900 9061000 9070100 9070200 9070300 9070400 9070500 9070600 9070700 9070800 9070900 9071000 9080100 9080200 9080300 9080400 9080500 9080600 9080700 9080800 9080900 9081000 9090100 9090200 9090300 9090400 9090500 9090600 9090700 9090800 9090900 9091000 9100100 9100200 9100300 9100400 9100500 9100600 9100700 9100800 9100900 9101000 9110200 9110300 9110400 9110500 9110600 9110700 9110800 9110900 9111000 9120300 9120400 9120500 9120600 9120700 9120800 9120900 9121000 9130400 9130500 9130600 9130700 9130800 9130900 9131000 9140600 9140700 9140800 9140900 9141000 9150600 9150700 9150800 9150900 9151000 9160600 9160700 9160800 9160900 9161000 9170600 9170700 9170800 9170900 9171000 9180600 9180700 9180800 9180900 9181000 deformation;
+	recorder Element $recorderOption $outdir/pz_rot.$recorderExt -dT 0.01 -ele 9010100 9010200 9010300 9010400 9010500 9010600 9010700 9010800 9010900 9011000 9020100 9020200 9020300 9020400 9020500 9020600 9020700 9020800 9020900 9021000 9030100 9030200 9030300 9030400 9030500 9030600 9030700 9030800 9030900 9031000 9040100 9040200 9040300 9040400 9040500 9040600 9040700 9040800 9040900 9041000 9050100 9050200 9050300 9050400 9050500 9050600 9050700 9050800 9050900 9051000 9060100 9060200 9060300 9060400 9060500 9060600 9060700 9060800 9060900 9061000 9070100 9070200 9070300 9070400 9070500 9070600 9070700 9070800 9070900 9071000 9080100 9080200 9080300 9080400 9080500 9080600 9080700 9080800 9080900 9081000 9090100 9090200 9090300 9090400 9090500 9090600 9090700 9090800 9090900 9091000 9100100 9100200 9100300 9100400 9100500 9100600 9100700 9100800 9100900 9101000 9110200 9110300 9110400 9110500 9110600 9110700 9110800 9110900 9111000 9120300 9120400 9120500 9120600 9120700 9120800 9120900 9121000 9130400 9130500 9130600 9130700 9130800 9130900 9131000 9140600 9140700 9140800 9140900 9141000 9150600 9150700 9150800 9150900 9151000 9160600 9160700 9160800 9160900 9161000 9170600 9170700 9170800 9170900 9171000 9180600 9180700 9180800 9180900 9181000 deformation;
 }
 
 if {$addDetailedRecorders == 1} {
 
-	recorder Element -file $outdir/pz_M.out -dT 0.01 -ele 9010100 9010200 9010300 9010400 9010500 9010600 9010700 9010800 9010900 9011000 9020100 9020200 9020300 9020400 9020500 9020600 9020700 9020800 9020900 9021000 9030100 9030200 9030300 9030400 9030500 9030600 9030700 9030800 9030900 9031000 9040100 9040200 9040300 9040400 9040500 9040600 9040700 9040800 9040900 9041000 9050100 9050200 9050300 9050400 9050500 9050600 9050700 9050800 9050900 9051000 9060100 9060200 9060300 9060400 9060500 9060600 9060700 9060800 9060900 9061000 9070100 9070200 9070300 9070400 9070500 9070600 9070700 9070800 9070900 9071000 9080100 9080200 9080300 9080400 9080500 9080600 9080700 9080800 9080900 9081000 9090100 9090200 9090300 9090400 9090500 9090600 9090700 9090800 9090900 9091000 9100100 9100200 9100300 9100400 9100500 9100600 9100700 9100800 9100900 9101000 9110200 9110300 9110400 9110500 9110600 9110700 9110800 9110900 9111000 9120300 9120400 9120500 9120600 9120700 9120800 9120900 9121000 9130400 9130500 9130600 9130700 9130800 9130900 9131000 9140600 9140700 9140800 9140900 9141000 9150600 9150700 9150800 9150900 9151000 9160600 9160700 9160800 9160900 9161000 9170600 9170700 9170800 9170900 9171000 9180600 9180700 9180800 9180900 9181000 force;
+	recorder Element $recorderOption $outdir/pz_M.$recorderExt -dT 0.01 -ele 9010100 9010200 9010300 9010400 9010500 9010600 9010700 9010800 9010900 9011000 9020100 9020200 9020300 9020400 9020500 9020600 9020700 9020800 9020900 9021000 9030100 9030200 9030300 9030400 9030500 9030600 9030700 9030800 9030900 9031000 9040100 9040200 9040300 9040400 9040500 9040600 9040700 9040800 9040900 9041000 9050100 9050200 9050300 9050400 9050500 9050600 9050700 9050800 9050900 9051000 9060100 9060200 9060300 9060400 9060500 9060600 9060700 9060800 9060900 9061000 9070100 9070200 9070300 9070400 9070500 9070600 9070700 9070800 9070900 9071000 9080100 9080200 9080300 9080400 9080500 9080600 9080700 9080800 9080900 9081000 9090100 9090200 9090300 9090400 9090500 9090600 9090700 9090800 9090900 9091000 9100100 9100200 9100300 9100400 9100500 9100600 9100700 9100800 9100900 9101000 9110200 9110300 9110400 9110500 9110600 9110700 9110800 9110900 9111000 9120300 9120400 9120500 9120600 9120700 9120800 9120900 9121000 9130400 9130500 9130600 9130700 9130800 9130900 9131000 9140600 9140700 9140800 9140900 9141000 9150600 9150700 9150800 9150900 9151000 9160600 9160700 9160800 9160900 9161000 9170600 9170700 9170800 9170900 9171000 9180600 9180700 9180800 9180900 9181000 force;
 }
 
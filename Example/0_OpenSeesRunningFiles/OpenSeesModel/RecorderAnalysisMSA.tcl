@@ -19,9 +19,9 @@ for {set story 1} {$story <= $num_stories} {incr story} {
        # -time -node [lindex $ctrl_nodes $story] -dof 1 disp
 # }
 
-# Define drift recorders
+# Define drift recorders (binary if binaryRecorders = 1, the envelopes stay as text files read by DriftCheck.tcl)
 for {set story 1} {$story <= $num_stories} {incr story} {
-   recorder Drift -file $outdir/story${story}_drift.out -iNode [lindex $ctrl_nodes \
+   recorder Drift $recorderOption $outdir/story${story}_drift.$recorderExt -iNode [lindex $ctrl_nodes \
            [expr {$story - 1}]] -jNode [lindex $ctrl_nodes $story] -time -dof 1 -perpDirn 2
 }
 
@@ -1,3 +1,7 @@
 from .base import *
+from .recorder_io import *
 from .postprocess_results import *
-from .collect_nrha_results import *
\ No newline at end of file
+from .collect_nrha_results import *
+from .batch_collection import *
+from .edp_store import *
+from .history_archive import *
\ No newline at end of file
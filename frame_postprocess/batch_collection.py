@@ -0,0 +1,646 @@
+from .base import *
+from .recorder_io import *
+from .collect_nrha_results import *
+import ast
+import json
+import tarfile
+import zipfile
+import time
+import concurrent.futures
+
+
+def read_building_info(input_filepath, results_folder=None, model_name=None):
+    # Reads the table with one case per row used by the collectors (e.g. building_info_for_plot.csv) and parses the
+    # frame geometry of each case
+    #
+    # INPUTS
+    #    input_filepath = path to the .csv file with the columns splice, beam_list, column_list, pz_list and colSplice
+    #                     (lists as text, as written for the plotting notebook). Optional columns:
+    #                     'model_name': name of the case used to name the output files
+    #                     'dir'       : folder of the frame direction inside AnalysisResult/MSA
+    #                     'msa_folder': path to the MSA results of the case (replaces results_folder)
+    #    results_folder = path to the folder with AnalysisResult/MSA (default: folder of input_filepath)
+    #    model_name     = name of the cases without a 'model_name' column (default: name of results_folder). The
+    #                     OBJECTID is appended when the file has several cases
+    #
+    # OUTPUTS
+    #    cases          = list of dictionaries per case (and direction) with
+    #                     'model_name', 'msa_folder', 'beam_list', 'column_list', 'pz_list', 'splice', 'colSplice'
+    #
+
+    inputs = pd.read_csv(input_filepath)
+    if results_folder is None:
+        results_folder = os.path.dirname(os.path.abspath(input_filepath))
+    if model_name is None:
+        model_name = os.path.basename(os.path.normpath(os.path.abspath(results_folder)))
+
+    cases = []
+    for case_i in range(len(inputs)):
+        # Building attributes
+        beam_list = np.array(ast.literal_eval(inputs.beam_list[case_i]))
+        column_list = np.array(ast.literal_eval(inputs.column_list[case_i]))
+        if 'pz_list' in inputs.columns:
+            pz_list = np.array(ast.literal_eval(inputs.pz_list[case_i]))
+        else:
+            pz_list = None
+        splice = int(inputs.splice[case_i])
+        if splice:
+            colSplice = np.array(ast.literal_eval(inputs.colSplice[case_i]))
+        else:
+            colSplice = np.zeros(column_list.shape)
+
+        # Case name
+        if 'model_name' in inputs.columns:
+            model_name_i = str(inputs.model_name[case_i])
+        elif len(inputs) > 1:
+            object_id = inputs.OBJECTID[case_i] if 'OBJECTID' in inputs.columns else case_i + 1
+            model_name_i = model_name + '_' + str(object_id)
+        else:
+            model_name_i = model_name
+
+        # MSA results
+        if 'msa_folder' in inputs.columns:
+            msa_folder = str(inputs.msa_folder[case_i])
+        else:
+            msa_folder = os.path.join(results_folder, 'AnalysisResult', 'MSA')
+        if 'dir' in inputs.columns:
+            msa_folder = os.path.join(msa_folder, str(inputs.dir[case_i]))
+            model_name_i = model_name_i + '_' + str(inputs.dir[case_i])
+
+        cases.append(dict(model_name=model_name_i, msa_folder=msa_folder, beam_list=beam_list,
+                          column_list=column_list, pz_list=pz_list, splice=splice, colSplice=colSplice))
+
+    return cases
+
+
+def list_stripe_folders(msa_folder):
+    # Stripe folders of a case, including the stripes packed in a tarball or zip file per stripe (e.g. MSA/72.tar.gz)
+    # or in a single tarball or zip file (e.g. MSA.zip with the members 72/RSN100_GM0/story1_drift.out, ...)
+    if os.path.isfile(msa_folder) and msa_folder.endswith(tuple(stream_archive_extensions)):
+        if msa_folder.endswith('.zip'):
+            with zipfile.ZipFile(msa_folder) as archive:
+                names = archive.namelist()
+        else:
+            with tarfile.open(msa_folder) as archive:
+                names = archive.getnames()
+        stripe_folders = set()
+        for name in names:
+            parts = [part for part in name.replace('\\', '/').split('/') if part not in ['', '.']]
+            if len(parts) >= 3:
+                stripe_folders.add(parts[-3])
+        return sorted(stripe_folders)
+
+    stripe_folders = []
+    for stripe in sorted(list_results(msa_folder)):
+        for extension in stream_archive_extensions:
+            if stripe.endswith(extension):
+                stripe = stripe[:-len(extension)]
+                break
+        if stripe not in stripe_folders:
+            stripe_folders.append(stripe)
+
+    return stripe_folders
+
+
+def get_gm_cost(files, file_cost=2**16):
+    # Estimate of the time to collect a ground motion, as the bytes of its recorders plus a fixed cost per file (the
+    # time to open a file, mostly on network filesystems, is similar to reading file_cost bytes)
+    #
+    # INPUTS
+    #    files     = dictionary with the size in bytes of each file (filename: size), see get_stripe_manifest
+    #    file_cost = bytes equivalent to opening a file
+    #
+    # OUTPUTS
+    #    cost      = bytes equivalent to collect the ground motion
+    #
+
+    return sum(files.values()) + file_cost * len(files)
+
+
+def get_stripe_cost(stripe_folder_path):
+    # Estimate of the time to collect a stripe, as the cost of its ground motions (see get_gm_cost)
+    #
+    # INPUTS
+    #    stripe_folder_path = path to the stripe folder (raw results, archive created by pack_msa_results, tarball or
+    #                         zip file)
+    #
+    # OUTPUTS
+    #    cost               = bytes equivalent to collect the stripe (size of the file for tarballs and zip files)
+    #    n_gms              = number of ground motions in the stripe (None for tarballs and zip files)
+    #
+
+    manifest = get_stripe_manifest(stripe_folder_path)
+    if manifest is not None:
+        cost = sum(get_gm_cost(gm['files']) for gm in manifest['gms'].values())
+        return cost, len(manifest['gm_ids'])
+
+    archive_filename = find_stream_archive(stripe_folder_path)[0]
+    if archive_filename is not None:
+        return os.path.getsize(archive_filename), None
+
+    return 0, None
+
+
+def plan_collection(cases, save_results_folder, collect_edp=True, collect_endState=True, overwrite=False,
+                    resume=False, fused=False, edp_format='csv'):
+    # Lists the collection jobs of every case: one EDP job per stripe (a .csv file per stripe) and one end state job
+    # per case (a .h5 file per case), sorted from the longest to the shortest job
+    #
+    # INPUTS
+    #    cases               = list of dictionaries per case, see read_building_info
+    #    save_results_folder = path to save the collected results
+    #    collect_edp         = True to collect the EDP table of each stripe
+    #    collect_endState    = True to collect the end state of each case
+    #    overwrite           = True to collect again the results already saved
+    #    resume              = True to update the results already saved, collecting only the new ground motions or
+    #                          those with files changed since then
+    #    fused               = True to collect the EDP tables and the end state of each case in a single job that
+    #                          visits each ground motion once (see collect_singleDir_fused_response). Not available
+    #                          with resume
+    #    edp_format          = format of the EDP tables: 'csv', 'parquet' or 'feather' (see save_edp_table)
+    #
+    # OUTPUTS
+    #    jobs                = list of dictionaries with
+    #                          'kind'  : 'edp', 'endState' or 'fused'
+    #                          'case_i': position of the case in cases
+    #                          'stripe': stripe folder ('edp') or list of stripe folders ('endState' and 'fused')
+    #                          'n_gms' : number of ground motions to read
+    #                          'cost'  : bytes equivalent to collect the job, see get_stripe_cost
+    #                          'results_filename': path of the file written by the job
+    #
+    # NOTES
+    #    The jobs are sorted by cost, so a pool that takes them in order starts the longest jobs first and the short
+    #    ones fill the gaps at the end (longest processing time first). The end state jobs read every stripe of a
+    #    case, so they are usually the first ones.
+    #
+
+    if fused and resume:
+        print('WARNING: resume is not available for the fused collection, collecting the EDP tables and end states '
+              'separately')
+        fused = False
+
+    jobs = []
+    for case_i, case in enumerate(cases):
+        if not os.path.exists(case['msa_folder']) and split_archive_path(case['msa_folder'])[0] is None:
+            print('No MSA results for ' + case['model_name'] + ': ' + case['msa_folder'])
+            continue
+        stripe_folders = list_stripe_folders(case['msa_folder'])
+
+        case_cost = 0
+        case_gms = 0
+        case_jobs = []
+        for stripe in stripe_folders:
+            cost, n_gms = get_stripe_cost(os.path.join(case['msa_folder'], stripe))
+            case_cost += cost
+            case_gms += n_gms if n_gms is not None else 0
+
+            results_filename = get_edp_filename(save_results_folder, case['model_name'], stripe, edp_format=edp_format)
+            if collect_edp and (overwrite or resume or not os.path.isfile(results_filename)):
+                case_jobs.append(dict(kind='edp', case_i=case_i, stripe=stripe, n_gms=n_gms, cost=cost,
+                                      results_filename=results_filename))
+
+        results_filename = os.path.join(save_results_folder, case['model_name'] + '.h5')
+        if collect_endState and case['pz_list'] is not None and \
+                (overwrite or resume or not os.path.isfile(results_filename)):
+            case_jobs.append(dict(kind='endState', case_i=case_i, stripe=stripe_folders, n_gms=case_gms,
+                                  cost=case_cost, results_filename=results_filename))
+
+        # a single job for the case if both kinds of results are collected
+        if fused and collect_edp and case['pz_list'] is not None and len(case_jobs) > 0 and \
+                case_jobs[-1]['kind'] == 'endState':
+            case_jobs = [dict(kind='fused', case_i=case_i, stripe=stripe_folders, n_gms=case_gms, cost=case_cost,
+                              results_filename=results_filename)]
+        jobs += case_jobs
+
+    jobs.sort(key=lambda job: job['cost'], reverse=True)
+
+    return jobs
+
+
+def run_collection_job(job, case, save_results_folder, fracElement=True, minrdrift=5e-4,
+                       splice_frac_strain=60 * 2 / 29000, drift_out='abs', rdrift_out='max', resume=False,
+                       prefetch=0, edp_format='csv', endState_layout='groups'):
+    # Collects one job listed by plan_collection (runs in a worker of the pool of run_collection)
+    #
+    # OUTPUTS
+    #    elapsed = time in seconds to collect the job
+    #
+
+    start = time.perf_counter()
+    if job['kind'] == 'edp':
+        collect_singleDir_response([case['model_name']], [job['stripe']], [save_results_folder],
+                                   [case['msa_folder']], [case['beam_list']], [case['column_list']], fracElement,
+                                   [case['splice']], [case['colSplice']], minrdrift, splice_frac_strain,
+                                   drift_out, rdrift_out, 0, resume=resume, prefetch=prefetch, edp_format=edp_format)
+    elif job['kind'] == 'fused':
+        collect_singleDir_fused_response([case['model_name']], [job['stripe']], [save_results_folder],
+                                         [case['msa_folder']], [case['beam_list']], [case['column_list']],
+                                         [case['pz_list']], fracElement, [case['splice']], [case['colSplice']],
+                                         minrdrift, splice_frac_strain, drift_out, rdrift_out, 0, prefetch=prefetch,
+                                         edp_format=edp_format, layout=endState_layout)
+    else:
+        collect_endState_singleDir_response([case['model_name']], [save_results_folder], [job['stripe']],
+                                            [case['msa_folder']], [case['beam_list']], [case['column_list']],
+                                            [case['pz_list']], [case['splice']], [case['colSplice']], 0,
+                                            resume=resume, prefetch=prefetch, layout=endState_layout)
+
+    return time.perf_counter() - start
+
+
+def run_collection(cases, save_results_folder, n_workers=None, collect_edp=True, collect_endState=True,
+                   overwrite=False, resume=False, fused=False, fracElement=True, minrdrift=5e-4,
+                   splice_frac_strain=60 * 2 / 29000, drift_out='abs', rdrift_out='max', prefetch=0, edp_format='csv',
+                   endState_layout='groups'):
+    # Collects the EDP tables and end states of several cases in a pool of processes, starting with the longest jobs
+    #
+    # INPUTS
+    #    cases               = list of dictionaries per case, see read_building_info
+    #    save_results_folder = path to save the collected results
+    #    n_workers           = number of processes (default: number of cores, 1 to collect in this process)
+    #    collect_edp, collect_endState, overwrite, resume, fused, edp_format = see plan_collection
+    #    fracElement, minrdrift, splice_frac_strain, drift_out, rdrift_out, prefetch = see collect_gmset_response
+    #    endState_layout     = layout of the end state .h5 files: 'groups' or 'stacked' (see collect_stripe_endState)
+    #
+    # OUTPUTS
+    #    summary             = pd.DataFrame with one row per job: kind, model_name, stripe, n_gms, cost, start and
+    #                          end (seconds since the collection started), elapsed and error (empty if the job
+    #                          finished). See get_parallel_efficiency
+    #
+    # NOTES
+    #    A job that fails is reported in the summary without stopping the rest.
+    #    Each process takes the most expensive job left as soon as it finishes the previous one (only one job per
+    #    process is handed out at a time), so the short jobs fill the gaps left by the long ones at the end.
+    #
+
+    if not os.path.isdir(save_results_folder):
+        os.makedirs(save_results_folder)
+
+    if collect_edp:
+        check_edp_format(edp_format)
+    if collect_endState:
+        check_endState_layout(endState_layout)
+    jobs = plan_collection(cases, save_results_folder, collect_edp=collect_edp, collect_endState=collect_endState,
+                           overwrite=overwrite, resume=resume, fused=fused, edp_format=edp_format)
+    if n_workers is None:
+        n_workers = os.cpu_count()
+    n_workers = max(1, min(n_workers, len(jobs)))
+    print('TOTAL JOBS TO COLLECT = ' + str(len(jobs)) + ' in ' + str(n_workers) + ' processes')
+
+    options = dict(fracElement=fracElement, minrdrift=minrdrift, splice_frac_strain=splice_frac_strain,
+                   drift_out=drift_out, rdrift_out=rdrift_out, resume=resume, prefetch=prefetch, edp_format=edp_format,
+                   endState_layout=endState_layout)
+    rows = []
+    start_time = time.perf_counter()
+
+    def add_row(job, start, elapsed, error):
+        stripe = job['stripe'] if job['kind'] == 'edp' else ''
+        rows.append([job['kind'], cases[job['case_i']]['model_name'], stripe, job['n_gms'], job['cost'], start,
+                     time.perf_counter() - start_time, elapsed, error])
+        print('[' + str(len(rows)) + '/' + str(len(jobs)) + '] ' + job['kind'] + ' ' + rows[-1][1] + ' ' + stripe +
+              (' FAILED: ' + error if error else ' (' + '{:.1f}'.format(elapsed) + ' s)'))
+
+    if n_workers == 1:
+        for job in jobs:
+            start = time.perf_counter() - start_time
+            try:
+                add_row(job, start, run_collection_job(job, cases[job['case_i']], save_results_folder, **options), '')
+            except Exception as e:
+                add_row(job, start, np.nan, repr(e))
+    else:
+        # hand out the next job (the most expensive left) only when a process is free, so no job waits in the queue
+        # of a busy process while another one is idle
+        with concurrent.futures.ProcessPoolExecutor(n_workers, initializer=close_archives) as executor:
+            pending = dict()
+            i_job = 0
+            while i_job < len(jobs) or len(pending) > 0:
+                while i_job < len(jobs) and len(pending) < n_workers:
+                    future = executor.submit(run_collection_job, jobs[i_job], cases[jobs[i_job]['case_i']],
+                                             save_results_folder, **options)
+                    pending[future] = (jobs[i_job], time.perf_counter() - start_time)
+                    i_job += 1
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    job, start = pending.pop(future)
+                    try:
+                        add_row(job, start, future.result(), '')
+                    except Exception as e:
+                        add_row(job, start, np.nan, repr(e))
+
+    summary = pd.DataFrame(rows, columns=['kind', 'model_name', 'stripe', 'n_gms', 'cost', 'start', 'end',
+                                          'elapsed', 'error'])
+
+    if len(summary) > 0:
+        efficiency = get_parallel_efficiency(summary, n_workers)
+        print('WALL TIME = ' + '{:.1f}'.format(efficiency['wall_time']) + ' s, BUSY TIME = ' +
+              '{:.1f}'.format(efficiency['busy_time']) + ' s in ' + str(n_workers) + ' processes')
+        print('PARALLEL EFFICIENCY = ' + '{:.0%}'.format(efficiency['efficiency']) + ' (best possible ' +
+              '{:.0%}'.format(efficiency['best_efficiency']) + ', longest job ' +
+              '{:.1f}'.format(efficiency['longest_job']) + ' s)')
+
+    return summary
+
+
+def get_parallel_efficiency(summary, n_workers):
+    # Measures how well the jobs of run_collection were spread over the processes
+    #
+    # INPUTS
+    #    summary   = output of run_collection
+    #    n_workers = number of processes used
+    #
+    # OUTPUTS
+    #    efficiency = dictionary with
+    #                 'wall_time'      : seconds from the start of the collection to the end of the last job
+    #                 'busy_time'      : sum of the seconds collecting each job
+    #                 'longest_job'    : seconds of the longest job
+    #                 'efficiency'     : busy_time / (n_workers * wall_time), 1 if no process was ever idle
+    #                 'best_efficiency': efficiency if the wall time were the lower bound max(longest_job,
+    #                                    busy_time / n_workers), i.e. the best any schedule of these jobs achieves
+    #
+
+    elapsed = summary['elapsed'].fillna(summary['end'] - summary['start'])
+    wall_time = summary['end'].max()
+    busy_time = elapsed.sum()
+    longest_job = elapsed.max()
+
+    efficiency = dict()
+    efficiency['wall_time'] = wall_time
+    efficiency['busy_time'] = busy_time
+    efficiency['longest_job'] = longest_job
+    efficiency['efficiency'] = busy_time / (n_workers * wall_time) if wall_time > 0 else 1.0
+    best_wall_time = max(longest_job, busy_time / n_workers)
+    efficiency['best_efficiency'] = busy_time / (n_workers * best_wall_time) if best_wall_time > 0 else 1.0
+
+    return efficiency
+
+
+def plan_shards(cases, n_shards, plan_filename=None):
+    # Splits the ground motions of every case and stripe into n_shards groups of similar cost, to collect them in
+    # independent processes or nodes (see collect_shard) and join the results with merge_shards
+    #
+    # INPUTS
+    #    cases         = list of dictionaries per case, see read_building_info
+    #    n_shards      = number of shards
+    #    plan_filename = path to a .json file to save the plan, or to read it if it exists (None to plan here). Save
+    #                    the plan before starting the shards if the results may change in the meantime (e.g. the MSA
+    #                    is still running), so every shard uses the same list of ground motions
+    #
+    # OUTPUTS
+    #    plan          = dictionary with
+    #                    'n_shards': number of shards
+    #                    'cases'   : list per case with 'model_name' and 'stripes' (stripe folders)
+    #                    'tasks'   : list of dictionaries per ground motion with 'case_i', 'stripe', 'gm_id',
+    #                                'position' (order of the ground motion in the stripe), 'cost' (see
+    #                                get_gm_cost) and 'shard'. For tarballs and zip files there is a single task per
+    #                                stripe with gm_id None
+    #
+    # NOTES
+    #    The tasks are assigned from the most to the least expensive to the shard with the lowest cost so far (ties
+    #    to the lowest shard), so the plan only depends on the files listed.
+    #
+
+    if plan_filename is not None and os.path.isfile(plan_filename):
+        with open(plan_filename, 'r') as f:
+            plan = json.load(f)
+        if plan['n_shards'] != n_shards or [case['model_name'] for case in plan['cases']] != \
+                [case['model_name'] for case in cases]:
+            raise ValueError(plan_filename + ' was planned for other cases or number of shards')
+        return plan
+
+    plan = dict(n_shards=n_shards, cases=[], tasks=[])
+    for case_i, case in enumerate(cases):
+        if not os.path.exists(case['msa_folder']) and split_archive_path(case['msa_folder'])[0] is None:
+            print('No MSA results for ' + case['model_name'] + ': ' + case['msa_folder'])
+            plan['cases'].append(dict(model_name=case['model_name'], stripes=[]))
+            continue
+        stripe_folders = list_stripe_folders(case['msa_folder'])
+        plan['cases'].append(dict(model_name=case['model_name'], stripes=stripe_folders))
+
+        for stripe in stripe_folders:
+            stripe_folder_path = os.path.join(case['msa_folder'], stripe)
+            manifest = get_stripe_manifest(stripe_folder_path)
+            if manifest is None:
+                plan['tasks'].append(dict(case_i=case_i, stripe=stripe, gm_id=None, position=0,
+                                          cost=get_stripe_cost(stripe_folder_path)[0]))
+                continue
+            for position, gm_id in enumerate(manifest['gm_ids']):
+                plan['tasks'].append(dict(case_i=case_i, stripe=stripe, gm_id=gm_id, position=position,
+                                          cost=get_gm_cost(manifest['gms'][gm_id]['files'])))
+
+    # longest processing time first
+    loads = np.zeros(n_shards)
+    order = sorted(range(len(plan['tasks'])), key=lambda k: (-plan['tasks'][k]['cost'], k))
+    for k in order:
+        shard = int(np.argmin(loads))
+        plan['tasks'][k]['shard'] = shard
+        loads[shard] += plan['tasks'][k]['cost']
+
+    if plan_filename is not None:
+        with open(plan_filename, 'w') as f:
+            json.dump(plan, f)
+
+    return plan
+
+
+def get_shard_folder(shard_folder, shard, n_shards):
+    # Folder with the partial results of a shard
+    return os.path.join(shard_folder, 'shard_' + str(shard) + '_of_' + str(n_shards))
+
+
+def collect_shard(cases, save_results_folder, shard, n_shards, shard_folder=None, plan_filename=None,
+                  collect_edp=True, collect_endState=True, n_workers=1, fracElement=True, minrdrift=5e-4,
+                  splice_frac_strain=60 * 2 / 29000, drift_out='abs', rdrift_out='max', prefetch=0):
+    # Collects the ground motions of one shard of the plan of plan_shards, saving partial EDP tables and end states
+    # in the folder of the shard
+    #
+    # INPUTS
+    #    cases               = list of dictionaries per case, see read_building_info
+    #    save_results_folder = path to save the collected results (after merge_shards)
+    #    shard               = index of the shard to collect (0 to n_shards - 1)
+    #    n_shards            = number of shards
+    #    shard_folder        = path to save the partial results of every shard (default: save_results_folder/shards)
+    #    plan_filename       = see plan_shards
+    #    collect_edp         = True to collect the EDP tables
+    #    collect_endState    = True to collect the end states (cases with pz_list)
+    #    n_workers           = number of processes to collect the ground motions of the shard (1 to collect them here)
+    #    fracElement, minrdrift, splice_frac_strain, drift_out, rdrift_out, prefetch = see collect_gmset_response
+    #
+    # OUTPUTS
+    #    Saves in the folder of the shard EDP_<model_name>_<stripe>.csv, <model_name>.h5 and shard.json (the plan,
+    #    written last to mark the shard as finished)
+    #
+
+    if shard_folder is None:
+        shard_folder = os.path.join(save_results_folder, 'shards')
+    plan = plan_shards(cases, n_shards, plan_filename=plan_filename)
+    shard_results_folder = get_shard_folder(shard_folder, shard, n_shards)
+    if not os.path.isdir(shard_results_folder):
+        os.makedirs(shard_results_folder)
+    done_filename = os.path.join(shard_results_folder, 'shard.json')
+    if os.path.isfile(done_filename):
+        os.remove(done_filename)
+
+    # ground motions of the shard per case and stripe
+    shard_tasks = dict()
+    for task in plan['tasks']:
+        if task['shard'] == shard:
+            shard_tasks.setdefault((task['case_i'], task['stripe']), []).append(task['gm_id'])
+    print('SHARD ' + str(shard) + ' OF ' + str(n_shards) + ': ' + str(sum(len(gm_ids) for gm_ids in
+                                                                          shard_tasks.values())) + ' TASKS')
+
+    executor = None
+    if n_workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(n_workers, initializer=close_archives)
+    try:
+        for case_i, case in enumerate(cases):
+            stripes = [stripe for stripe in plan['cases'][case_i]['stripes'] if (case_i, stripe) in shard_tasks]
+            if len(stripes) == 0:
+                continue
+            print('------- ' + case['model_name'] + ' -------')
+            collect_endState_case = collect_endState and case['pz_list'] is not None
+            if not collect_edp and not collect_endState_case:
+                continue
+
+            hf = None
+            if collect_endState_case:
+                hf = h5py.File(os.path.join(shard_results_folder, case['model_name'] + '.h5'), 'w')
+                hf.attrs['collection_parameters'] = get_collection_parameters(
+                    beam_list=case['beam_list'], column_list=case['column_list'], pz_list=case['pz_list'],
+                    splice=case['splice'], colSplice=case['colSplice'] if case['splice'] == 1 else 0)
+            try:
+                for stripe in stripes:
+                    print('RP = ' + str(stripe) + 'years')
+                    gm_ids = shard_tasks[(case_i, stripe)]
+                    results = collect_gmset_fused_response(
+                        os.path.join(case['msa_folder'], stripe), None if hf is None else hf.create_group(stripe),
+                        case['beam_list'], case['column_list'], case['pz_list'], fracElement, 1, case['splice'],
+                        case['colSplice'], drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
+                        splice_frac_strain=splice_frac_strain, gm_ids=None if None in gm_ids else gm_ids,
+                        edp=collect_edp, executor=executor, prefetch=prefetch)
+                    if collect_edp:
+                        results.to_csv(os.path.join(shard_results_folder,
+                                                    'EDP_' + case['model_name'] + '_' + stripe + '.csv'))
+            finally:
+                if hf is not None:
+                    hf.close()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    with open(done_filename, 'w') as f:
+        json.dump(plan, f)
+
+
+def merge_shards(cases, save_results_folder, n_shards, shard_folder=None, collect_edp=True, collect_endState=True,
+                 fracElement=True, drift_out='abs', rdrift_out='max', edp_format='csv', endState_layout='groups'):
+    # Joins the partial results of every shard saved by collect_shard into the same files of a collection in a single
+    # process (EDP_<model_name>_<stripe>.csv and <model_name>.h5)
+    #
+    # INPUTS
+    #    cases, save_results_folder, n_shards, shard_folder, collect_edp, collect_endState = same as collect_shard
+    #    fracElement, drift_out, rdrift_out = same as collect_shard (to name the columns of empty tables)
+    #    edp_format = format of the EDP tables joined: 'csv', 'parquet' or 'feather' (see save_edp_table). The
+    #                 partial tables of the shards are always .csv files
+    #    endState_layout = layout of the end state .h5 files joined: 'groups' or 'stacked' (see collect_stripe_endState).
+    #                      The partial files of the shards always have one group per ground motion
+    #
+    # NOTES
+    #    The rows and the ground motion groups follow the order of the ground motions in the plan, so the result
+    #    does not depend on the shard that collected each ground motion. Raises ValueError if a shard did not finish
+    #    or the shards used different plans.
+    #
+
+    if collect_edp:
+        check_edp_format(edp_format)
+    if collect_endState:
+        check_endState_layout(endState_layout)
+    if shard_folder is None:
+        shard_folder = os.path.join(save_results_folder, 'shards')
+    if not os.path.isdir(save_results_folder):
+        os.makedirs(save_results_folder)
+
+    # plan used by every shard
+    plan = None
+    for shard in range(n_shards):
+        done_filename = os.path.join(get_shard_folder(shard_folder, shard, n_shards), 'shard.json')
+        if not os.path.isfile(done_filename):
+            raise ValueError('Shard ' + str(shard) + ' of ' + str(n_shards) + ' did not finish: ' + done_filename)
+        with open(done_filename, 'r') as f:
+            plan_shard = json.load(f)
+        if plan is None:
+            plan = plan_shard
+        elif plan_shard != plan:
+            raise ValueError('Shard ' + str(shard) + ' used a different plan, collect every shard with the same '
+                                                     'plan_filename')
+
+    # position of each ground motion in its stripe and the shard with its results
+    positions = dict()
+    for task in plan['tasks']:
+        positions[(task['case_i'], task['stripe'], task['gm_id'])] = (task['position'], task['shard'])
+
+    for case_i, case in enumerate(cases):
+        print('------- ' + case['model_name'] + ' -------')
+        stripes = plan['cases'][case_i]['stripes']
+
+        if collect_edp:
+            column_names = get_edp_column_names(case['beam_list'], fracElement, 1, case['splice'],
+                                                case['colSplice'], case['column_list'], drift_out=drift_out,
+                                                rdrift_out=rdrift_out)
+            for stripe in stripes:
+                filename = 'EDP_' + case['model_name'] + '_' + stripe + '.csv'
+                tables = []
+                for shard in range(n_shards):
+                    filepath = os.path.join(get_shard_folder(shard_folder, shard, n_shards), filename)
+                    if os.path.isfile(filepath):
+                        # read as text to keep the values exactly as collected
+                        table = pd.read_csv(filepath, index_col=0, dtype=str)
+                        table.index = table.index.astype(str)
+                        tables.append(table)
+                if len(tables) == 0:
+                    results = pd.DataFrame([], columns=column_names)
+                else:
+                    results = pd.concat(tables)
+                    order = [positions.get((case_i, stripe, gm_id), positions.get((case_i, stripe, None)))[0]
+                             for gm_id in results.index]
+                    results = results.iloc[np.argsort(order, kind='stable')]
+                if edp_format == 'csv':
+                    results.to_csv(os.path.join(save_results_folder, filename))
+                else:
+                    save_edp_table(set_edp_types(results), get_edp_filename(save_results_folder, case['model_name'],
+                                                                            stripe, edp_format=edp_format),
+                                   stripe=stripe)
+
+        if collect_endState and case['pz_list'] is not None:
+            filename = case['model_name'] + '.h5'
+            with h5py.File(os.path.join(save_results_folder, filename), 'w') as hf:
+                hf.attrs['collection_parameters'] = get_collection_parameters(
+                    beam_list=case['beam_list'], column_list=case['column_list'], pz_list=case['pz_list'],
+                    splice=case['splice'], colSplice=case['colSplice'] if case['splice'] == 1 else 0,
+                    **get_layout_parameters(endState_layout))
+                shard_files = dict()
+                try:
+                    for shard in range(n_shards):
+                        filepath = os.path.join(get_shard_folder(shard_folder, shard, n_shards), filename)
+                        if os.path.isfile(filepath):
+                            shard_files[shard] = h5py.File(filepath, 'r')
+                    for stripe in stripes:
+                        stripe_group = hf.create_group(stripe)
+                        gms = []
+                        for shard, hf_shard in shard_files.items():
+                            if stripe in hf_shard:
+                                for gm_id in hf_shard[stripe]:
+                                    position = positions.get((case_i, stripe, gm_id),
+                                                             positions.get((case_i, stripe, None)))[0]
+                                    gms.append((position, gm_id, shard))
+                        if endState_layout == 'stacked':
+                            gms = sorted(gms)
+                            save_stacked_endState(stripe_group, [gm_id for _, gm_id, _ in gms],
+                                                  stack_endState([read_gm_endState(shard_files[shard][stripe], gm_id)
+                                                                  for _, gm_id, shard in gms]),
+                                                  signatures=[shard_files[shard][stripe][gm_id].attrs.get('signature')
+                                                              for _, gm_id, shard in gms])
+                            continue
+                        for position, gm_id, shard in sorted(gms):
+                            shard_files[shard].copy(shard_files[shard][stripe][gm_id], stripe_group, name=gm_id)
+                finally:
+                    for hf_shard in shard_files.values():
+                        hf_shard.close()
@@ -0,0 +1,167 @@
+import argparse
+import os
+import sys
+from .batch_collection import read_building_info, list_stripe_folders, run_collection, plan_shards, collect_shard, \
+    merge_shards
+from .edp_store import build_edp_store
+from .history_archive import collect_history_archive, history_quantities
+
+
+def main(argv=None):
+    # Command line entry point (frame-postprocess) to collect the results without the notebooks, e.g.
+    #    frame-postprocess collect building_info_for_plot.csv --save-folder 2_Collected_NLRHA_results
+    #
+    # or split in shards collected by independent jobs (e.g. a job array) and merged at the end
+    #    frame-postprocess plan building_info_for_plot.csv --shards 4 --plan plan.json
+    #    frame-postprocess collect building_info_for_plot.csv --shard 0/4 --plan plan.json
+    #    ...
+    #    frame-postprocess collect building_info_for_plot.csv --shard 3/4 --plan plan.json
+    #    frame-postprocess merge building_info_for_plot.csv --shards 4
+    #
+    # and the EDP tables of every stripe of each case joined in a single file (EDP_<model_name>.h5)
+    #    frame-postprocess store building_info_for_plot.csv
+    #
+    # and the complete histories of some ground motions to animate them (<model_name>_history.h5)
+    #    frame-postprocess history building_info_for_plot.csv --gms RSN100_GM0 RSN101_GM1
+    #
+    # INPUTS
+    #    argv = list of str with the arguments (default: sys.argv)
+    #
+    # OUTPUTS
+    #    exit code (1 if any job failed)
+    #
+
+    # arguments of every command
+    cases_parser = argparse.ArgumentParser(add_help=False)
+    cases_parser.add_argument('building_info',
+                              help='.csv file with one case per row (e.g. building_info_for_plot.csv)')
+    cases_parser.add_argument('--results-folder', default=None,
+                              help='folder with AnalysisResult/MSA (default: folder of building_info)')
+    cases_parser.add_argument('--save-folder', default='2_Collected_NLRHA_results',
+                              help='folder to save the collected results')
+    cases_parser.add_argument('--model-name', default=None,
+                              help='name of the cases if building_info has no model_name column '
+                                   '(default: name of the results folder)')
+    cases_parser.add_argument('--shard-folder', default=None,
+                              help='folder for the partial results of the shards (default: SAVE_FOLDER/shards)')
+    cases_parser.add_argument('--skip-edp', action='store_true', help='do not collect the EDP tables')
+    cases_parser.add_argument('--skip-endstate', action='store_true', help='do not collect the end states')
+    cases_parser.add_argument('--no-frac', action='store_true', help='do not collect the connection damage states')
+    cases_parser.add_argument('--drift-out', choices=['abs', 'both'], default='abs', help='peak drift columns')
+    cases_parser.add_argument('--format', choices=['csv', 'parquet', 'feather'], default='csv',
+                              help='format of the EDP tables (parquet and feather require pyarrow)')
+    cases_parser.add_argument('--endstate-layout', choices=['groups', 'stacked'], default='groups',
+                              help='layout of the end state .h5 files: one group per ground motion or one array '
+                                   'per quantity and stripe')
+    cases_parser.add_argument('--rdrift-out', choices=['max', 'all_abs', 'all'], default='max',
+                              help='residual drift columns')
+
+    parser = argparse.ArgumentParser(prog='frame-postprocess',
+                                     description='Postprocessing of the NLRHA of 2D OpenSees models of moment frames')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', parents=[cases_parser],
+                                    help='collect the EDP tables and end states of every case')
+    collect.add_argument('--workers', type=int, default=None, help='number of processes (default: number of cores)')
+    group = collect.add_mutually_exclusive_group()
+    group.add_argument('--overwrite', action='store_true', help='collect again the results already saved')
+    group.add_argument('--resume', action='store_true',
+                       help='update the results already saved with the new or rerun ground motions')
+    collect.add_argument('--fused', action='store_true',
+                         help='collect the EDP tables and end state of each case visiting each ground motion once')
+    collect.add_argument('--minrdrift', type=float, default=5e-4, help='minimum residual drift to consider')
+    collect.add_argument('--splice-frac-strain', type=float, default=60 * 2 / 29000,
+                         help='strain limit to judge that fracture occured in the splice')
+    collect.add_argument('--prefetch', type=int, default=0,
+                         help='number of ground motions ahead to read in background threads, e.g. on network '
+                              'filesystems (only when the ground motions of a job are collected by one process)')
+    collect.add_argument('--summary', default=None, help='.csv file to save the time and status of each job')
+    collect.add_argument('--shard', default=None,
+                         help='I/N to collect only shard I (from 0) of N in the shard folder (join them with merge)')
+    collect.add_argument('--plan', default=None, help='.json file with the plan of the shards (see plan)')
+
+    plan = subparsers.add_parser('plan', parents=[cases_parser],
+                                 help='split the ground motions of every case in shards of similar cost')
+    plan.add_argument('--shards', type=int, required=True, help='number of shards')
+    plan.add_argument('--plan', required=True, help='.json file to save the plan')
+
+    merge = subparsers.add_parser('merge', parents=[cases_parser],
+                                  help='join the results of the shards collected with collect --shard')
+    merge.add_argument('--shards', type=int, required=True, help='number of shards')
+
+    subparsers.add_parser('store', parents=[cases_parser],
+                          help='join the EDP tables of every stripe of each case in EDP_<model_name>.h5')
+
+    history = subparsers.add_parser('history', parents=[cases_parser],
+                                    help='save the complete histories of the ground motions of each case in '
+                                         '<model_name>_history.h5')
+    history.add_argument('--quantities', nargs='+', default=history_quantities,
+                         help='histories to save (default: ' + ' '.join(history_quantities) + ')')
+    history.add_argument('--gms', nargs='+', default=None, help='ground motion folders to save (default: all)')
+    history.add_argument('--stripes', nargs='+', default=None, help='stripes to save (default: all)')
+    history.add_argument('--workers', type=int, default=1, help='number of processes to read the ground motions')
+    history.add_argument('--resume', action='store_true',
+                         help='update the archives already saved with the new or rerun ground motions')
+
+    args = parser.parse_args(argv)
+
+    cases = read_building_info(args.building_info, results_folder=args.results_folder, model_name=args.model_name)
+
+    if args.command == 'plan':
+        plan_shards(cases, args.shards, plan_filename=args.plan)
+        return 0
+
+    if args.command == 'store':
+        for case in cases:
+            if not os.path.exists(case['msa_folder']):
+                print('No MSA results for ' + case['model_name'] + ': ' + case['msa_folder'])
+                continue
+            print(build_edp_store(args.save_folder, case['model_name'], list_stripe_folders(case['msa_folder'])))
+        return 0
+
+    if args.command == 'history':
+        if not os.path.isdir(args.save_folder):
+            os.makedirs(args.save_folder)
+        for case in cases:
+            if not os.path.exists(case['msa_folder']):
+                print('No MSA results for ' + case['model_name'] + ': ' + case['msa_folder'])
+                continue
+            stripes = args.stripes if args.stripes is not None else list_stripe_folders(case['msa_folder'])
+            print(collect_history_archive(case['model_name'], case['msa_folder'], stripes, args.save_folder,
+                                          case['beam_list'], case['column_list'], quantities=args.quantities,
+                                          gm_ids=args.gms, resume=args.resume, n_workers=args.workers))
+        return 0
+
+    if args.command == 'merge':
+        merge_shards(cases, args.save_folder, args.shards, shard_folder=args.shard_folder,
+                     collect_edp=not args.skip_edp, collect_endState=not args.skip_endstate,
+                     fracElement=not args.no_frac, drift_out=args.drift_out, rdrift_out=args.rdrift_out,
+                     edp_format=args.format, endState_layout=args.endstate_layout)
+        return 0
+
+    if args.shard is not None:
+        shard, n_shards = [int(x) for x in args.shard.split('/')]
+        collect_shard(cases, args.save_folder, shard, n_shards, shard_folder=args.shard_folder,
+                      plan_filename=args.plan, collect_edp=not args.skip_edp,
+                      collect_endState=not args.skip_endstate, n_workers=args.workers or 1,
+                      fracElement=not args.no_frac, minrdrift=args.minrdrift,
+                      splice_frac_strain=args.splice_frac_strain, drift_out=args.drift_out,
+                      rdrift_out=args.rdrift_out, prefetch=args.prefetch)
+        return 0
+
+    summary = run_collection(cases, args.save_folder, n_workers=args.workers, collect_edp=not args.skip_edp,
+                             collect_endState=not args.skip_endstate, overwrite=args.overwrite,
+                             resume=args.resume, fused=args.fused, fracElement=not args.no_frac,
+                             minrdrift=args.minrdrift, splice_frac_strain=args.splice_frac_strain,
+                             drift_out=args.drift_out, rdrift_out=args.rdrift_out, prefetch=args.prefetch,
+                             edp_format=args.format, endState_layout=args.endstate_layout)
+    if args.summary is not None:
+        summary.to_csv(args.summary, index=False)
+
+    n_failed = int((summary['error'] != '').sum())
+    print('COLLECTED ' + str(len(summary) - n_failed) + ' JOBS, ' + str(n_failed) + ' FAILED')
+    return 1 if n_failed > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,15 @@
 from .base import *
+from .recorder_io import *
+import io
+import json
+import time
+import collections
+import concurrent.futures
+import contextlib
 
 
 
-def get_story_response(results_folder, beam_list, filenames):
+def get_story_response(results_folder, beam_list, filenames, cache=None):
     # INPUTS
     #    results_folder = path to folder with the results of NLRHA
     #    beam_list      = 2D np.array with 1 or 0 for the beams that exist
@@ -11,84 +18,201 @@ def get_story_response(results_folder, beam_list, filenames):
     #                     'drift'
     #                     'drift_env'
     #                     'acc_env'
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    story_response = dictionary with all results, one key for each filename
     #
 
     n_stories, _ = beam_list.shape
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     story_response = dict(keys=filenames)
 
     # Read results as 1d array
     for file in filenames:
+        # Path to the file of every story
+        filepaths = []
+        for i_story in range(n_stories):
+            if file == 'drift_max':
+                filepaths.append(os.path.join(results_folder, 'story' + str(i_story + 1) + '_drift.out'))
+            else:
+                filepaths.append(os.path.join(results_folder, 'story' + str(i_story + 1) + '_' + file + '.out'))
+        cache.preload(filepaths)
+
         # Collect results for first story
-        if file == 'drift_max':
-            filepath = os.path.join(results_folder, 'story' + str(1) + '_drift.out')
-        else:
-            filepath = os.path.join(results_folder, 'story' + str(1) + '_' + file + '.out')
+        filepath = filepaths[0]
         try:
-            response = np.loadtxt(filepath)
+            response = cache.read(filepath)
         except:
             print('ERROR IN FILE ' + filepath)
             return
 
         if file == 'drift_max':
-            if response.ndim == 2:
-                response = np.max(np.abs(response[:, 1]))  # remove time column
+            response = np.max(np.abs(response[:, 1]))  # remove time column
 
         if file == 'drift':
-            if response.ndim == 2:
-                response = response[:, 1]  # remove time column
+            response = response[:, 1]  # remove time column
 
         if file == 'disp':
             story_response['time'] = response[:, 0]
             response = response[:, 1]
 
         elif file == 'drift_env' or file == 'acc_env':
-            response = response[2]
-
-        # Collect results for all other stories
+            response = response[2, 0]
+
+        # Collect results for all other stories in a (n_stories, n_pts) array ((n_stories, 1) for scalars)
+        if n_stories > 1:
+            n_pts = np.size(response)
+            response_all = np.zeros([n_stories, n_pts])
+            response_all[0] = response
+            response = response_all
         for i_story in range(n_stories - 1):
             i_story = i_story + 1
-            if file == 'drift_max':
-                filepath = os.path.join(results_folder, 'story' + str(i_story + 1) + '_drift.out')
-            else:
-                filepath = os.path.join(results_folder, 'story' + str(i_story + 1) + '_' + file + '.out')
+            filepath = filepaths[i_story]
             # print(filepath)
 
             try:
-                res = np.loadtxt(filepath)
+                res = cache.read(filepath)
             except:
                 print('ERROR IN FILE ' + filepath)
                 return
 
             if file == 'disp' or file == 'drift':
-                if res.ndim == 2:
-                    res = res[:, 1]
-
-                # Make sure all time histories have same length as first story
-                n_pts = len(response.T)
-                if len(res) < n_pts:
-                    aux = np.zeros(n_pts)
-                    aux[:len(res)] = res.flatten()
-                    res = aux
-                elif len(res) > n_pts:
-                    res = res[:n_pts]
+                res = res[:, 1]
+
+                # Make sure all time histories have same length as first story (padded with zeros)
+                n_pts = min(len(res), response.shape[1])
+                response[i_story, :n_pts] = res[:n_pts]
 
             elif file == 'drift_max':
-                res = np.max(np.abs(res[:, 1]))
+                response[i_story] = np.max(np.abs(res[:, 1]))
             elif file == 'drift_env' or file == 'acc_env':
-                res = res[2]
-
-            response = np.vstack((response, res))
+                response[i_story] = res[2, 0]
 
         story_response[file] = response
 
     return story_response
 
 
-def get_EDPstory_response(results_folder, n_stories, file, minrdrift=5e-4):
+def get_story_drift_stats(results_folder, n_stories, cache=None):
+    # Reads every storyN_drift.out file once and computes all the peak and residual drift statistics per story
+    #
+    # INPUTS
+    #    results_folder = path to folder with the results of NLRHA
+    #    n_stories      = int with the number of stories
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
+    #
+    # OUTPUTS
+    #    drift_stats    = dictionary with one entry per story (1D np.array (n_stories,)) for each key
+    #                     'peak_abs'     : peak absolute drift
+    #                     'peak_p'       : peak positive drift (>= 0)
+    #                     'peak_n'       : peak negative drift (<= 0)
+    #                     'residual'     : residual drift keeping the sign
+    #                     'residual_abs' : absolute residual drift
+    #                     'time_peak'    : time of the peak absolute drift
+    #                     'n_rows'       : number of valid rows in the drift history
+    #                     'last_time'    : last valid time of the drift history
+    #                     'story_file'   : story whose drift.out file was used (differs if the file was missing)
+    #                     returns 0 if no drift.out file is available (usually when the RHA did not finish)
+    #
+    # NOTES
+    #    The residual is taken from the last valid row before the final line of the file, i.e., the second to last
+    #    row of a complete history, since the last line sometimes has errors.
+    #
+
+    if cache is None:
+        cache = RecorderCache(results_folder)
+
+    keys = ['peak_abs', 'peak_p', 'peak_n', 'residual', 'residual_abs', 'time_peak', 'n_rows', 'last_time',
+            'story_file']
+    drift_stats = dict()
+    for key in keys:
+        drift_stats[key] = np.zeros(n_stories)
+
+    cache.preload([os.path.join(results_folder, 'story' + str(i_story + 1) + '_drift.out')
+                   for i_story in range(n_stories)], 2)
+
+    i_story_worked = 0
+    for i_story in range(n_stories):
+        filepath = os.path.join(results_folder, 'story' + str(i_story + 1) + '_drift.out')
+        try:
+            story_stats = get_drift_file_stats(filepath, cache=cache)
+            i_story_worked = i_story + 1
+        except:
+            story_stats = None
+
+        if story_stats is None and i_story_worked > 0:
+            # If the drift.out file does not exist for this story, take the previous story that worked
+            print('MISSING: story' + str(i_story + 1) + '_drift.out, TAKING previous story that worked: story' +
+                  str(i_story_worked))
+            for key in keys:
+                drift_stats[key][i_story] = drift_stats[key][i_story - 1]
+        elif story_stats is not None:
+            story_stats['story_file'] = i_story_worked
+            for key in keys:
+                drift_stats[key][i_story] = story_stats[key]
+            if i_story > 0 and drift_stats['story_file'][0] == 0:
+                # First stories without drift.out file take the first story that worked
+                for key in keys:
+                    drift_stats[key][:i_story] = story_stats[key]
+
+    if i_story_worked == 0:
+        print('ERROR COLLECTING DATA FOR:')
+        print(results_folder)
+        print('')
+        return 0
+
+    return drift_stats
+
+
+def get_drift_file_stats(filepath, cache=None):
+    # Computes the peak and residual drift statistics of a single storyN_drift.out file (time, drift)
+    #
+    # INPUTS
+    #    filepath    = path to the drift.out file
+    #    cache       = RecorderCache of the ground motion to reuse the file if already read (None to read it here)
+    #
+    # OUTPUTS
+    #    story_stats = dictionary with the scalar statistics described in get_story_drift_stats
+    #
+
+    if cache is None:
+        cache = RecorderCache()
+
+    rows = cache.read(filepath, 2)
+    if len(rows) == 0:
+        raise ValueError('No drift history in ' + filepath)
+
+    # check if the final line of the file is a complete row (time and drift)
+    integrity = cache.integrity(filepath, 2)
+    last_is_valid = integrity['final_row_complete']
+
+    time = rows[:, 0]
+    drift = rows[:, 1]
+
+    # residual from the last valid row before the final line of the file
+    if last_is_valid and len(drift) > 1:
+        residual = drift[-2]
+    else:
+        residual = drift[-1]
+
+    i_peak = np.argmax(np.abs(drift))
+    story_stats = dict()
+    story_stats['peak_abs'] = np.abs(drift[i_peak])
+    story_stats['peak_p'] = max(np.max(drift), 0)
+    story_stats['peak_n'] = min(np.min(drift), 0)
+    story_stats['residual'] = residual
+    story_stats['residual_abs'] = np.abs(residual)
+    story_stats['time_peak'] = time[i_peak]
+    story_stats['n_rows'] = len(drift)
+    story_stats['last_time'] = integrity['last_time']
+
+    return story_stats
+
+
+def get_EDPstory_response(results_folder, n_stories, file, minrdrift=5e-4, drift_stats=None, cache=None):
     # INPUTS
     #    results_folder = path to folder with the results of NLRHA
     #    n_stories      = int with the number of stories
@@ -111,15 +235,50 @@ def get_EDPstory_response(results_folder, n_stories, file, minrdrift=5e-4):
     #                     'rdrift_max': scalar with maximum absolute residual for the building
     #
     #   minrdrift       = float as minimum value of residual drift to consider
+    #   drift_stats     = output of get_story_drift_stats to reuse for the drift_max and rdrift alternatives
+    #                     (None to read the drift.out files here)
+    #   cache           = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     # OUTPUTS
     #    response = np.array with the response desired per story/floor
     #
 
-    # Read results as 1d array
+    if cache is None:
+        cache = RecorderCache(results_folder)
+
+    # Peak and residual drift from the drift.out histories
     if 'rdrift' in file or 'drift_max' in file:
-        file_save = file
-        file = 'drift'
-    elif 'drift_env' in file:
+        if drift_stats is None:
+            drift_stats = get_story_drift_stats(results_folder, n_stories, cache=cache)
+        if type(drift_stats) == int:
+            return 0
+
+        if file == 'drift_max':
+            response = drift_stats['peak_abs']
+        elif file == 'drift_max_p':
+            response = drift_stats['peak_p']
+        elif file == 'drift_max_n':
+            response = drift_stats['peak_n']
+        elif '_abs' in file or '_max' in file:
+            response = drift_stats['residual_abs']
+        else:
+            response = drift_stats['residual']
+
+        # Minimum RID = minrdrift to avoid numerical issues when pelicun fits a probabilistic model
+        if file == 'rdrift_all_abs' or file == 'rdrift_max':
+            response = np.maximum(response, minrdrift)
+        elif 'rdrift' in file:
+            response = np.where(response < 0, np.minimum(response, -minrdrift), np.maximum(response, minrdrift))
+
+        # Save the maximum across floors or results per floor
+        if file == 'rdrift_max':
+            response = np.max(response)
+        else:
+            response = response.reshape(-1, 1)
+
+        return response
+
+    # Read results as 1d array
+    if 'drift_env' in file:
         file_save = file
         file = 'drift_env'
     elif 'acc_env' in file:
@@ -128,360 +287,101 @@ def get_EDPstory_response(results_folder, n_stories, file, minrdrift=5e-4):
     else:
         print('File name not supported')
 
-    # Reads the first story/floor
-    # (BREAKS DATA COLLECTION IF EMPTY ACC FILES, MEANING THE RHA DID NOT FINISH)
-    if file == 'acc_env':
-        neg_line = 0
-        pos_line = 0
-        last_line = 0
-
-        try:
-            filepath = os.path.join(results_folder, 'story' + str(0) + '_' + file + '.out')
-            with open(filepath) as f:
-                for line in f:
-                    try:
-                        float(line)  # only place if can convert to float (avoid blank spaces in the file)
-                        if line == '\n':
-                            last_line = last_line
-                        else:
-                            last_line = line
-                    except:
-                        last_line = last_line
-
-                    aux = float(last_line)
-                    if neg_line == 0:
-                        neg_line = aux
-                    elif pos_line == 0:
-                        pos_line = aux
-                    else:
-                        last_line = aux
-        except:
-            response = 0
-            return response
+    # Row of the envelope file to keep
+    if '_n' in file_save:
+        i_row = 0
+    elif '_p' in file_save:
+        i_row = 1
+    else:
+        i_row = 2
 
-        if '_n' in file_save:
-            response = np.array(neg_line)
-        elif '_p' in file_save:
-            response = np.array(pos_line)
-        else:
-            response = np.array(last_line)  # read last line as list of strings: ignores first entry (time)
+    # Stories/floors to read
+    if file == 'acc_env':
+        i_first = 0
+        i_floors = range(n_stories)
+    else:
+        i_first = 1
+        i_floors = range(2, n_stories + 1)
+    cache.preload([os.path.join(results_folder, 'story' + str(i_floor) + '_' + file + '.out')
+                   for i_floor in [i_first] + list(i_floors)], 1)
 
-    elif file == 'drift_env':
-        neg_line = 0
-        pos_line = 0
-        last_line = 0
+    # Reads the first story/floor
+    # (BREAKS DATA COLLECTION IF EMPTY ACC FILES, MEANING THE RHA DID NOT FINISH)
+    filepath = os.path.join(results_folder, 'story' + str(i_first) + '_' + file + '.out')
+    try:
+        response = np.array(get_envelope_values(filepath, cache=cache)[i_row])
+    except:
+        response = 0
+        return response
+
+    # Reads the results of the remaining stories/floors in a (n_floors, 1) array
+    if len(i_floors) > 0:
+        response_all = np.zeros([len(i_floors) + 1, 1])
+        response_all[0] = response
+        for i, i_floor in enumerate(i_floors):
+            filepath = os.path.join(results_folder, 'story' + str(i_floor) + '_' + file + '.out')
+            response_all[i + 1] = get_envelope_values(filepath, cache=cache)[i_row]
+        response = response_all
 
-        try:
-            filepath = os.path.join(results_folder, 'story' + str(1) + '_' + file + '.out')
-            with open(filepath) as f:
-                for line in f:
-                    line = line.strip()
-                    line = line.split('\n')[0]
-                    try:
-                        aux = float(line)  # only place if can convert to float (avoid blank spaces in the file)
-                    except:
-                        aux = 0
-
-                    if neg_line == 0:
-                        neg_line = aux
-                    elif pos_line == 0:
-                        pos_line = aux
-                    else:
-                        last_line = aux
-        except:
-            response = 0
-            return response
+    return response
 
-        if '_n' in file_save:
-            response = np.array(neg_line)
-        elif '_p' in file_save:
-            response = np.array(pos_line)
-        else:
-            response = np.array(last_line)  # read last line as list of strings: ignores first entry (time)
 
-    else:
-        # Find story with drift.out file available
-        for i in range(n_stories):
-            filepath = os.path.join(results_folder, 'story' + str(i + 1) + '_' + file + '.out')
-            try:
-                #                 response = pd.read_csv(filepath, header=None, sep=' ')
-                #                 response = response.values
-                with open(filepath) as f:
-                    last_line = 0
-                    for line in f:
-                        prev_line = last_line
-                        if file == 'drift':
-                            try:
-                                aux = line.split()
-                                aux = [float(x) for x in
-                                       aux]  # convert to list of floats, empty "line" gives an error here
-                                # should be two cell vector because the output must include time or should not be a space
-                                if len(aux) == 1 or line == '\n':
-                                    last_line = last_line
-                                else:
-                                    last_line = line
-                            except:
-                                last_line = last_line
-                        else:
-                            last_line = line
-                    if file == 'drift':
-                        aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-                    else:
-                        aux = last_line.split()  # read last line as list of strings (drift_env)
+def get_envelope_values(filepath, cache=None):
+    # Reads an EnvelopeNode or EnvelopeDrift recorder file
+    #
+    # INPUTS
+    #    filepath = path to the storyN_acc_env.out or storyN_drift_env.out file
+    #    cache    = RecorderCache of the ground motion to reuse the file if already read (None to read it here)
+    #
+    # OUTPUTS
+    #    envelope = 1D np.array with [negative peak, positive peak, absolute peak]
+    #               (zero for the values not written in the file)
+    #
 
-                    aux = [float(x) for x in aux]  # convert to list of floats
-                    response = np.array(np.abs(aux))
-                i_story_worked = i + 1
-                break
-            except:
-                 pass
-                # print('MISSING: story' + str(i + 1) + '_' + file + '.out')
+    if cache is None:
+        cache = RecorderCache()
 
-        # Check if results on every story are not consistent
-        # (usually when the building collapses in the first step)
-        if 'i_story_worked' in locals():
-            filepath = os.path.join(results_folder, 'story' + str(i_story_worked) + '_' + file + '.out')
-        else:
-            print('ERROR COLLECTING DATA FOR:')
-            print(results_folder)
-            print('')
-            return 0
+    data = cache.read(filepath, 1)
+    envelope = np.zeros(3)
+    n_rows = min(len(data), 3)
+    envelope[:n_rows] = data[:n_rows, 0]
 
-        with open(filepath) as f:
-            last_line = 0
-            drift_max = 0
-            drift_max_p = 0
-            drift_max_n = 0
-            for line in f:
-                prev_line = last_line
-                try:
-                    aux = line.split()
-                    aux = [float(x) for x in aux]  # convert to list of floats, empty "line" gives an error here
-                    # should be two cell vector because the output must include time or should not be a space
-                    if len(aux) == 1 or line == '\n':
-                        last_line = last_line
-                    else:
-                        last_line = line
-                except:
-                    last_line = last_line
-
-                aux = last_line.split()
-                aux = [float(x) for x in aux]
-                drift_max = np.max([np.abs(aux[1]), drift_max])
-                drift_max_p = np.max([aux[1], drift_max_p])
-                drift_max_n = np.min([aux[1], drift_max_n])
-
-            if file_save == 'drift_max':
-                res = np.array(drift_max)
-            elif file_save == 'drift_max_p':
-                res = np.array(drift_max_p)
-            elif file_save == 'drift_max_n':
-                res = np.array(drift_max_n)
-            elif 'rdrift' in file_save:
-                aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-                aux = [float(x) for x in aux]  # convert to list of floats
-                if '_abs' in file_save or '_max' in file_save:
-                    res = np.array(np.abs(aux[1]))  # ignores first entry (time)
-                else:
-                    res = np.array(aux[1])  # ignores first entry (time)
+    return envelope
 
-            if file_save == 'rdrift_all_abs' or file_save == 'rdrift_max':
-                res = max(res, minrdrift)
-            elif 'rdrift' in file_save:
-                if res < 0:
-                    res = min(res, -minrdrift)
-                else:
-                    res = max(res, minrdrift)
-            response = res
 
-    # Reads and append the results of the remaining stories/floors
-    if file == 'acc_env':
-        for i_floor in range(n_stories):
-            filepath = os.path.join(results_folder, 'story' + str(i_floor) + '_' + file + '.out')
-            #             res = np.loadtxt(filepath)
-            #             res = pd.read_csv(filepath, header=None, sep=' ')
-            #             res = res.values
-            with open(filepath) as f:
-                neg_line = 0
-                pos_line = 0
-                last_line = 0
-                for line in f:
-                    try:
-                        float(line)  # only place if can convert to float (avoid blank spaces in the file)
-                        # should not be a space
-                        if line == '\n':
-                            last_line = last_line
-                        else:
-                            last_line = line
-                    except:
-                        last_line = last_line
-
-                    aux = float(last_line)
-                    if neg_line == 0:
-                        neg_line = aux
-                    elif pos_line == 0:
-                        pos_line = aux
-                    else:
-                        last_line = aux
+def get_DSC_flange(results_folder, file, n_connections, cache=None):
+    # Read the fracture state at the end of the analysis for one flange of every connection
+    #
+    # INPUTS
+    #    results_folder = path to folder with the results of NLRHA
+    #    file           = 'frac_LB', 'frac_LT', 'frac_RB' or 'frac_RT'
+    #    n_connections  = number of connections in the frame
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
+    #
+    # OUTPUTS
+    #    frac           = 1D np.array with the absolute fracture flag per connection
+    #
 
-                if '_n' in file_save:
-                    res = np.array(neg_line)
-                elif '_p' in file_save:
-                    res = np.array(pos_line)
-                else:
-                    res = np.array(last_line)  # read last line as list of strings: ignores first entry (time)
-            res
-            response = np.vstack((response, res))
-    else:
-        for i_story in range(n_stories - 1):
-            i_story = i_story + 1
-            filepath = os.path.join(results_folder, 'story' + str(i_story + 1) + '_' + file + '.out')
-
-            if file == 'drift':
-                try:
-                    # Check if drift.out file exist (some runs are not producing this output for some stories)
-                    # res = pd.read_csv(filepath, header=None, sep=' ')
-                    # res = res.values
-                    with open(filepath) as f:
-                        last_line = 0
-                        drift_max = 0
-                        drift_max_p = 0
-                        drift_max_n = 0
-                        for line in f:
-                            prev_line = last_line
-                            try:
-                                aux = line.split()
-                                aux = [float(x) for x in
-                                       aux]  # convert to list of floats, empty "line" gives an error here
-                                # should be two cell vector because the output must include time or should not be a space
-                                if len(aux) == 1 or line == '\n':
-                                    last_line = last_line
-                                else:
-                                    last_line = line
-                            except:
-                                last_line = last_line
-
-                            aux = last_line.split()
-                            aux = [float(x) for x in aux]
-                            drift_max = np.max([np.abs(aux[1]), drift_max])
-                            drift_max_p = np.max([aux[1], drift_max_p])
-                            drift_max_n = np.min([aux[1], drift_max_n])
-
-                        if file_save == 'drift_max':
-                            res = np.array(drift_max)
-                        elif file_save == 'drift_max_p':
-                            res = np.array(drift_max_p)
-                        elif file_save == 'drift_max_n':
-                            res = np.array(drift_max_n)
-                        elif 'rdrift' in file_save:
-                            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-                            aux = [float(x) for x in aux]  # convert to list of floats
-                            if '_abs' in file_save or '_max' in file_save:
-                                res = np.array(np.abs(aux[1]))  # ignores first entry (time)
-                            else:
-                                res = np.array(aux[1])  # ignores first entry (time)
-
-                    i_story_worked = i_story + 1
-                except:
-                    # If the drift.out file does not exist for this story, take the previous story
-                    print('MISSING: story' + str(
-                        i_story + 1) + '_' + file + '.out, TAKING previous story that worked: story' + str(
-                        i_story_worked))
-                    filepath = os.path.join(results_folder, 'story' + str(i_story_worked) + '_' + file + '.out')
-                    # res = pd.read_csv(filepath, header=None, sep=' ')
-                    # res = res.values
-                    with open(filepath) as f:
-                        last_line = 0
-                        drift_max = 0
-                        drift_max_p = 0
-                        drift_max_n = 0
-                        for line in f:
-                            prev_line = last_line
-                            try:
-                                aux = line.split()
-                                aux = [float(x) for x in
-                                       aux]  # convert to list of floats, empty "line" gives an error here
-                                # should be two cell vector because the output must include time or should not be a space
-                                if len(aux) == 1 or line == '\n':
-                                    last_line = last_line
-                                else:
-                                    last_line = line
-                            except:
-                                last_line = last_line
-
-                            aux = last_line.split()
-                            aux = [float(x) for x in aux]
-                            drift_max = np.max([np.abs(aux[1]), drift_max])
-                            drift_max_p = np.max([aux[1], drift_max_p])
-                            drift_max_n = np.min([aux[1], drift_max_n])
-
-                        if file_save == 'drift_max':
-                            res = np.array(drift_max)
-                        elif file_save == 'drift_max_p':
-                            res = np.array(drift_max_p)
-                        elif file_save == 'drift_max_n':
-                            res = np.array(drift_max_n)
-                        elif 'rdrift' in file_save:
-                            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-                            aux = [float(x) for x in aux]  # convert to list of floats
-                            if '_abs' in file_save or '_max' in file_save:
-                                res = np.array(np.abs(aux[1]))  # ignores first entry (time)
-                            else:
-                                res = np.array(aux[1])  # ignores first entry (time)
-
-            else:  # drift_env.out
-
-                # res = pd.read_csv(filepath, header=None, sep=' ')
-                # res = res.values
-                neg_line = 0
-                pos_line = 0
-                last_line = 0
-                with open(filepath) as f:
-                    for line in f:
-                        line = line.strip()
-                        line = line.split('\n')[0]
-                        try:
-                            aux = float(line)  # only place if can convert to float (avoid blank spaces in the file)
-                        except:
-                            aux = 0
-
-                        if neg_line == 0:
-                            neg_line = aux
-                        elif pos_line == 0:
-                            pos_line = aux
-                        else:
-                            last_line = aux
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
-                    if '_n' in file_save:
-                        res = np.array(neg_line)
-                    elif '_p' in file_save:
-                        res = np.array(pos_line)
-                    else:
-                        res = np.array(last_line)  # read last line as list of strings: ignores first entry (time)
-
-            # Minimum RID = minrdrift to avoid numerical issues when pelicun fits a probabilistic model
-            if file_save == 'rdrift_all_abs' or file_save == 'rdrift_max':
-                res = max(res, minrdrift)
-            elif 'rdrift' in file_save:
-                if res < 0:
-                    res = min(res, -minrdrift)
-                else:
-                    res = max(res, minrdrift)
+    filepath = os.path.join(results_folder, file + '.out')
 
-            # Save the maximum across floors or results per floor
-            if file_save == 'rdrift_max':
-                response = np.max([response, res])
-            else:
-                response = np.vstack((response, res))
+    # only keeps set of results that include all connections
+    rows = cache.tail(filepath, n_connections)
+    if len(rows) == 0:
+        print('WARNING: no complete row of results in ' + filepath + ', assuming no fractures')
+        return np.zeros(n_connections)
 
-    return response
+    return np.abs(rows[-1])
 
 
-def get_DSC(results_folder, n_connections):
+def get_DSC(results_folder, n_connections, cache=None):
     # Read response for each flange in each connection and interpretes the damage state of the connection per FEMAP58
     #
     # INPUTS
     #    results_folder = path to folder with the results of NLRHA
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    DSC            = 1D np.array with the DS for each connection starting with all the
@@ -493,108 +393,15 @@ def get_DSC(results_folder, n_connections):
     #
 
     # Left connection
-    file = 'frac_LB'
-    filepath = os.path.join(results_folder, file + '.out')
-    with open(filepath) as f:
-        last_line = 0
-        prev_line = 0
-        pp_line = 0
-        for line in f:
-            ppp_line = pp_line
-            pp_line = prev_line
-            prev_line = last_line
-            if line == '\n':
-                last_line = last_line
-            else:
-                last_line = line
-        aux = last_line.split()  # read second to last line in a time history since sometimes has errors
-        # only keeps set of results that include all connections (considering last 4 lines)
-        if len(aux) != n_connections:
-            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-            if len(aux) != n_connections:
-                aux = pp_line.split()  # read second to last line in a time history since sometimes has errors
-                if len(aux) != n_connections:
-                    aux = ppp_line.split()  # read second to last line in a time history since sometimes has errors
-        aux = [float(x) for x in aux]  # convert to list of floats
-        frac_LB = np.abs(aux)
-
-    file = 'frac_LT'
-    filepath = os.path.join(results_folder, file + '.out')
-    with open(filepath) as f:
-        last_line = 0
-        prev_line = 0
-        pp_line = 0
-        for line in f:
-            ppp_line = pp_line
-            pp_line = prev_line
-            prev_line = last_line
-            if line == '\n':
-                last_line = last_line
-            else:
-                last_line = line
-        aux = last_line.split()  # read second to last line in a time history since sometimes has errors
-        # only keeps set of results that include all connections (considering last 4 lines)
-        if len(aux) != n_connections:
-            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-            if len(aux) != n_connections:
-                aux = pp_line.split()  # read second to last line in a time history since sometimes has errors
-                if len(aux) != n_connections:
-                    aux = ppp_line.split()  # read second to last line in a time history since sometimes has errors
-        aux = [float(x) for x in aux]  # convert to list of floats
-        frac_LT = np.abs(aux)
+    frac_LB = get_DSC_flange(results_folder, 'frac_LB', n_connections, cache=cache)
+    frac_LT = get_DSC_flange(results_folder, 'frac_LT', n_connections, cache=cache)
     frac_LT = frac_LT * 2
 
     frac_L = frac_LB + frac_LT
 
     # Right connection
-    file = 'frac_RB'
-    filepath = os.path.join(results_folder, file + '.out')
-    with open(filepath) as f:
-        last_line = 0
-        prev_line = 0
-        pp_line = 0
-        for line in f:
-            ppp_line = pp_line
-            pp_line = prev_line
-            prev_line = last_line
-            if line == '\n':
-                last_line = last_line
-            else:
-                last_line = line
-        aux = last_line.split()  # read second to last line in a time history since sometimes has errors
-        # only keeps set of results that include all connections (considering last 4 lines)
-        if len(aux) != n_connections:
-            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-            if len(aux) != n_connections:
-                aux = pp_line.split()  # read second to last line in a time history since sometimes has errors
-                if len(aux) != n_connections:
-                    aux = ppp_line.split()  # read second to last line in a time history since sometimes has errors
-        aux = [float(x) for x in aux]  # convert to list of floats
-        frac_RB = np.abs(aux)
-    file = 'frac_RT'
-    filepath = os.path.join(results_folder, file + '.out')
-    with open(filepath) as f:
-        last_line = 0
-        prev_line = 0
-        pp_line = 0
-        for line in f:
-            ppp_line = pp_line
-            pp_line = prev_line
-            prev_line = last_line
-            if line == '\n':
-                last_line = last_line
-            else:
-                last_line = line
-        aux = last_line.split()  # read second to last line in a time history since sometimes has errors
-        # only keeps set of results that include all connections (considering last 4 lines)
-        if len(aux) != n_connections:
-            aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-            if len(aux) != n_connections:
-                aux = pp_line.split()  # read second to last line in a time history since sometimes has errors
-                if len(aux) != n_connections:
-                    aux = ppp_line.split()  # read second to last line in a time history since sometimes has errors
-        aux = [float(x) for x in aux]  # convert to list of floats
-        frac_RT = np.abs(aux)
+    frac_RB = get_DSC_flange(results_folder, 'frac_RB', n_connections, cache=cache)
+    frac_RT = get_DSC_flange(results_folder, 'frac_RT', n_connections, cache=cache)
     frac_RT = frac_RT * 2
 
     frac_R = frac_RB + frac_RT
@@ -604,12 +411,13 @@ def get_DSC(results_folder, n_connections):
     return DSC
 
 
-def get_DSsplice(results_folder, splice_frac_strain, n_splices):
+def get_DSsplice(results_folder, splice_frac_strain, n_splices, cache=None):
     # Read response for each flange in each connection and interpretes the damage state of the connection per FEMAP58
     #
     # INPUTS
     #    results_folder     = path to folder with the results of NLRHA
     #    splice_frac_strain = strain limit to judge that fracture occured in the splice
+    #    cache              = RecorderCache of the ground motion to reuse the files already read (None to read here)
     #
     # OUTPUTS
     #    DSsplice           = 1D np.array with the DS for each connection starting with all the
@@ -620,30 +428,18 @@ def get_DSsplice(results_folder, splice_frac_strain, n_splices):
 
     # Inputs
     file = 'ss_splice'
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     filepath = os.path.join(results_folder, file + '.out')
-    with open(filepath) as f:
-        max_res = np.zeros(2*n_splices)
-        last_line = 0
-        for line in f:
-            prev_line = last_line
-            try:
-                aux = line.split()
-                aux = [abs(float(x)) for x in aux]  # convert to list of floats, empty "line" gives an error here
-                if len(aux) != 2*n_splices: # only keeps set of results that include all splices (stress and strain)
-                    last_line = last_line
-                else:
-                    last_line = line
-                    max_res = np.max(max_res, aux, axis=0)
-            except:
-                last_line = last_line
-        # Take the last value
-        # aux = prev_line.split()  # read second to last line in a time history since sometimes has errors
-        # aux = [float(x) for x in aux]  # convert to list of floats
-        # data_1d = np.abs(aux)
-
-        # Take the max value in the history
-        data_1d = max_res
+    # only keeps set of results that include all splices (stress and strain)
+    data = cache.read(filepath, 2*n_splices)
+
+    # Take the max value in the history
+    data_1d = np.zeros(2*n_splices)
+    if len(data) > 0:
+        data_1d = np.max(np.abs(data), axis=0)
+
     n_cols = len(data_1d)
 
     # extract strain
@@ -656,41 +452,339 @@ def get_DSsplice(results_folder, splice_frac_strain, n_splices):
     return DSsplice
 
 
-def collect_gmset_response(stripe_folder_path, beam_list, fracElement, dir_i, spliceElement, splice_list, column_list,
-                           drift_out='abs', rdrift_out='max', minrdrift=5e-4, splice_frac_strain=60 * 2 / 29000):
-    # Creates a table per stripe with the peak responses per story/floor
+def collect_gm_response(results_folder, beam_list, fracElement, spliceElement, splice_list, drift_out='abs',
+                        rdrift_out='max', minrdrift=5e-4, splice_frac_strain=60 * 2 / 29000, cache=None, msa_text=None,
+                        files=None, listing=None):
+    # Collects the row of collect_gmset_response for a single ground motion
     #
     # INPUTS
-    #    stripe_folder_path = path to find the results for each ground motions
-    #    beam_list          = 2D np.array with 1 or 0 for the beams that exist
-    #    fracElement        = true : collects damage state for each connection
-    #                         false: skip collection of connection damage state
-    #    dir_i              = Code used to identify direction for EDP file format
-    #                         1: denotes X
-    #                         2: denotes Y
-    #    spliceElement      = boolean to collect or not splice damage states
-    #    splice_list        = 2D np.array with 1 or 0 for the stories where splices exist
-    #    column_list        = list of 2D np.array indicating which columns exist
-    #    drift_out          = Method to output peak drift
-    #                         -> 'abs' = multiple columns with the peak absolute value for each floor
-    #                         -> 'both' = multiple columns with the peak positive an negative value for each floor
-    #    rdrift_out         = Method to output residual drift
-    #                         -> 'max' = single column with the maximum residual across floors
-    #                         -> 'all_abs' = multiple columns with the residual absolute value for each floor
-    #                         -> 'all' = multiple columns with the residual for each floor with its sign
-    #    minrdrift          = float as minimum value of residual drift to consider
-    #    splice_frac_strain = strain limit to judge that fracture occured in the splice
+    #    results_folder     = path to folder with the results of NLRHA of the ground motion
+    #    beam_list, fracElement, spliceElement, splice_list, drift_out, rdrift_out, minrdrift, splice_frac_strain
+    #                       = same as collect_gmset_response
+    #    cache              = RecorderCache of the ground motion (None to create one with files and listing)
+    #    msa_text           = content of MSA.txt if already read, e.g. from the manifest (None to read it here)
+    #    files              = content of the files of the ground motion if not in disk (see RecorderCache)
+    #    listing            = filenames in the ground motion folder (see RecorderCache)
     #
-    # OUTPUT
-    #    response_matrix    = pd.DataFrame with all the results (columns) for each ground motion (rows) in this stripe
+    # OUTPUTS
+    #    response_gm        = tuple (endCriteria, edp_gm) with the str EndCriteria and a 1D np.array with all the EDPs in
+    #                         the order of the columns of collect_gmset_response (None if the RHA did not finish)
     #
 
-    n_stories, n_bays = beam_list.shape
+    n_stories, _ = beam_list.shape
+    if cache is None:
+        cache = RecorderCache(results_folder, files=files, listing=listing)
+
+    pfa_gm = get_EDPstory_response(results_folder, n_stories, 'acc_env', cache=cache)
+    # parse the drift.out files only once for all the peak and residual drift alternatives
+    drift_stats = get_story_drift_stats(results_folder, n_stories, cache=cache)
+    rdrift_gm = get_EDPstory_response(results_folder, n_stories, 'rdrift_' + rdrift_out, minrdrift=minrdrift,
+                                      drift_stats=drift_stats, cache=cache)
+    if drift_out == 'abs':
+        pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_env', cache=cache)
+        if type(pid_gm) == int:
+            pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_max', drift_stats=drift_stats,
+                                           cache=cache)
+    else:
+        pid_gm_p = get_EDPstory_response(results_folder, n_stories, 'drift_env_p', cache=cache)
+        if type(pid_gm_p) == int:
+            pid_gm_p = get_EDPstory_response(results_folder, n_stories, 'drift_max_p', drift_stats=drift_stats,
+                                             cache=cache)
+        pid_gm_n = get_EDPstory_response(results_folder, n_stories, 'drift_env_n', cache=cache)
+        if type(pid_gm_n) == int:
+            pid_gm_n = get_EDPstory_response(results_folder, n_stories, 'drift_max_n', drift_stats=drift_stats,
+                                             cache=cache)
+        if type(pid_gm_p) == int or type(pid_gm_n) == int:
+            pid_gm = 0
+        else:
+            pid_gm = np.hstack((pid_gm_p.flatten(), pid_gm_n.flatten()))
+
+    if type(pfa_gm) == int:  # did not finish RHA, so skip the ground motion
+        print('Did not finish GM (ACC ZERO): ' + results_folder)
+        print()
+        return
+    elif type(rdrift_gm) == int:  # did not finish RHA, so skip the ground motion
+        print('Did not finish GM (RDRIFT ZERO): ' + results_folder)
+        print()
+        return
+    elif type(pid_gm) == int:  # did not finish RHA, so skip the ground motion
+        print('Did not finish GM (DRIFT ZERO): ' + results_folder)
+        print()
+        return
+    else:
+        # pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_env')
+        # try:
+        # rdrift_gm = get_EDPstory_response(results_folder, n_stories, 'rdrift_' + rdrift_out, minrdrift=minrdrift)
+        # except:
+        #     print('ERROR drift for ' + results_folder)
+
+        if fracElement:
+            dsc_gm = get_DSC(results_folder, np.sum(beam_list), cache=cache)
+            # print(np.sum(beam_list)*2)
+            # print(len(dsc_gm.flatten()))
+        if spliceElement:
+            dssplice_gm = get_DSsplice(results_folder, splice_frac_strain, np.sum(splice_list), cache=cache)
+            # print(np.sum(splice_list))
+            # print(len(dssplice_gm.flatten()))
+
+        if msa_text is None:
+            msa_text = cache.read_text(os.path.join(results_folder, 'MSA.txt'))
+        try:
+            maxDrift_wcollapse = np.loadtxt(io.StringIO(msa_text))
+        except:
+            for line in msa_text.splitlines():
+                maxDrift_wcollapse = line.strip()
+
+        if type(maxDrift_wcollapse) == str:
+            if  maxDrift_wcollapse == 'Collapsed':
+                endCriteria = 'MaxDrift'
+            else:
+                endCriteria = 'nonCollapse'
+
+        else:
+
+            # Find unknown errors
+            try:
+                np.max(np.abs(pid_gm))
+            except:
+                print(pid_gm)
+                print('UNKNOWN ERROR: ' + results_folder)
+
+            # Define endCriteria
+            if (maxDrift_wcollapse > 0.099) and (np.max(np.abs(pid_gm)) > 0.07):
+                # Maximum drift reached during the analysis
+                endCriteria = 'MaxDrift'
+            #                 response_gm = np.hstack((endCriteria, np.zeros(pid_gm.shape).flatten(), np.zeros(rdrift_gm.shape).flatten(), \
+            #                                          np.zeros(pfa_gm.shape).flatten(), np.zeros(dsc_gm.shape).flatten()))
+            elif (maxDrift_wcollapse > 0.099) and (np.max(np.abs(pid_gm)) < 0.07):
+                # Inconvergence
+                endCriteria = 'Inconvergence'
+            #                 response_gm = np.hstack((endCriteria, np.zeros(pid_gm.shape).flatten(), np.zeros(rdrift_gm.shape).flatten(), \
+            #                                          np.zeros(pfa_gm.shape).flatten(), np.zeros(dsc_gm.shape).flatten()))
+            else:
+                # Non collapse
+                endCriteria = 'nonCollapse'
+            #                 response_gm = np.hstack((endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten()))
+
+        if fracElement and spliceElement:
+            response_gm = (endCriteria, np.hstack(
+                (pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten(), dssplice_gm.flatten())))
+        elif fracElement:
+            response_gm = (endCriteria, np.hstack(
+                (pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten())))
+        elif spliceElement:
+            response_gm = (endCriteria, np.hstack(
+                (pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dssplice_gm.flatten())))
+        else:
+            try:
+                pid_gm.flatten()
+            except:
+                print('pid_gm')
+                print(results_folder)
+            try:
+                rdrift_gm.flatten()
+            except:
+                print('pid_gm')
+                print(results_folder)
+            try:
+                pfa_gm.flatten()
+            except:
+                print('pid_gm')
+                print(results_folder)
+
+            response_gm = (endCriteria, np.hstack((pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten())))
+
+        # print(response_gm)
+        # print(len(response_gm))
+        # print('DONE: ' + results_folder)
+        return response_gm
+
+
+end_criteria_categories = ['nonCollapse', 'MaxDrift', 'Inconvergence']
+
+
+def get_edp_table(response, gm_ids, column_names, dtype=np.float64):
+    # Table of collect_gmset_response from the rows of collect_gm_response, filling a single numeric matrix
+    #
+    # INPUTS
+    #    response        = list with the output of collect_gm_response of each ground motion (endCriteria, edp_gm)
+    #    gm_ids          = list with the name of each ground motion (index of the table)
+    #    column_names    = list of str, see get_edp_column_names
+    #    dtype           = type of the EDP columns (np.float64, or np.float32 to halve the memory)
+    #
+    # OUTPUTS
+    #    response_matrix = pd.DataFrame with EndCriteria as a categorical column (end_criteria_categories) and the
+    #                      EDPs as numeric columns
+    #
+
+    edp_matrix = np.zeros([len(response), len(column_names) - 1], dtype=dtype)
+    end_criteria = []
+    for i_gm, (endCriteria, edp_gm) in enumerate(response):
+        end_criteria.append(endCriteria)
+        edp_matrix[i_gm] = edp_gm
+
+    response_matrix = pd.DataFrame(edp_matrix, columns=column_names[1:], index=gm_ids)
+    response_matrix.insert(0, column_names[0], pd.Categorical(end_criteria, categories=end_criteria_categories))
+
+    return response_matrix
+
 
-    gm_ids = os.listdir(stripe_folder_path)
-    n_gms = len(gm_ids)
+edp_formats = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+
+
+def get_edp_filename(save_results_folder, model_name, stripe, edp_format='csv'):
+    # Path to the EDP table of a stripe, EDP_<model_name>_<stripe> with the extension of edp_format
+    return os.path.join(save_results_folder, 'EDP_' + model_name + '_' + stripe + edp_formats[edp_format])
+
+
+def check_edp_format(edp_format):
+    # Raises an error before collecting anything if the EDP tables can not be saved in edp_format
+    if edp_format not in edp_formats:
+        raise ValueError('edp_format must be one of: ' + ', '.join(edp_formats))
+    if edp_format != 'csv':
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError('EDP tables in ' + edp_format + ' format require pyarrow, install it with '
+                              'pip install frame_postprocess[parquet]')
+
+
+def set_edp_types(results, dtype=np.float64):
+    # EDP table with EndCriteria as a categorical column and the EDPs as numeric columns, e.g. after reading a .csv
+    # file (the columns EndCriteriaX and EndCriteriaY of collect_XandY_response are also categorical)
+    results = results.copy()
+    for column in results.columns:
+        if column.startswith('EndCriteria'):
+            results[column] = pd.Categorical(results[column].astype(str), categories=end_criteria_categories)
+        else:
+            results[column] = results[column].astype(dtype)
+    return results
+
+
+def save_edp_table(results, results_filename, stripe=None):
+    # Saves an EDP table in the format given by the extension of results_filename (.csv, .parquet or .feather)
+    #
+    # INPUTS
+    #    results          = output of collect_gmset_response
+    #    results_filename = path to the file to save
+    #    stripe           = name of the stripe, saved in the column 'stripe' of the columnar formats
+    #
+    # NOTES
+    #    The .parquet and .feather files keep the types of the table and have one row per ground motion with the
+    #    columns stripe, gm_id (the index of the table), EndCriteria and the EDPs, so a whole building can be read
+    #    at once selecting only the EDPs needed (see read_edp_tables).
+    #
+
+    if results_filename.endswith('.csv'):
+        results.to_csv(results_filename)
+        return
+
+    table = results.copy()
+    table.index = table.index.astype(str)
+    table.index.name = 'gm_id'
+    table = table.reset_index()
+    table.insert(0, 'stripe', pd.Categorical([str(stripe)] * len(table)))
+    if results_filename.endswith('.parquet'):
+        table.to_parquet(results_filename, index=False)
+    else:
+        # uncompressed, so read_edp_tables can memory-map it
+        table.to_feather(results_filename, compression='uncompressed')
+
+
+def select_edp_columns(names, columns):
+    # Names in names that are in columns, or whose EDP type is in columns (e.g. 'PID' selects every 1-PID-i-j)
+    if columns is None:
+        return list(names)
+    return [name for name in names if name in columns or (len(name.split('-')) > 2 and name.split('-')[1] in columns)]
+
+
+def read_edp_table(results_filename, columns=None, text=False):
+    # Reads an EDP table saved by save_edp_table
+    #
+    # INPUTS
+    #    results_filename = path to the .csv, .parquet or .feather file
+    #    columns          = list of the columns to read, with their names or their EDP type (e.g. ['EndCriteria', 'PID',
+    #                       'DSC']). None to read every column
+    #    text             = True to read the values of a .csv file as str, exactly as saved
+    #
+    # OUTPUTS
+    #    results          = pd.DataFrame with the ground motions as index, same as collect_gmset_response
+    #
+
+    if results_filename.endswith('.csv'):
+        results = pd.read_csv(results_filename, index_col=0, dtype=str if text else None)
+        results.index = results.index.astype(str)
+        results = results[select_edp_columns(results.columns, columns)]
+        if not text:
+            results = set_edp_types(results)
+        return results
+
+    check_edp_format('parquet' if results_filename.endswith('.parquet') else 'feather')
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    if results_filename.endswith('.parquet'):
+        names = pyarrow.parquet.read_schema(results_filename).names
+        names = ['gm_id'] + select_edp_columns(names[2:], columns)
+        results = pyarrow.parquet.read_table(results_filename, columns=names).to_pandas()
+    else:
+        with pyarrow.memory_map(results_filename) as source:
+            names = pyarrow.ipc.open_file(source).schema.names
+        names = ['gm_id'] + select_edp_columns(names[2:], columns)
+        results = pyarrow.feather.read_table(results_filename, columns=names, memory_map=True).to_pandas()
+    results = results.set_index('gm_id')
+    results.index.name = None
+
+    return results
+
+
+def read_edp_tables(save_results_folder, model_name, stripes, columns=None):
+    # Reads the EDP tables of every stripe of a case in a single table, e.g. to load only some EDPs of a building
+    #
+    # INPUTS
+    #    save_results_folder = path to the collected results
+    #    model_name          = str with the case name
+    #    stripes             = list with the name of the stripes
+    #    columns             = see read_edp_table
+    #
+    # OUTPUTS
+    #    results             = pd.DataFrame with the ground motions as index, the column 'stripe' and the columns read
+    #
+    # NOTES
+    #    Each stripe is read from its .parquet or .feather file if it exists (only the columns requested are read),
+    #    or from its .csv file otherwise.
+    #
+
+    tables = []
+    for stripe in stripes:
+        for edp_format in ['feather', 'parquet', 'csv']:
+            results_filename = get_edp_filename(save_results_folder, model_name, stripe, edp_format=edp_format)
+            if os.path.isfile(results_filename):
+                break
+        table = read_edp_table(results_filename, columns=columns)
+        table.insert(0, 'stripe', stripe)
+        tables.append(table)
+
+    results = pd.concat(tables)
+    results['stripe'] = pd.Categorical(results['stripe'], categories=list(stripes))
+
+    return results
+
+
+def get_edp_column_names(beam_list, fracElement, dir_i, spliceElement, splice_list, column_list, drift_out='abs',
+                         rdrift_out='max'):
+    # Column names of the table of collect_gmset_response (EndCriteria followed by the EDPs in the pelicun format)
+    #
+    # INPUTS
+    #    beam_list, fracElement, dir_i, spliceElement, splice_list, column_list, drift_out, rdrift_out
+    #                 = same as collect_gmset_response
+    #
+    # OUTPUTS
+    #    column_names = list of str
+    #
+
+    n_stories, n_bays = beam_list.shape
 
-    # Define column names for dataframe
     column_names = []
     column_names.append('EndCriteria')
     if drift_out == 'abs':
@@ -731,143 +825,814 @@ def collect_gmset_response(stripe_folder_path, beam_list, fracElement, dir_i, sp
                     column_names.append('1-DSS-' + str(i_story + 1) + '-' + "{0:0=3d}".format(
                         dir_i * 100 + i_pier))  # DSC: Damage State Splice
 
+    return column_names
+
+
+def collect_gmset_response(stripe_folder_path, beam_list, fracElement, dir_i, spliceElement, splice_list, column_list,
+                           drift_out='abs', rdrift_out='max', minrdrift=5e-4, splice_frac_strain=60 * 2 / 29000,
+                           manifest_folder=None, executor=None, n_workers=1, resume_filename=None, prefetch=0,
+                           dtype=np.float64, rescan=False):
+    # Creates a table per stripe with the peak responses per story/floor
+    #
+    # INPUTS
+    #    stripe_folder_path = path to find the results for each ground motions
+    #    beam_list          = 2D np.array with 1 or 0 for the beams that exist
+    #    fracElement        = true : collects damage state for each connection
+    #                         false: skip collection of connection damage state
+    #    dir_i              = Code used to identify direction for EDP file format
+    #                         1: denotes X
+    #                         2: denotes Y
+    #    spliceElement      = boolean to collect or not splice damage states
+    #    splice_list        = 2D np.array with 1 or 0 for the stories where splices exist
+    #    column_list        = list of 2D np.array indicating which columns exist
+    #    drift_out          = Method to output peak drift
+    #                         -> 'abs' = multiple columns with the peak absolute value for each floor
+    #                         -> 'both' = multiple columns with the peak positive an negative value for each floor
+    #    rdrift_out         = Method to output residual drift
+    #                         -> 'max' = single column with the maximum residual across floors
+    #                         -> 'all_abs' = multiple columns with the residual absolute value for each floor
+    #                         -> 'all' = multiple columns with the residual for each floor with its sign
+    #    minrdrift          = float as minimum value of residual drift to consider
+    #    splice_frac_strain = strain limit to judge that fracture occured in the splice
+    #    manifest_folder    = path to folder to save the manifest of the stripe (None to keep it only in memory), see
+    #                         get_stripe_manifest
+    #    executor           = concurrent.futures executor to collect the ground motions in parallel (None to use
+    #                         n_workers)
+    #    n_workers          = number of processes to collect the ground motions in parallel if no executor is given
+    #                         (1 to collect them serially)
+    #    resume_filename    = path to the .csv (or .parquet or .feather, see save_edp_table) file of a previous
+    #                         collection of the stripe to update and save again
+    #                         (None to collect every ground motion). Only new ground motions or those with files
+    #                         changed since that collection are collected, see load_collection_state
+    #    prefetch           = number of ground motions ahead to read in background threads, e.g. on network
+    #                         filesystems (0 to read the files when needed), see iter_gm_results. Only used when
+    #                         the ground motions are collected by this process
+    #    dtype              = type of the EDP columns (np.float64, or np.float32 to halve the memory)
+    #    rescan             = True to scan every ground motion folder again ignoring the manifest of previous calls
+    #                         (always done when resuming), see get_stripe_manifest
+    #
+    # OUTPUT
+    #    response_matrix    = pd.DataFrame with all the results (columns) for each ground motion (rows) in this stripe,
+    #                         EndCriteria as a categorical column and the EDPs as numeric columns (see get_edp_table)
+    #
+    # NOTES
+    #    The parallel and serial paths give the same table, the rows keep the order of the ground motions. Keep
+    #    n_workers=1 when calling from a multiprocessing.Pool worker, since its processes can not have children.
+    #
+
+    column_names = get_edp_column_names(beam_list, fracElement, dir_i, spliceElement, splice_list, column_list,
+                                        drift_out=drift_out, rdrift_out=rdrift_out)
+
     # print(len(column_names))
     # print(column_names)
 
-    # collect response per story/floor as a list of arrays, each entry in the list is on gm
+    # collect response per story/floor as a list of arrays, each entry in the list is on gm (a future while the gm is
+    # collected in parallel)
+    new_executor = executor is None and n_workers > 1
+    if new_executor:
+        # archives opened by this process are opened again by each worker
+        executor = concurrent.futures.ProcessPoolExecutor(n_workers, initializer=close_archives)
     response = []
-    gm_ids = os.listdir(stripe_folder_path)
+    gm_ids = []
     removeGMlist = []
-    for j in range(n_gms):
-        # print(gm_ids[j])
-        results_folder = os.path.join(stripe_folder_path, gm_ids[j])
-        pfa_gm = get_EDPstory_response(results_folder, n_stories, 'acc_env')
-        rdrift_gm = get_EDPstory_response(results_folder, n_stories, 'rdrift_' + rdrift_out, minrdrift=minrdrift)
-        if drift_out == 'abs':
-            pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_env')
-            if type(pid_gm) == int:
-                pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_max')
-        else:
-            pid_gm_p = get_EDPstory_response(results_folder, n_stories, 'drift_env_p')
-            if type(pid_gm_p) == int:
-                pid_gm_p = get_EDPstory_response(results_folder, n_stories, 'drift_max_p')
-            pid_gm_n = get_EDPstory_response(results_folder, n_stories, 'drift_env_n')
-            if type(pid_gm_n) == int:
-                pid_gm_n = get_EDPstory_response(results_folder, n_stories, 'drift_max_n')
-            pid_gm = np.hstack((pid_gm_p.flatten(), pid_gm_n.flatten()))
 
-        if type(pfa_gm) == int:  # did not finish RHA, so skip the ground motion
-            print('Did not finish GM (ACC ZERO): ' + results_folder)
-            print()
-            removeGMlist.append(j)
-        elif type(rdrift_gm) == int:  # did not finish RHA, so skip the ground motion
-            print('Did not finish GM (RDRIFT ZERO): ' + results_folder)
-            print()
-            removeGMlist.append(j)
-        elif type(pid_gm) == int:  # did not finish RHA, so skip the ground motion
-            print('Did not finish GM (DRIFT ZERO): ' + results_folder)
-            print()
-            removeGMlist.append(j)
+    # rows of a previous collection with the same inputs
+    previous = None
+    if resume_filename is not None:
+        parameters = get_collection_parameters(beam_list=beam_list, fracElement=fracElement, dir_i=dir_i,
+                                               spliceElement=spliceElement, splice_list=splice_list,
+                                               column_list=column_list, drift_out=drift_out, rdrift_out=rdrift_out,
+                                               minrdrift=minrdrift, splice_frac_strain=splice_frac_strain)
+        gm_signatures = load_collection_state(resume_filename + '.state.json', parameters)
+        if len(gm_signatures) > 0 and os.path.isfile(resume_filename):
+            # read as text to keep the values exactly as saved
+            previous = read_edp_table(resume_filename, text=True)
+            if list(previous.columns) != column_names:
+                previous = None
+        new_signatures = dict()
+
+    try:
+        manifest = get_stripe_manifest(stripe_folder_path, manifest_folder=manifest_folder,
+                                       rescan=rescan or resume_filename is not None)
+        for gm_id, results_folder, cache in iter_gm_results(stripe_folder_path, manifest=manifest,
+                                                            prefetch=prefetch if executor is None else 0):
+            j = len(gm_ids)
+            gm_ids.append(gm_id)
+            # print(gm_ids[j])
+
+            # skip the ground motions that did not finish according to the manifest without opening their files
+            msa_text = None
+            if manifest is not None:
+                if manifest['gms'][gm_id]['status'] != 'finished':
+                    if manifest['gms'][gm_id]['status'] == 'no_acc_env':
+                        print('Did not finish GM (ACC ZERO): ' + results_folder)
+                    elif manifest['gms'][gm_id]['status'] == 'no_drift':
+                        print('Did not finish GM (RDRIFT ZERO): ' + results_folder)
+                    else:
+                        print('Did not finish GM (NO MSA.txt): ' + results_folder)
+                    print()
+                    removeGMlist.append(j)
+                    continue
+                msa_text = manifest['gms'][gm_id]['msa']
+
+                # keep the row of the previous collection if the files did not change
+                if resume_filename is not None:
+                    new_signatures[gm_id] = get_gm_signature(manifest, gm_id)
+                    if previous is not None and gm_id in previous.index and \
+                            gm_signatures.get(gm_id) == new_signatures[gm_id]:
+                        response.append((j, (previous.loc[gm_id, column_names[0]],
+                                             previous.loc[gm_id, column_names[1:]].to_numpy(dtype=float))))
+                        continue
+
+            if executor is None:
+                response_gm = collect_gm_response(results_folder, beam_list, fracElement, spliceElement, splice_list,
+                                                  drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
+                                                  splice_frac_strain=splice_frac_strain, cache=cache,
+                                                  msa_text=msa_text)
+            else:
+                # the worker reads the files again unless they are only in memory (tarballs and zip files)
+                response_gm = executor.submit(collect_gm_response, results_folder, beam_list, fracElement,
+                                              spliceElement, splice_list, drift_out=drift_out, rdrift_out=rdrift_out,
+                                              minrdrift=minrdrift, splice_frac_strain=splice_frac_strain,
+                                              msa_text=msa_text, files=cache.in_memory_files(),
+                                              listing=cache.listing)
+            response.append((j, response_gm))
+
+        if executor is not None:
+            response = [(j, response_gm.result() if isinstance(response_gm, concurrent.futures.Future) else
+                         response_gm) for j, response_gm in response]
+    finally:
+        if new_executor:
+            executor.shutdown(cancel_futures=True)
+
+    # gm that did not finish RHA according to their files
+    removeGMlist = sorted(removeGMlist + [j for j, response_gm in response if response_gm is None])
+    response = [response_gm for j, response_gm in response if response_gm is not None]
+
+    # save peak idr matrix
+    gm_ids = np.delete(gm_ids, removeGMlist)  # remove the gm that did not finish RHA
+    # print(len(response))
+    # print(len(gm_ids))
+    response_matrix = get_edp_table(response, gm_ids, column_names, dtype=dtype)
+
+    # save the table before the state, so a row is never reused if the table was not saved
+    if resume_filename is not None:
+        save_edp_table(response_matrix, resume_filename, stripe=os.path.basename(stripe_folder_path))
+        save_collection_state(resume_filename + '.state.json', parameters, new_signatures)
+
+    return response_matrix
+
+
+def get_collection_parameters(**parameters):
+    # Inputs of a collector as a str to find out if a previous collection used the same ones
+    #
+    # INPUTS
+    #    parameters = keyword arguments with the inputs of the collector (np.array, list, str, bool or numbers)
+    #
+    # OUTPUTS
+    #    parameters = str in json format
+    #
+
+    for key in parameters:
+        parameters[key] = np.asarray(parameters[key]).tolist()
+
+    return json.dumps(parameters, sort_keys=True)
+
+
+def load_collection_state(state_filename, parameters):
+    # Reads the state of a previous collection saved by save_collection_state
+    #
+    # INPUTS
+    #    state_filename = path to the .state.json file
+    #    parameters     = output of get_collection_parameters with the inputs of the current collection
+    #
+    # OUTPUTS
+    #    gm_signatures  = dictionary with the signature of the files of each ground motion when it was collected
+    #                     (gm_id: signature, see get_gm_signature). Empty if there is no state or the previous
+    #                     collection used other inputs
+    #
+
+    if not os.path.isfile(state_filename):
+        return dict()
+
+    try:
+        with open(state_filename, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        print('WARNING: could not read ' + state_filename + ', collecting every ground motion')
+        return dict()
+
+    if state.get('parameters') != parameters:
+        return dict()
+
+    return state['gm_signatures']
+
+
+def save_collection_state(state_filename, parameters, gm_signatures):
+    # Saves the inputs of a collection and the signature of each ground motion collected (see load_collection_state)
+    with open(state_filename, 'w') as f:
+        json.dump(dict(parameters=parameters, gm_signatures=gm_signatures), f)
+
+
+def check_endState_file(results_filename, parameters, resume):
+    # Deletes the end state .h5 file of a previous collection that can not be resumed because it used other inputs
+    #
+    # INPUTS
+    #    results_filename = path to the .h5 file
+    #    parameters       = output of get_collection_parameters with the inputs of the current collection
+    #    resume           = True to update the file of a previous collection
+    #
+
+    if not resume or not os.path.isfile(results_filename):
+        return
+
+    with h5py.File(results_filename, 'r') as hf:
+        previous_parameters = hf.attrs.get('collection_parameters')
+    if previous_parameters != parameters:
+        os.remove(results_filename)
+        print(results_filename + ' was collected with other inputs, so deleted it')
+
+
+def check_collected_gm(stripe_group, manifest, gm_id, resume):
+    # Checks if the group of a ground motion in an end state .h5 file is up to date with the files of the ground
+    # motion. Outdated groups are deleted so the ground motion is collected again
+    #
+    # INPUTS
+    #    stripe_group = h5py group of the stripe
+    #    manifest     = output of get_stripe_manifest (None if not available)
+    #    gm_id        = name of the ground motion folder
+    #    resume       = True to keep the groups up to date (False to collect every ground motion)
+    #
+    # OUTPUTS
+    #    skip         = True if the group is up to date
+    #    signature    = signature of the files of the ground motion to save in its group (None if not available)
+    #
+
+    if manifest is None:
+        return False, None
+
+    signature = get_gm_signature(manifest, gm_id)
+    if resume and gm_id in stripe_group:
+        if stripe_group[gm_id].attrs.get('signature') == signature:
+            return True, signature
+        del stripe_group[gm_id]
+
+    return False, signature
+
+
+def remove_missing_gms(stripe_group, manifest):
+    # Deletes the groups of the ground motions that are no longer in the stripe folder
+    if manifest is None:
+        return
+    for gm_id in list(stripe_group.keys()):
+        if gm_id not in manifest['gms']:
+            del stripe_group[gm_id]
+
+
+def collect_gm_endState(results_gm, beam_list, column_list, pz_list, splice, colSplice, fracture=True,
+                        fracture_index=False, cache=None, files=None, listing=None):
+    # Collects the end state of a single ground motion (the datasets of its group in the end state .h5 file)
+    #
+    # INPUTS
+    #    results_gm     = path to folder with the results of NLRHA of the ground motion
+    #    beam_list      = 2D np.array indicating which beams exist
+    #    column_list    = 2D np.array indicating which columns exist
+    #    pz_list        = 2D np.array indicating which pz exist
+    #    splice         = 1 to collect the splices
+    #    colSplice      = 2D np.array indicating which stories have a splice (ignored if splice is not 1)
+    #    fracture       = True to collect the fracture flags of each flange (frac_LB, frac_LT, frac_RB, frac_RT)
+    #    fracture_index = True to collect the fracture index of each flange (FI_LB, FI_LT, FI_RB, FI_RT)
+    #    cache          = RecorderCache of the ground motion (None to create one with files and listing)
+    #    files, listing = see RecorderCache
+    #
+    # OUTPUTS
+    #    endState_gm    = dictionary with a 2D np.array per dataset in the order they are saved (None if the RHA did
+    #                     not finish)
+    #
+
+    n_stories, n_pier = column_list.shape
+    if cache is None:
+        cache = RecorderCache(results_gm, files=files, listing=listing)
+
+    pfa_gm = get_EDPstory_response(results_gm, n_stories, 'acc_env', cache=cache)
+    if type(pfa_gm) == int:  # did not finish RHA
+        return
+
+    endState_gm = dict()
+    #    Panel zones
+    pz_response = get_pz_response(results_gm, pz_list, ['all_disp', 'pz_rot'], cache=cache)
+    for key in ['all_disp', 'pz_rot']:
+        endState_gm[key] = pz_response[key]
+    #    beams and columns
+    column_response = get_column_response(results_gm, column_list, ['hinge_bot', 'hinge_top'], cache=cache)
+    for key in ['hinge_bot', 'hinge_top']:
+        endState_gm[key] = column_response[key]
+    beam_plas_rot = get_beam_response(results_gm, beam_list, ['hinge_left', 'hinge_right'], cache=cache)
+    for key in ['hinge_left', 'hinge_right']:
+        endState_gm[key] = beam_plas_rot[key]
+    if fracture:
+        frac_simulated = get_beam_response(results_gm, beam_list, ['frac_LB', 'frac_LT', 'frac_RB', 'frac_RT'],
+                                           cache=cache)
+        for key in ['frac_LB', 'frac_LT', 'frac_RB', 'frac_RT']:
+            endState_gm[key] = frac_simulated[key]
+    if fracture_index:
+        FI_simulated = get_beam_response(results_gm, beam_list, ['FI_LB', 'FI_LT', 'FI_RB', 'FI_RT'], cache=cache)
+        for key in ['FI_LB', 'FI_LT', 'FI_RB', 'FI_RT']:
+            endState_gm[key] = FI_simulated[key]
+    #    Splices
+    if splice == 1:
+        splice_response = get_splice_response(results_gm, colSplice, column_list, ['ss_splice'],
+                                              res_type='Max', def_desired='strain', cache=cache)
+        endState_gm['ss_splice'] = splice_response['ss_splice']
+        endState_gm['splice_frac'] = splice_response['ss_splice'] > 2 * 60 / 29000
+
+    return endState_gm
+
+
+def save_gm_endState(stripe_group, gm_id, endState_gm, signature=None):
+    # Saves the end state of a ground motion (output of collect_gm_endState) in its group of the end state .h5 file
+    gm_record_group = stripe_group.create_group(gm_id)
+    if signature is not None:
+        gm_record_group.attrs['signature'] = signature
+
+    for key in endState_gm:
+        _ = gm_record_group.create_dataset(key, data=endState_gm[key])
+
+
+# layouts of the stripe groups of the end state .h5 file:
+#    'groups'  = one group per ground motion with one small dataset per quantity (save_gm_endState)
+#    'stacked' = one array per quantity with the ground motions stacked in the first axis (save_stacked_endState)
+endState_layouts = ['groups', 'stacked']
+
+
+def get_endState_layout(stripe_group):
+    # Layout of the stripe group of an end state .h5 file ('groups' for the files collected before the stacked layout)
+    return stripe_group.attrs.get('layout', 'groups')
+
+
+def check_endState_layout(layout):
+    # Raises ValueError if the layout of the end state .h5 file is not supported
+    if layout not in endState_layouts:
+        raise ValueError('Unknown end state layout ' + str(layout) + ', use one of ' + ', '.join(endState_layouts))
+
+
+def get_layout_parameters(layout):
+    # Layout among the inputs of an end state collection, see get_collection_parameters (nothing for the groups
+    # layout, so the files collected before the stacked layout can still be resumed)
+    return dict() if layout == 'groups' else dict(layout=layout)
+
+
+def stack_endState(endState_gms):
+    # Stacks the end state of several ground motions (outputs of collect_gm_endState) in one array per quantity with
+    # shape (n_gm, n_stories, n_pier_or_bay)
+    endState = dict()
+    if len(endState_gms) == 0:
+        return endState
+    for key in endState_gms[0]:
+        endState[key] = np.stack([np.asarray(endState_gm[key]) for endState_gm in endState_gms])
+    return endState
+
+
+def save_stacked_endState(stripe_group, gm_ids, endState, signatures=None, compression='gzip'):
+    # Saves the end state of every ground motion of a stripe in its group of the end state .h5 file with the stacked
+    # layout, replacing the previous content of the group
+    #
+    # INPUTS
+    #    stripe_group = h5py group of the stripe
+    #    gm_ids       = list with the name of each ground motion (first axis of the arrays)
+    #    endState     = dictionary with one array per quantity, see stack_endState
+    #    signatures   = list with the signature of the files of each ground motion (None if not available), see
+    #                   check_collected_gm
+    #    compression  = HDF5 compression filter for the arrays (None for no compression)
+    #
+    # GROUP LAYOUT
+    #    /<stripe>/gm_ids     = name of each ground motion
+    #    /<stripe>/signatures = signature of the files of each ground motion ('' if not available)
+    #    /<stripe>/<quantity> = array (n_gm, n_stories, n_pier_or_bay) chunked by ground motions
+    #    attrs: layout = 'stacked', quantities = names of the quantities in the order collected
+    #
+
+    for key in list(stripe_group.keys()):
+        del stripe_group[key]
+    stripe_group.attrs['layout'] = 'stacked'
+    stripe_group.attrs['quantities'] = list(endState.keys())
+
+    if signatures is None:
+        signatures = [None] * len(gm_ids)
+    stripe_group.create_dataset('gm_ids', data=np.array([str(gm_id) for gm_id in gm_ids], dtype=object),
+                                dtype=h5py.string_dtype())
+    stripe_group.create_dataset('signatures', data=np.array(['' if signature is None else signature
+                                                             for signature in signatures], dtype=object),
+                                dtype=h5py.string_dtype())
+
+    for key, data in endState.items():
+        if data.size > 0:
+            # chunks of about 64 kB with whole ground motions, so reading one ground motion decompresses few chunks
+            n_rows = max(1, min(len(data), 2 ** 16 // max(1, data[0].nbytes)))
+            _ = stripe_group.create_dataset(key, data=data, chunks=(n_rows,) + data.shape[1:],
+                                            compression=compression, shuffle=compression is not None)
         else:
-            # pid_gm = get_EDPstory_response(results_folder, n_stories, 'drift_env')
-            # try:
-            # rdrift_gm = get_EDPstory_response(results_folder, n_stories, 'rdrift_' + rdrift_out, minrdrift=minrdrift)
-            # except:
-            #     print('ERROR drift for ' + gm_ids[j])
-
-            if fracElement:
-                dsc_gm = get_DSC(results_folder, np.sum(beam_list))
-                # print(np.sum(beam_list)*2)
-                # print(len(dsc_gm.flatten()))
-            if spliceElement:
-                dssplice_gm = get_DSsplice(results_folder, splice_frac_strain, np.sum(splice_list))
-                # print(np.sum(splice_list))
-                # print(len(dssplice_gm.flatten()))
-
-            filepath = os.path.join(results_folder, 'MSA.txt')
-            try:
-                maxDrift_wcollapse = np.loadtxt(filepath)
-            except:
-                with open(filepath) as f:
-                    for line in f:
-                        maxDrift_wcollapse = line.strip()
+            _ = stripe_group.create_dataset(key, data=data)
 
-            if type(maxDrift_wcollapse) == str:
-                if  maxDrift_wcollapse == 'Collapsed':
-                    endCriteria = 'MaxDrift'
-                else:
-                    endCriteria = 'nonCollapse'
 
+def get_stacked_gm_ids(stripe_group):
+    # Name of each ground motion of a stripe group with the stacked layout
+    return [gm_id.decode() if type(gm_id) == bytes else gm_id for gm_id in stripe_group['gm_ids'][()]]
+
+
+def get_stacked_signatures(stripe_group):
+    # Signature of the files of each ground motion of a stripe group with the stacked layout (None if not available)
+    signatures = [signature.decode() if type(signature) == bytes else signature
+                  for signature in stripe_group['signatures'][()]]
+    return dict([(gm_id, signature or None) for gm_id, signature in zip(get_stacked_gm_ids(stripe_group), signatures)])
+
+
+def read_stripe_endState(stripe_group, gm_ids=None, quantities=None):
+    # Reads the end state of the ground motions of a stripe group of an end state .h5 file with any layout
+    #
+    # INPUTS
+    #    stripe_group = h5py group of the stripe
+    #    gm_ids       = list with the ground motions to read, in the order of the output (None to read all). The
+    #                   ground motions not in the file are skipped
+    #    quantities   = list with the quantities to read, e.g. ['hinge_bot', 'hinge_top'] (None to read all)
+    #
+    # OUTPUTS
+    #    gm_ids       = list with the name of the ground motions read
+    #    endState     = dictionary with one array per quantity with shape (n_gm, n_stories, n_pier_or_bay)
+    #
+    # NOTES
+    #    With the stacked layout each quantity is read with a single access, instead of one dataset per ground motion
+    #    and quantity (use this function instead of read_gm_endState to loop over the ground motions of a stripe).
+    #
+
+    if get_endState_layout(stripe_group) == 'stacked':
+        stored_gm_ids = get_stacked_gm_ids(stripe_group)
+        if quantities is None:
+            quantities = list(stripe_group.attrs['quantities'])
+        if gm_ids is None:
+            return stored_gm_ids, dict([(key, stripe_group[key][()]) for key in quantities])
+
+        rows = dict([(gm_id, row) for row, gm_id in enumerate(stored_gm_ids)])
+        gm_ids = [gm_id for gm_id in gm_ids if gm_id in rows]
+        selected = np.array([rows[gm_id] for gm_id in gm_ids], dtype=int)
+        # h5py reads increasing rows only
+        unique_rows, order = np.unique(selected, return_inverse=True)
+        endState = dict()
+        for key in quantities:
+            if len(unique_rows) == len(stored_gm_ids):
+                data = stripe_group[key][()]
             else:
+                data = stripe_group[key][unique_rows.tolist()] if len(unique_rows) > 0 else \
+                    np.zeros((0,) + stripe_group[key].shape[1:], dtype=stripe_group[key].dtype)
+            endState[key] = data[order]
+        return gm_ids, endState
+
+    if gm_ids is None:
+        gm_ids = list(stripe_group.keys())
+    else:
+        gm_ids = [gm_id for gm_id in gm_ids if gm_id in stripe_group]
+    endState_gms = [read_gm_endState(stripe_group, gm_id, quantities=quantities) for gm_id in gm_ids]
+    return gm_ids, stack_endState(endState_gms)
+
+
+def read_gm_endState(stripe_group, gm_id, quantities=None):
+    # Reads the end state of a ground motion from a stripe group of an end state .h5 file with any layout
+    #
+    # INPUTS
+    #    stripe_group = h5py group of the stripe
+    #    gm_id        = name of the ground motion folder (KeyError if not in the file)
+    #    quantities   = list with the quantities to read (None to read all)
+    #
+    # OUTPUTS
+    #    endState_gm  = dictionary with a 2D np.array per quantity, same as collect_gm_endState
+    #
+
+    if get_endState_layout(stripe_group) == 'stacked':
+        stored_gm_ids = get_stacked_gm_ids(stripe_group)
+        if gm_id not in stored_gm_ids:
+            raise KeyError(gm_id)
+        row = stored_gm_ids.index(gm_id)
+        if quantities is None:
+            quantities = list(stripe_group.attrs['quantities'])
+        return dict([(key, stripe_group[key][row]) for key in quantities])
 
-                # Find unknown errors
-                try:
-                    np.max(np.abs(pid_gm))
-                except:
-                    print(pid_gm)
-                    print('UNKNOWN ERROR: ' + results_folder)
-
-                # Define endCriteria
-                if (maxDrift_wcollapse > 0.099) and (np.max(np.abs(pid_gm)) > 0.07):
-                    # Maximum drift reached during the analysis
-                    endCriteria = 'MaxDrift'
-                #                 response_gm = np.hstack((endCriteria, np.zeros(pid_gm.shape).flatten(), np.zeros(rdrift_gm.shape).flatten(), \
-                #                                          np.zeros(pfa_gm.shape).flatten(), np.zeros(dsc_gm.shape).flatten()))
-                elif (maxDrift_wcollapse > 0.099) and (np.max(np.abs(pid_gm)) < 0.07):
-                    # Inconvergence
-                    endCriteria = 'Inconvergence'
-                #                 response_gm = np.hstack((endCriteria, np.zeros(pid_gm.shape).flatten(), np.zeros(rdrift_gm.shape).flatten(), \
-                #                                          np.zeros(pfa_gm.shape).flatten(), np.zeros(dsc_gm.shape).flatten()))
+    gm_record_group = stripe_group[gm_id]
+    if quantities is None:
+        quantities = list(gm_record_group.keys())
+    return dict([(key, gm_record_group[key][()]) for key in quantities])
+
+
+def convert_endState_file(results_filename, new_filename=None, layout='stacked', compression='gzip'):
+    # Saves an end state .h5 file with another layout (e.g. a file collected with one group per ground motion with the
+    # stacked layout)
+    #
+    # INPUTS
+    #    results_filename = path to the end state .h5 file
+    #    new_filename     = path to save the converted file (None to replace results_filename)
+    #    layout           = layout of the converted file, see endState_layouts
+    #    compression      = see save_stacked_endState
+    #
+    # OUTPUTS
+    #    new_filename     = path to the converted file
+    #
+
+    check_endState_layout(layout)
+    if new_filename is None:
+        new_filename = results_filename
+    temp_filename = new_filename + '.tmp'
+
+    with h5py.File(results_filename, 'r') as hf, h5py.File(temp_filename, 'w') as hf_new:
+        # the layout is one of the inputs of the collection, so a collection resumed with the same layout keeps the
+        # converted file
+        if 'collection_parameters' in hf.attrs:
+            parameters = json.loads(hf.attrs['collection_parameters'])
+            parameters.pop('layout', None)
+            if layout != 'groups':
+                parameters['layout'] = layout
+            hf_new.attrs['collection_parameters'] = json.dumps(parameters, sort_keys=True)
+
+        for stripe in hf:
+            stripe_group = hf[stripe]
+            gm_ids, endState = read_stripe_endState(stripe_group)
+            if get_endState_layout(stripe_group) == 'stacked':
+                signatures = get_stacked_signatures(stripe_group)
+                signatures = [signatures[gm_id] for gm_id in gm_ids]
+            else:
+                signatures = [stripe_group[gm_id].attrs.get('signature') for gm_id in gm_ids]
+
+            new_group = hf_new.create_group(stripe)
+            if layout == 'stacked':
+                save_stacked_endState(new_group, gm_ids, endState, signatures=signatures, compression=compression)
+            else:
+                for row, gm_id in enumerate(gm_ids):
+                    save_gm_endState(new_group, gm_id, dict([(key, endState[key][row]) for key in endState]),
+                                     signature=signatures[row])
+
+    os.replace(temp_filename, new_filename)
+    return new_filename
+
+
+def collect_gm_fused_response(results_folder, beam_list, column_list, pz_list, fracElement, spliceElement, splice_list,
+                              drift_out='abs', rdrift_out='max', minrdrift=5e-4, splice_frac_strain=60 * 2 / 29000,
+                              endState=True, edp=True, cache=None, msa_text=None, files=None, listing=None):
+    # Collects the row of the EDP table and the end state of a single ground motion from the same files, so every
+    # file needed by both (e.g. acc_env and frac_*.out) is read and parsed once
+    #
+    # INPUTS
+    #    results_folder = path to folder with the results of NLRHA of the ground motion
+    #    beam_list, column_list, pz_list, fracElement, spliceElement, splice_list, drift_out, rdrift_out, minrdrift,
+    #    splice_frac_strain
+    #                   = same as collect_gmset_fused_response
+    #    endState       = True to collect the end state
+    #    edp            = True to collect the row of the EDP table
+    #    cache, msa_text, files, listing = same as collect_gm_response
+    #
+    # OUTPUTS
+    #    response_gm    = output of collect_gm_response (None if not collected or the RHA did not finish)
+    #    endState_gm    = output of collect_gm_endState (None if not collected or the RHA did not finish)
+    #
+
+    if cache is None:
+        cache = RecorderCache(results_folder, files=files, listing=listing)
+
+    # end state first, so get_DSC takes the last row of the frac_*.out files already read by get_beam_response
+    endState_gm = None
+    if endState:
+        endState_gm = collect_gm_endState(results_folder, beam_list, column_list, pz_list, spliceElement,
+                                          splice_list, cache=cache)
+    response_gm = None
+    if edp:
+        response_gm = collect_gm_response(results_folder, beam_list, fracElement, spliceElement, splice_list,
+                                          drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
+                                          splice_frac_strain=splice_frac_strain, cache=cache, msa_text=msa_text)
+
+    return response_gm, endState_gm
+
+
+def collect_gmset_fused_response(stripe_folder_path, stripe_group, beam_list, column_list, pz_list, fracElement, dir_i,
+                                 spliceElement, splice_list, drift_out='abs', rdrift_out='max', minrdrift=5e-4,
+                                 splice_frac_strain=60 * 2 / 29000, manifest_folder=None, gm_ids=None, edp=True,
+                                 executor=None, prefetch=0, dtype=np.float64, layout='groups', rescan=False):
+    # Same table as collect_gmset_response, saving also the end state of each ground motion in the stripe group of
+    # the end state .h5 file, visiting each ground motion folder once
+    #
+    # INPUTS
+    #    stripe_folder_path = path to find the results for each ground motions
+    #    stripe_group       = h5py group of the stripe in the end state .h5 file (None to skip the end state)
+    #    pz_list            = 2D np.array indicating which pz exist
+    #    beam_list, column_list, fracElement, dir_i, spliceElement, splice_list, drift_out, rdrift_out, minrdrift,
+    #    splice_frac_strain, manifest_folder
+    #                       = same as collect_gmset_response. splice_list is also the colSplice of the end state
+    #    gm_ids             = list of the ground motion folders to collect (None to collect every ground motion)
+    #    edp                = True to collect the EDP table (False to collect only the end state)
+    #    executor           = concurrent.futures executor to collect the ground motions in parallel (None to collect
+    #                         them here). The end state is saved by this process
+    #    prefetch, dtype    = same as collect_gmset_response
+    #    layout             = layout of the stripe group, see collect_stripe_endState. With 'stacked' the previous
+    #                         content of the group is replaced by the ground motions collected here
+    #    rescan             = same as collect_gmset_response
+    #
+    # OUTPUT
+    #    response_matrix    = pd.DataFrame with all the results (columns) for each ground motion (rows) in this stripe
+    #                         (empty if edp is False), see get_edp_table
+    #
+
+    column_names = get_edp_column_names(beam_list, fracElement, dir_i, spliceElement, splice_list, column_list,
+                                        drift_out=drift_out, rdrift_out=rdrift_out)
+    if gm_ids is not None:
+        gm_ids = set(gm_ids)
+
+    response = []
+    manifest = get_stripe_manifest(stripe_folder_path, manifest_folder=manifest_folder, rescan=rescan)
+    for gm_id, results_folder, cache in iter_gm_results(stripe_folder_path, manifest=manifest,
+                                                        prefetch=prefetch if executor is None else 0):
+        if gm_ids is not None and gm_id not in gm_ids:
+            continue
+
+        # skip the ground motions that did not finish according to the manifest without opening their files (the
+        # end state only needs the acc_env files)
+        msa_text = None
+        signature = None
+        edp_gm = edp
+        if manifest is not None:
+            status = manifest['gms'][gm_id]['status']
+            if status != 'finished' and edp:
+                if status == 'no_acc_env':
+                    print('Did not finish GM (ACC ZERO): ' + results_folder)
+                elif status == 'no_drift':
+                    print('Did not finish GM (RDRIFT ZERO): ' + results_folder)
                 else:
-                    # Non collapse
-                    endCriteria = 'nonCollapse'
-                #                 response_gm = np.hstack((endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten()))
-
-            if fracElement and spliceElement:
-                response_gm = np.hstack(
-                    (endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten(),
-                     dssplice_gm.flatten()))
-            elif fracElement:
-                response_gm = np.hstack(
-                    (endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dsc_gm.flatten()))
-            elif spliceElement:
-                response_gm = np.hstack(
-                    (endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten(), dssplice_gm.flatten()))
+                    print('Did not finish GM (NO MSA.txt): ' + results_folder)
+                print()
+            edp_gm = edp and status == 'finished'
+            msa_text = manifest['gms'][gm_id]['msa']
+            signature = get_gm_signature(manifest, gm_id)
+            if status == 'no_acc_env':
+                if stripe_group is not None:
+                    print('Did not finish GM' + str(gm_id))
+                continue
+
+        if executor is None:
+            response_gm = collect_gm_fused_response(results_folder, beam_list, column_list, pz_list, fracElement,
+                                                    spliceElement, splice_list, drift_out=drift_out,
+                                                    rdrift_out=rdrift_out, minrdrift=minrdrift,
+                                                    splice_frac_strain=splice_frac_strain,
+                                                    endState=stripe_group is not None, edp=edp_gm, cache=cache,
+                                                    msa_text=msa_text)
+        else:
+            # the worker reads the files again unless they are only in memory (tarballs and zip files)
+            response_gm = executor.submit(collect_gm_fused_response, results_folder, beam_list, column_list,
+                                          pz_list, fracElement, spliceElement, splice_list, drift_out=drift_out,
+                                          rdrift_out=rdrift_out, minrdrift=minrdrift,
+                                          splice_frac_strain=splice_frac_strain, endState=stripe_group is not None,
+                                          edp=edp_gm, msa_text=msa_text, files=cache.in_memory_files(),
+                                          listing=cache.listing)
+        response.append((gm_id, signature, response_gm))
+
+    gm_ids = []
+    rows = []
+    stacked = []
+    for gm_id, signature, response_gm in response:
+        if executor is not None:
+            response_gm = response_gm.result()
+        response_gm, endState_gm = response_gm
+        if stripe_group is not None:
+            if endState_gm is None:
+                print('Did not finish GM' + str(gm_id))
+            elif layout == 'stacked':
+                stacked.append((gm_id, signature, endState_gm))
             else:
-                try:
-                    pid_gm.flatten()
-                except:
-                    print('pid_gm')
-                    print(results_folder)
-                try:
-                    rdrift_gm.flatten()
-                except:
-                    print('pid_gm')
-                    print(results_folder)
-                try:
-                    pfa_gm.flatten()
-                except:
-                    print('pid_gm')
-                    print(results_folder)
-
-                response_gm = np.hstack((endCriteria, pid_gm.flatten(), rdrift_gm.flatten(), pfa_gm.flatten()))
-
-            # print(response_gm)
-            # print(len(response_gm))
-            # print('DONE: ' + gm_ids[j])
-            response.append(response_gm)
+                save_gm_endState(stripe_group, gm_id, endState_gm, signature=signature)
+        if response_gm is not None:
+            gm_ids.append(gm_id)
+            rows.append(response_gm)
+    if stripe_group is not None and layout == 'stacked':
+        save_stacked_endState(stripe_group, [gm_id for gm_id, _, _ in stacked],
+                              stack_endState([endState_gm for _, _, endState_gm in stacked]),
+                              signatures=[signature for _, signature, _ in stacked])
 
-    # save peak idr matrix
-    gm_ids = np.delete(gm_ids, removeGMlist)  # remove the gm that did not finish RHA
-    # print(len(response))
-    # print(len(gm_ids))
-    response_matrix = pd.DataFrame(response, columns=column_names, index=gm_ids)
+    response_matrix = get_edp_table(rows, gm_ids, column_names, dtype=dtype)
 
     return response_matrix
 
 
+def get_executor(n_workers):
+    # Pool of processes to collect the ground motions in parallel, to use in a with block (gives None if n_workers is 1
+    # so the ground motions are collected by this process)
+    if n_workers > 1:
+        # archives opened by this process are opened again by each worker
+        return concurrent.futures.ProcessPoolExecutor(n_workers, initializer=close_archives)
+    return contextlib.nullcontext()
+
+
+def collect_stripe_endState(stripe_folder_path, stripe_group, beam_list, column_list, pz_list, splice, colSplice,
+                            fracture=True, fracture_index=False, resume=False, executor=None, max_pending=64,
+                            prefetch=0, layout='groups'):
+    # Collects the end state of every ground motion of a stripe in its group of the end state .h5 file. With an
+    # executor, the worker processes read and parse the ground motions and send back their arrays, while this
+    # process is the only one that writes in the file (h5py files can not be shared between processes)
+    #
+    # INPUTS
+    #    stripe_folder_path = path to find the results for each ground motions
+    #    stripe_group       = h5py group of the stripe in the end state .h5 file
+    #    beam_list, column_list, pz_list, splice, colSplice, fracture, fracture_index
+    #                       = same as collect_gm_endState
+    #    resume             = True to keep the ground motions already collected from the same files (see
+    #                         check_collected_gm)
+    #    executor           = concurrent.futures executor to parse the ground motions in parallel (None to parse
+    #                         them here)
+    #    max_pending        = maximum number of ground motions parsed but not written yet (bounds the memory used
+    #                         when the workers are faster than the writes)
+    #    prefetch           = same as collect_gmset_response
+    #    layout             = 'groups' to save one group per ground motion (save_gm_endState) or 'stacked' to save
+    #                         one array per quantity with every ground motion of the stripe (save_stacked_endState,
+    #                         written once the whole stripe is collected)
+    #
+    # NOTES
+    #    The ground motions are written in the order listed, so the file is the same with or without executor.
+    #
+
+    check_endState_layout(layout)
+    manifest = get_stripe_manifest(stripe_folder_path, rescan=resume)
+
+    # ground motions of a previous stacked collection still up to date (gm_id: signature)
+    kept = dict()
+    if layout == 'stacked':
+        if resume and manifest is not None and get_endState_layout(stripe_group) == 'stacked':
+            for gm_id, signature in get_stacked_signatures(stripe_group).items():
+                if gm_id in manifest['gms'] and signature == get_gm_signature(manifest, gm_id):
+                    kept[gm_id] = signature
+        gm_order = []
+        collected = dict()
+    elif resume:
+        remove_missing_gms(stripe_group, manifest)
+
+    def save_pending(gm_id, signature, endState_gm):
+        if isinstance(endState_gm, concurrent.futures.Future):
+            endState_gm = endState_gm.result()
+        if endState_gm is None:  # did not finish RHA, so skip the ground motion
+            print('Did not finish GM' + str(gm_id))
+        elif layout == 'stacked':
+            collected[gm_id] = (signature, endState_gm)
+        else:
+            save_gm_endState(stripe_group, gm_id, endState_gm, signature=signature)
+
+    # collect results for each gm (the files of each gm are released when moving to the next one)
+    pending = collections.deque()
+    for gm_id, results_gm, cache in iter_gm_results(stripe_folder_path, manifest=manifest,
+                                                    prefetch=prefetch if executor is None else 0):
+        # print(gm_id)
+
+        # keep the gm already collected from the same files
+        if layout == 'stacked':
+            gm_order.append(gm_id)
+            if gm_id in kept:
+                collected[gm_id] = (kept[gm_id], None)
+                continue
+            signature = get_gm_signature(manifest, gm_id) if manifest is not None else None
+        else:
+            skip, signature = check_collected_gm(stripe_group, manifest, gm_id, resume)
+            if skip:
+                continue
+
+        # check if acc results available (gm finished?)
+        if manifest is not None and manifest['gms'][gm_id]['status'] == 'no_acc_env':
+            endState_gm = None
+        elif executor is None:
+            endState_gm = collect_gm_endState(results_gm, beam_list, column_list, pz_list, splice, colSplice,
+                                              fracture=fracture, fracture_index=fracture_index, cache=cache)
+        else:
+            # the worker reads the files again unless they are only in memory (tarballs and zip files)
+            endState_gm = executor.submit(collect_gm_endState, results_gm, beam_list, column_list, pz_list, splice,
+                                          colSplice, fracture=fracture, fracture_index=fracture_index,
+                                          files=cache.in_memory_files(), listing=cache.listing)
+        pending.append((gm_id, signature, endState_gm))
+
+        while len(pending) > (max_pending if executor is not None else 0):
+            save_pending(*pending.popleft())
+
+    while len(pending) > 0:
+        save_pending(*pending.popleft())
+
+    if layout == 'stacked':
+        # the ground motions kept from the previous collection are read back to write the stripe again
+        previous_gm_ids, previous = read_stripe_endState(stripe_group, gm_ids=list(kept)) if len(kept) > 0 else \
+            ([], dict())
+        rows = dict([(gm_id, row) for row, gm_id in enumerate(previous_gm_ids)])
+        gm_ids = [gm_id for gm_id in gm_order if gm_id in collected]
+        endState_gms = []
+        for gm_id in gm_ids:
+            endState_gm = collected[gm_id][1]
+            if endState_gm is None:
+                endState_gm = dict([(key, previous[key][rows[gm_id]]) for key in previous])
+            endState_gms.append(endState_gm)
+        save_stacked_endState(stripe_group, gm_ids, stack_endState(endState_gms),
+                              signatures=[collected[gm_id][0] for gm_id in gm_ids])
+
+
 def collect_endState_singleDir_response(model_name_all, save_results_folder_all, stripe_folders_all, msa_folders_all, beam_list_all,
-                               column_list_all, pz_list_all, splice_all, colSplice_all, case_i):
+                               column_list_all, pz_list_all, splice_all, colSplice_all, case_i, resume=False,
+                               n_workers=1, prefetch=0, layout='groups'):
     # INPUTS
     # All the inputs include information per case (different from the EDP collector that breaks each case into independent jobs per stripe
     #    model_name_all           = list of str with the case name to collect results from
@@ -879,6 +1644,14 @@ def collect_endState_singleDir_response(model_name_all, save_results_folder_all,
     #    pz_list_all            = list of 2D np.array indicating which pz exist in the X frame
     #    splice_all               = list of boolean if splice are considered or ignored
     #    colSplice_all          = list of 2D np.array indicating which stories have a splice in the X frame
+    #    resume                 = True to update the .h5 file of a previous collection, collecting only the new ground
+    #                             motions or those with files changed since then
+    #    n_workers              = number of processes to parse the ground motions in parallel (1 to parse them here).
+    #                             Only this process writes in the .h5 file, see collect_stripe_endState
+    #    prefetch               = number of ground motions ahead to read in background threads when n_workers is 1,
+    #                             see collect_gmset_response
+    #    layout                 = layout of the stripe groups of the .h5 file: 'groups' (one group per ground motion)
+    #                             or 'stacked' (one array per quantity), see collect_stripe_endState
     #
 
     # Parse case to execute
@@ -921,19 +1694,26 @@ def collect_endState_singleDir_response(model_name_all, save_results_folder_all,
                 num_pz += 1
     print('num_pz='+str(num_pz))
 
-    # Removes existing file
-    if os.path.isfile(results_filename):
+    # Removes existing file (unless resuming a collection with the same inputs)
+    check_endState_layout(layout)
+    parameters = get_collection_parameters(beam_list=beam_list, column_list=column_list, pz_list=pz_list,
+                                           splice=splice, colSplice=colSplice if splice == 1 else 0,
+                                           **get_layout_parameters(layout))
+    check_endState_file(results_filename, parameters, resume)
+    if os.path.isfile(results_filename) and not resume:
         os.remove(results_filename)
         print(results_filename + ' already exists, so deleted it')
 
-    # if True (Collects only data for those building without data)
-    if not os.path.isfile(results_filename):
+    # if True (Collects only data for those building without data, or updates it if resume)
+    if resume or not os.path.isfile(results_filename):
 
         # Collect results and store in HDF file
-        with h5py.File(results_filename, 'w') as hf:
+        with h5py.File(results_filename, 'a') as hf, get_executor(n_workers) as executor:
             # prepare data groups per return period
+            hf.attrs['collection_parameters'] = parameters
             for group in stripe_folders:
-                _ = hf.create_group('/' + group)
+                if group not in hf:
+                    _ = hf.create_group('/' + group)
 
             # collect bldg response for each gm in each stripe
             for i in range(n_stripes):
@@ -942,66 +1722,18 @@ def collect_endState_singleDir_response(model_name_all, save_results_folder_all,
                 print('RP = ' + str(stripe_folders[i]) + 'years')
                 # print(stripe_folder_path)
 
-                gm_ids = os.listdir(stripe_folder_path)
-                for j in range(len(gm_ids)):
-                    # print(gm_ids[j])
-
-                    # collect results for this gm
-                    results_gm = os.path.join(stripe_folder_path, gm_ids[j])
-
-                    # check if acc results available (gm finished?)
-                    pfa_gm = get_EDPstory_response(results_gm, n_stories, 'acc_env')
-                    if type(pfa_gm) == int:  # did not finish RHA, so skip the ground motion
-                        print('Did not finish GM' + str(gm_ids[j]))
-                    else:
-                        #    Panel zones
-                        pz_response = get_pz_response(results_gm, pz_list, ['all_disp', 'pz_rot'])
-                        #    beams and columns
-                        column_response = get_column_response(results_gm, column_list, ['hinge_bot','hinge_top'])
-                        beam_plas_rot = get_beam_response(results_gm, beam_list, ['hinge_left', 'hinge_right'])
-                        frac_simulated  = get_beam_response(results_gm, beam_list, ['frac_LB','frac_LT','frac_RB','frac_RT'])
-                        #    Splices
-                        if splice == 1:
-                            splice_response = get_splice_response(results_gm, colSplice, column_list, ['ss_splice'],
-                                              res_type='Max', def_desired='strain')
-                            splice_frac = splice_response['ss_splice'] > 2*60/29000
-
-                        # create gm group
-                        rp_group = hf['/' + stripe_folders[i]]
-                        gm_record_group = rp_group.create_group(gm_ids[j])
-
-                        # Save in h5 file's building_group
-                        key = 'all_disp'
-                        _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                        key = 'pz_rot'
-                        _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                        key = 'hinge_bot'
-                        _ = gm_record_group.create_dataset(key, data=column_response[key])
-                        key = 'hinge_top'
-                        _ = gm_record_group.create_dataset(key, data=column_response[key])
-                        key = 'hinge_left'
-                        _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                        key = 'hinge_right'
-                        _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                        key = 'frac_LB'
-                        _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                        key = 'frac_LT'
-                        _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                        key = 'frac_RB'
-                        _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                        key = 'frac_RT'
-                        _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                        if splice == 1:
-                            key = 'ss_splice'
-                            _ = gm_record_group.create_dataset(key, data=splice_response[key])
-                            key = 'splice_frac'
-                            _ = gm_record_group.create_dataset(key, data=splice_frac)
+                # collect results for each gm (parsed by the workers of the executor if given, only this process
+                # writes in the file)
+                collect_stripe_endState(stripe_folder_path, hf['/' + stripe_folders[i]], beam_list, column_list,
+                                        pz_list, splice, colSplice if splice == 1 else None,
+                                        fracture=True, fracture_index=False, resume=resume,
+                                        executor=executor, prefetch=prefetch, layout=layout)
 
 
 def collect_XandY_response(model_name_all, stripe_folder_all, save_results_folder_all, msa_folders_all, beam_list_x_all,
                            beam_list_y_all, fracElement, spliceElement_all, splice_list_x_all, splice_list_y_all,
                            column_list_x_all,
-                           column_list_y_all, minrdrift, splice_frac_strain, case_i):
+                           column_list_y_all, minrdrift, splice_frac_strain, case_i, edp_format='csv'):
     # INPUTS
     # Collects the EDP results considering each stripe of each case as an independent job
     #    model_name_all           = list of str with the case name to collect results from
@@ -1021,6 +1753,7 @@ def collect_XandY_response(model_name_all, stripe_folder_all, save_results_folde
     #    column_list_y_all        = list of 2D np.array indicating which column exist in the X frame
     #    minrdrift                = minimum residual drift to collect
     #    splice_frac_strain       = strain limit for deciding fracture occured on splices
+    #    edp_format               = format of the EDP table: 'csv', 'parquet' or 'feather' (see save_edp_table)
     #
 
     # Parse case to execute
@@ -1038,7 +1771,8 @@ def collect_XandY_response(model_name_all, stripe_folder_all, save_results_folde
     splice_list_y = splice_list_y_all[case_i]
 
     # Define path to save results
-    results_filename = os.path.join(save_results_folder, 'EDP_' + model_name + '_' + stripe_folder + '.csv')
+    check_edp_format(edp_format)
+    results_filename = get_edp_filename(save_results_folder, model_name, stripe_folder, edp_format=edp_format)
 
     #### collect results on X ####
     dir_i = 0
@@ -1095,17 +1829,19 @@ def collect_XandY_response(model_name_all, stripe_folder_all, save_results_folde
         else:
             endCriteriaTotal.append('nonCollapse')
     results = results.drop('EndCriteria', axis=1)  # drop EndCriteria per direction
-    results.insert(0, 'EndCriteriaX', endCriteria[:, 0])  # Insert EndCriteriaX with proper column name
-    results.insert(0, 'EndCriteriaY', endCriteria[:, 1])  # Insert EndCriteriaY with proper column name
-    results.insert(0, 'EndCriteria', endCriteriaTotal)  # Insert combined EndCriteria
+    # Insert EndCriteriaX and EndCriteriaY with proper column name and the combined EndCriteria
+    results.insert(0, 'EndCriteriaX', pd.Categorical(endCriteria[:, 0], categories=end_criteria_categories))
+    results.insert(0, 'EndCriteriaY', pd.Categorical(endCriteria[:, 1], categories=end_criteria_categories))
+    results.insert(0, 'EndCriteria', pd.Categorical(endCriteriaTotal, categories=end_criteria_categories))
 
-    results.to_csv(results_filename)
+    save_edp_table(results, results_filename, stripe=stripe_folder)
 
 
 
 def collect_singleDir_response(model_name_all, stripe_folder_all, save_results_folder_all, msa_folder_all, beam_list_all,
                            column_list_all, fracElement, splice_all, splice_list_all,
-                           minrdrift, splice_frac_strain, drift_out, rdrift_out, case_i):
+                           minrdrift, splice_frac_strain, drift_out, rdrift_out, case_i, resume=False, prefetch=0,
+                           edp_format='csv'):
     # INPUTS
     # Collects the EDP results considering each stripe of each case as an independent job
     #    model_name_all           = list of str with the case name to collect results from
@@ -1132,6 +1868,10 @@ def collect_singleDir_response(model_name_all, stripe_folder_all, save_results_f
     #                         -> 'max' = single column with the maximum residual across floors
     #                         -> 'all_abs' = multiple columns with the residual absolute value for each floor
     #                         -> 'all' = multiple columns with the residual for each floor with its sign
+    #    resume             = True to update the .csv file of a previous collection, collecting only the new ground
+    #                         motions or those with files changed since then
+    #    prefetch           = number of ground motions ahead to read in background threads, see collect_gmset_response
+    #    edp_format         = format of the EDP table: 'csv', 'parquet' or 'feather' (see save_edp_table)
     #
 
     # Parse case to execute
@@ -1147,21 +1887,92 @@ def collect_singleDir_response(model_name_all, stripe_folder_all, save_results_f
 
 
     # Define path to save results
-    results_filename = os.path.join(save_results_folder, 'EDP_' + model_name + '_' + stripe_folder + '.csv')
+    check_edp_format(edp_format)
+    results_filename = get_edp_filename(save_results_folder, model_name, stripe_folder, edp_format=edp_format)
 
     #### collect results on singleDir ####
     stripe_folder_path = os.path.join(msa_folder, stripe_folder)
     results = collect_gmset_response(stripe_folder_path, beam_list, fracElement, 1, spliceElement,
                                      splice_list, column_list, drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
-                                     splice_frac_strain=splice_frac_strain)
+                                     splice_frac_strain=splice_frac_strain,
+                                     resume_filename=results_filename if resume else None, prefetch=prefetch)
 
-    results.to_csv(results_filename)
+    if not resume:
+        save_edp_table(results, results_filename, stripe=stripe_folder)
+
+
+def collect_singleDir_fused_response(model_name_all, stripe_folders_all, save_results_folder_all, msa_folders_all,
+                                     beam_list_all, column_list_all, pz_list_all, fracElement, splice_all, colSplice_all,
+                                     minrdrift, splice_frac_strain, drift_out, rdrift_out, case_i, prefetch=0,
+                                     edp_format='csv', layout='groups'):
+    # INPUTS
+    # Collects the EDP tables (one .csv file per stripe) and the end state (one .h5 file) of a case in a single pass
+    # over its ground motions, same files as collect_singleDir_response and collect_endState_singleDir_response
+    #    model_name_all           = list of str with the case name to collect results from
+    #    stripe_folders_all       = list of list with the folder name of each stripe
+    #    save_results_folder_all  = list of str with path to save results
+    #    msa_folders_all          = list with the path_to_results
+    #    beam_list_all            = list of 2D np.array indicating which beams exist
+    #    column_list_all          = list of 2D np.array indicating which columns exist
+    #    pz_list_all              = list of 2D np.array indicating which pz exist
+    #    fracElement              = true  -> collect connections DS
+    #                               false -> does NOT collect connections DS
+    #    splice_all               = list of 1 to collect splice data (0 otherwise)
+    #    colSplice_all            = list of 2D np.array indicating which stories have a splice
+    #    minrdrift, splice_frac_strain, drift_out, rdrift_out, prefetch, edp_format
+    #                             = same as collect_singleDir_response
+    #    layout                   = layout of the stripe groups of the .h5 file, see collect_endState_singleDir_response
+    #
+    # NOTES
+    #    Every ground motion is collected again (see collect_singleDir_response and
+    #    collect_endState_singleDir_response with resume=True to update a previous collection).
+    #
+
+    # Parse case to execute
+    model_name = model_name_all[case_i]
+    stripe_folders = stripe_folders_all[case_i]
+    save_results_folder = save_results_folder_all[case_i]
+    msa_folder = msa_folders_all[case_i]
+    beam_list = beam_list_all[case_i]
+    column_list = column_list_all[case_i]
+    pz_list = pz_list_all[case_i]
+    splice = splice_all[case_i]
+    colSplice = colSplice_all[case_i]
+    if splice != 1:
+        colSplice = np.zeros(column_list.shape)
+
+    print('------- ' + model_name + ' -------')
+    check_edp_format(edp_format)
+    check_endState_layout(layout)
+
+    # Removes existing file
+    results_filename = os.path.join(save_results_folder, model_name + '.h5')
+    if os.path.isfile(results_filename):
+        os.remove(results_filename)
+        print(results_filename + ' already exists, so deleted it')
+
+    with h5py.File(results_filename, 'w') as hf:
+        hf.attrs['collection_parameters'] = get_collection_parameters(beam_list=beam_list, column_list=column_list,
+                                                                      pz_list=pz_list, splice=splice,
+                                                                      colSplice=colSplice if splice == 1 else 0,
+                                                                      **get_layout_parameters(layout))
+        for stripe in stripe_folders:
+            print('RP = ' + str(stripe) + 'years')
+            stripe_group = hf.create_group('/' + stripe)
+            results = collect_gmset_fused_response(os.path.join(msa_folder, stripe), stripe_group, beam_list,
+                                                   column_list, pz_list, fracElement, 1, splice, colSplice,
+                                                   drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
+                                                   splice_frac_strain=splice_frac_strain, prefetch=prefetch,
+                                                   layout=layout)
+            save_edp_table(results, get_edp_filename(save_results_folder, model_name, stripe, edp_format=edp_format),
+                           stripe=stripe)
 
 
 def collect_single_response(model_name_all, stripe_folder_all, save_results_folder_all, msa_folder_all, beam_list_x_all,
                             beam_list_y_all, fracElement, spliceElement_all, splice_list_x_all, splice_list_y_all,
                             column_list_x_all,
-                            column_list_y_all, minrdrift, splice_frac_strain, drift_out, rdrift_out, case_i):
+                            column_list_y_all, minrdrift, splice_frac_strain, drift_out, rdrift_out, case_i,
+                            resume=False, edp_format='csv'):
     # INPUTS
     # Collects the EDP results considering each stripe of each case as an independent job
     #    model_name_all           = list of str with the case name to collect results from
@@ -1188,6 +1999,9 @@ def collect_single_response(model_name_all, stripe_folder_all, save_results_fold
     #                         -> 'max' = single column with the maximum residual across floors
     #                         -> 'all_abs' = multiple columns with the residual absolute value for each floor
     #                         -> 'all' = multiple columns with the residual for each floor with its sign
+    #    resume             = True to update the .csv file of a previous collection, collecting only the new ground
+    #                         motions or those with files changed since then
+    #    edp_format         = format of the EDP table: 'csv', 'parquet' or 'feather' (see save_edp_table)
     #
 
     # Parse case to execute
@@ -1209,17 +2023,110 @@ def collect_single_response(model_name_all, stripe_folder_all, save_results_fold
         splice_list = splice_list_y_all[case_i]
 
     # Define path to save results
-    results_filename = os.path.join(save_results_folder, 'EDP_' + model_name + '_' + stripe_folder + '.csv')
+    check_edp_format(edp_format)
+    results_filename = get_edp_filename(save_results_folder, model_name, stripe_folder, edp_format=edp_format)
 
     #### collect results on singleDir ####
     stripe_folder_path = os.path.join(msa_folder, stripe_folder)
     results = collect_gmset_response(stripe_folder_path, beam_list, fracElement, 1, spliceElement,
                                      splice_list, column_list, drift_out=drift_out, rdrift_out=rdrift_out, minrdrift=minrdrift,
-                                     splice_frac_strain=splice_frac_strain)
+                                     splice_frac_strain=splice_frac_strain,
+                                     resume_filename=results_filename if resume else None)
+
+    if not resume:
+        save_edp_table(results, results_filename, stripe=stripe_folder)
+
+
+def follow_msa_response(model_name, msa_folder, stripe_folders, save_results_folder, beam_list, column_list,
+                        fracElement, spliceElement, splice_list, pz_list=None, minrdrift=5e-4,
+                        splice_frac_strain=60 * 2 / 29000, drift_out='abs', rdrift_out='max', poll_interval=60,
+                        n_gms=None, timeout=None, edp_format='csv'):
+    # Collects the results of an MSA while OpenSees is still running it (e.g. RunMSAParallel.tcl under MSA.sbatch).
+    # The result folders are polled and every ground motion that finished since the previous poll is collected right
+    # away in the EDP tables (and in the end state file), so the postprocessing overlaps with the analyses.
+    #
+    # INPUTS
+    #    model_name          = str with the case name to use in the name of the files saved
+    #    msa_folder          = path to the folder with one subfolder per stripe (AnalysisResult/MSA)
+    #    stripe_folders      = list with the name of the stripe folders to follow
+    #    save_results_folder = path to save the EDP_<model_name>_<stripe> tables and the <model_name>.h5 file
+    #    beam_list, column_list, fracElement, spliceElement, splice_list, minrdrift, splice_frac_strain, drift_out,
+    #    rdrift_out          = same as collect_gmset_response
+    #    pz_list             = 2D np.array with the panel zones to also collect the end state of every ground motion
+    #                          as collect_endState_singleDir_response (None to only collect the EDP tables)
+    #    poll_interval       = seconds between two polls of the result folders
+    #    n_gms               = int with the number of ground motions per stripe (or dictionary stripe: n_gms) to stop
+    #                          once all of them finished (None to follow until timeout or until interrupted)
+    #    timeout             = seconds to follow the analyses before stopping (None for no limit)
+    #    edp_format          = format of the EDP tables: 'csv', 'parquet' or 'feather' (see save_edp_table)
+    #
+    # OUTPUTS
+    #    collapse            = pd.DataFrame with one row per stripe and the columns
+    #                          'n_finished'       : ground motions collected
+    #                          'n_collapse'       : ground motions that reached the collapse drift (MaxDrift)
+    #                          'n_inconvergence'  : ground motions that stopped by inconvergence
+    #                          'collapse_fraction': n_collapse / n_finished
+    #
+    # NOTES
+    #    A ground motion is collected once its MSA.txt and storyN_acc_env.out files are written, which OpenSees does
+    #    at the end of the RHA. Both outputs are collected in resume mode, so following can be stopped (e.g. with
+    #    Ctrl+C) and started again, and the files saved are the same of a collection after the MSA finished.
+    #
+
+    check_edp_format(edp_format)
+    if type(n_gms) == int:
+        n_gms = dict([(stripe, n_gms) for stripe in stripe_folders])
+
+    collapse = dict([(stripe, [0, 0, 0, 0.0]) for stripe in stripe_folders])
+    collected = dict([(stripe, None) for stripe in stripe_folders])
+    start_time = time.time()
+    try:
+        while True:
+            # collect the stripes with ground motions finished since the previous poll
+            for stripe in stripe_folders:
+                stripe_folder_path = os.path.join(msa_folder, stripe)
+                if not os.path.isdir(stripe_folder_path):
+                    continue  # the analyses of this stripe did not start yet
+                manifest = get_stripe_manifest(stripe_folder_path)
+                finished = [(gm_id, get_gm_signature(manifest, gm_id)) for gm_id in manifest['gm_ids']
+                            if manifest['gms'][gm_id]['status'] == 'finished']
+                if finished == collected[stripe]:
+                    continue
+
+                results_filename = get_edp_filename(save_results_folder, model_name, stripe, edp_format=edp_format)
+                results = collect_gmset_response(stripe_folder_path, beam_list, fracElement, 1, spliceElement,
+                                                 splice_list, column_list, drift_out=drift_out, rdrift_out=rdrift_out,
+                                                 minrdrift=minrdrift, splice_frac_strain=splice_frac_strain,
+                                                 resume_filename=results_filename)
+                if pz_list is not None:
+                    collect_endState_singleDir_response([model_name], [save_results_folder], [[stripe]],
+                                                        [msa_folder], [beam_list], [column_list], [pz_list],
+                                                        [int(spliceElement)], [splice_list], 0, resume=True)
+                collected[stripe] = finished
+
+                # running collapse fraction of the stripe
+                n_finished = len(results)
+                n_collapse = np.sum(results['EndCriteria'] == 'MaxDrift')
+                n_inconvergence = np.sum(results['EndCriteria'] == 'Inconvergence')
+                collapse[stripe] = [n_finished, n_collapse, n_inconvergence, n_collapse / max(n_finished, 1)]
+                print('RP = ' + stripe + 'years: ' + str(n_finished) + ' GM collected, collapse fraction = ' +
+                      '{0:.3f}'.format(n_collapse / max(n_finished, 1)))
+
+            # stop once every ground motion finished or the time is over
+            if n_gms is not None and all([collapse[stripe][0] >= n_gms[stripe] for stripe in stripe_folders]):
+                break
+            if timeout is not None and time.time() - start_time + poll_interval > timeout:
+                break
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print('Stopped following ' + msa_folder)
+
+    collapse = pd.DataFrame.from_dict(collapse, orient='index', columns=['n_finished', 'n_collapse',
+                                                                          'n_inconvergence', 'collapse_fraction'])
+    return collapse
 
-    results.to_csv(results_filename)
 
-def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_type='Max', t=0):
+def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_type='Max', t=0, index_folder=None):
     # Read response for panel zones, currently takes the maximum of the time history
     #
     # INPUTS
@@ -1233,6 +2140,9 @@ def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_
     #                     'at_t': return the response at the given time t
     #                     'all_t': return the response history
     #    t              = index for deformed shape plot
+    #                     (slice with 'all_t' to read only that window of the history)
+    #    index_folder   = path to folder to save the row indexes used by 'at_t' and windows of 'all_t' (None to save
+    #                     them next to the recorders), see get_row_index
     #
     # OUTPUTS
     #    pz_results = dictionary with all results for the panel zones
@@ -1245,7 +2155,7 @@ def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        res = np.loadtxt(filepath)  # read response history
+        res, i_t = read_response_history(filepath, None, res_type, t, index_folder=index_folder)  # read response history
         # Format results
         if file == 'all_disp':
             # Remove time column
@@ -1261,7 +2171,7 @@ def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_
             results_1d = np.max(res, axis=0)
         elif res_type == 'at_t':
             # read response at index t for each pz
-            results_1d = aux[t]
+            results_1d = res[i_t]
         else:
             results_1d = res
 
@@ -1287,7 +2197,7 @@ def get_pz_response_time(results_folder, beam_list, column_list, filenames, res_
 
     return pz_results
 
-def get_pz_response(results_folder, pz_list, filenames):
+def get_pz_response(results_folder, pz_list, filenames, cache=None):
     # Read response for panel zones, currently takes the maximum of the time history
     #
     # INPUTS
@@ -1296,6 +2206,7 @@ def get_pz_response(results_folder, pz_list, filenames):
     #    filenames      = list with any group of the following alternatives
     #                     'pz_rot'
     #                     'all_disp': include time vector
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    pz_results = dictionary with all results for the panel zones
@@ -1304,58 +2215,33 @@ def get_pz_response(results_folder, pz_list, filenames):
     pz_results = dict(keys=filenames)
     n_stories, n_pier = pz_list.shape
     num_pz = np.sum(pz_list)
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     # Read results as 1d array
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
-        # Read requested data (always at end-2 of analysis to take the last full result in case of inconvergence)
-        with open(filepath) as f:
-            last_line = 0
-            prev_line = 0
-            pp_line = 0
-            for line in f:
-                ppp_line = pp_line
-                pp_line = prev_line
-                prev_line = last_line
-                if line == '\n' or type(line) == int: # skip blank lines
-                    last_line = last_line
-                else:
-                    last_line = line
-            aux = last_line.split()  # read second to last line in a time history since sometimes has errors
-            try:
-                aux = [float(x) for x in aux]  # convert to list of floats
-            except:
-                aux = np.array([0, 0])
-            # only keeps set of results that include all connections (considering last 4 lines as options)
-            if (file == 'pz_rot' and len(aux) < num_pz) or \
-                    (file == 'all_disp' and len(aux) < 1 + num_pz):
-                try:
-                    aux = prev_line.split()
-                    aux = [float(x) for x in aux]  # convert to list of floats
-                except:
-                    aux = np.array([0, 0])
-                if (file == 'pz_rot' and len(aux) < num_pz) or \
-                        (file == 'all_disp' and len(aux) < 1 + num_pz):
-                    try:
-                        aux = pp_line.split()
-                        aux = [float(x) for x in aux]  # convert to list of floats
-                    except:
-                        aux = np.array([0, 0])
-                    if (file == 'pz_rot' and len(aux) < num_pz) or \
-                        (file == 'all_disp' and len(aux) < 1 + num_pz):
-                        try:
-                            aux = ppp_line.split()
-                            aux = [float(x) for x in aux]  # convert to list of floats
-                        except:
-                            aux = np.array([0, 0])
-
-            if file == 'all_disp':
-                aux = aux[1:]
-                aux = aux[0:num_pz]
-                results_1d = np.abs(aux)
-            if file == 'pz_rot':
-                aux = aux[0:num_pz]
-                results_1d = np.abs(aux)
+        # Read requested data (last row that includes all the panel zones in case of inconvergence)
+        if file == 'all_disp':
+            min_cols = 1 + num_pz
+        else:
+            min_cols = num_pz
+        rows = cache.tail(filepath, min_cols=min_cols)
+        if len(rows) == 0:
+            # take the last row with any result to autocomplete below
+            rows = cache.tail(filepath)
+        if len(rows) == 0:
+            aux = np.array([0, 0])
+        else:
+            aux = rows[-1]
+
+        if file == 'all_disp':
+            aux = aux[1:]
+            aux = aux[0:num_pz]
+            results_1d = np.abs(aux)
+        if file == 'pz_rot':
+            aux = aux[0:num_pz]
+            results_1d = np.abs(aux)
 
         # If still not complete row of results fills the missing values with zeros
         # This work around is not bad because this occurs on collapsed cases
@@ -1380,7 +2266,8 @@ def get_pz_response(results_folder, pz_list, filenames):
 
     return pz_results
 
-def get_column_response_time(results_folder, beam_list, column_list, filenames, res_type='Max', t=0, def_desired='rot'):
+def get_column_response_time(results_folder, beam_list, column_list, filenames, res_type='Max', t=0, def_desired='rot',
+                             index_folder=None):
     # Read response for columns, currently takes the maximum of the time history
     #
     # INPUTS
@@ -1394,6 +2281,9 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
     #                     'at_t': return the response at the given time t
     #                     'all_t': return the response history
     #    t              = index for deformed shape plot
+    #                     (slice with 'all_t' to read only that window of the history)
+    #    index_folder   = path to folder to save the row indexes used by 'at_t' and windows of 'all_t' (None to save
+    #                     them next to the recorders), see get_row_index
     #   def_desired     = 'axial'
     #                     'shear'
     #                     'rot'
@@ -1412,7 +2302,8 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        data_1d = np.loadtxt(filepath)
+        data_1d, i_t = read_response_history(filepath, [int(3 * num_columns), int(6 * num_columns), int(num_columns)],
+                                             res_type, t, index_folder=index_folder)
         _, n_cols = data_1d.shape
 
         if n_cols == int(3*num_columns):
@@ -1434,7 +2325,7 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -1456,7 +2347,7 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
                     aux = abs(M_bot)
                 elif 'top' in file:
                     aux = abs(M_top)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 if 'bot' in file:
@@ -1471,7 +2362,7 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(data_1d)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = data_1d
@@ -1502,7 +2393,7 @@ def get_column_response_time(results_folder, beam_list, column_list, filenames,
 
     return column_results
 
-def get_column_response(results_folder, column_list, filenames, def_desired='rot'):
+def get_column_response(results_folder, column_list, filenames, def_desired='rot', cache=None):
     # Read response for columns, currently takes the maximum of the time history
     #
     # INPUTS
@@ -1516,6 +2407,7 @@ def get_column_response(results_folder, column_list, filenames, def_desired='rot
     #                     'shear'
     #                     'rot'
     #                     Only applies for hinge_left/right and def_left/right
+    #   cache           = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    column_results = dictionary with all results for the columns, one key for each filename
@@ -1525,78 +2417,47 @@ def get_column_response(results_folder, column_list, filenames, def_desired='rot
 
     n_stories, n_pier = column_list.shape
     num_columns = np.sum(column_list)
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     # Read results as 1d array
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        # Read requested data (always at end-2 of analysis)
-        with open(filepath) as f:
-            last_line = 0
-            prev_line = 0
-            pp_line = 0
-            for line in f:
-                ppp_line = pp_line
-                pp_line = prev_line
-                prev_line = last_line
-                if line == '\n'or type(line) == int:  # skip blank lines
-                    last_line = last_line
-                else:
-                    last_line = line
-            # try:
-            aux = last_line.split()  # read last line in a time history
-            # except:
-                # print('ERROR: ' + filepath)
-
-            try:
-                aux = [float(x) for x in aux]  # convert to list of floats
-            except:
-                aux = np.array([0, 0])
-            # only keeps lines with results for all the columns (possible issues when inconvergence)
-            if ((len(aux) != int(3 * num_columns)) or (len(aux) != int(6 * num_columns)) or
-                    (len(aux) != int(num_columns))):
-                try:
-                    aux = prev_line.split()
-                    aux = [float(x) for x in aux]  # convert to list of floats
-                except:
-                    aux = np.array([0, 0])
-                if ((len(aux) != int(3 * num_columns)) or (len(aux) != int(6 * num_columns)) or
-                        (len(aux) != int(num_columns))):
-                    try:
-                        aux = pp_line.split()
-                        aux = [float(x) for x in aux]  # convert to list of floats
-                    except:
-                        aux = np.array([0, 0])
-                    if ((len(aux) != int(3 * num_columns)) or (len(aux) != int(6 * num_columns)) or
-                            (len(aux) != int(num_columns))):
-                        try:
-                            aux = ppp_line.split()  # read second to last line in a time history since sometimes has errors
-                            aux = [float(x) for x in aux]  # convert to list of floats
-                        except:
-                            aux = np.array([0, 0])
-            data_1d = np.abs(aux)
+        # Read requested data (last row with results for all the columns, possible issues when inconvergence)
+        complete_cols = [int(num_columns), int(3 * num_columns), int(6 * num_columns)]
+        rows = cache.tail(filepath, complete_cols)
+        if len(rows) == 0:
+            # take the last row with any result to autocomplete below
+            rows = cache.tail(filepath)
+        if len(rows) == 0:
+            aux = np.array([0, 0])
+        else:
+            aux = rows[-1]
+        data_1d = np.abs(aux)
 
         # If still not complete row of results fills the missing values with zeros
         # This work around is not bad because this occurs on collapsed cases
-        if len(data_1d) < int(num_columns):
-            print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
-            print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(num_columns))
-            aux2 = np.zeros(num_columns)
-            aux2[0:len(data_1d)] = data_1d
-            data_1d = aux2
-        elif (len(data_1d) < int(3 * num_columns)) and (len(data_1d) != int(num_columns)):
-            print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
-            print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(3*num_columns))
-            aux2 = np.zeros(3*num_columns)
-            aux2[0:len(data_1d)] = data_1d
-            data_1d = aux2
-        elif (len(data_1d) < int(6 * num_columns)) and (len(data_1d) != int(num_columns)) and \
-                (len(data_1d) != int(num_columns)):
-            print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
-            print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(6*num_columns))
-            aux2 = np.zeros(6 * num_columns)
-            aux2[0:len(data_1d)] = data_1d
-            data_1d = aux2
+        if len(data_1d) not in complete_cols:
+            if len(data_1d) < int(num_columns):
+                print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
+                print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(num_columns))
+                aux2 = np.zeros(num_columns)
+                aux2[0:len(data_1d)] = data_1d
+                data_1d = aux2
+            elif (len(data_1d) < int(3 * num_columns)) and (len(data_1d) != int(num_columns)):
+                print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
+                print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(3*num_columns))
+                aux2 = np.zeros(3*num_columns)
+                aux2[0:len(data_1d)] = data_1d
+                data_1d = aux2
+            elif (len(data_1d) < int(6 * num_columns)) and (len(data_1d) != int(num_columns)) and \
+                    (len(data_1d) != int(num_columns)):
+                print('WARNING:Autocompleted ' + file + ' results: ' + results_folder)
+                print('length of vector = ' + str(len(data_1d)) + '; should be = ' + str(6*num_columns))
+                aux2 = np.zeros(6 * num_columns)
+                aux2[0:len(data_1d)] = data_1d
+                data_1d = aux2
 
         n_cols = len(data_1d)
 
@@ -1649,7 +2510,8 @@ def get_column_response(results_folder, column_list, filenames, def_desired='rot
 
     return column_results
 
-def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max', t=0, def_desired='rot'):
+def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max', t=0, def_desired='rot',
+                           index_folder=None):
     # Read response for beams, currently takes either the maximum or the last of the time history
     #
     # INPUTS
@@ -1672,6 +2534,9 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
     #                     'at_t': return the response at the given time t
     #                     'all_t': return the response history
     #   t               = index for deformed shape plot
+    #                     (slice with 'all_t' to read only that window of the history)
+    #    index_folder   = path to folder to save the row indexes used by 'at_t' and windows of 'all_t' (None to save
+    #                     them next to the recorders), see get_row_index
     #   def_desired     = 'axial'
     #                     'shear'
     #                     'rot'
@@ -1690,7 +2555,8 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        data_1d = np.loadtxt(filepath)
+        data_1d, i_t = read_response_history(filepath, [int(6 * num_beams), int(3 * num_beams), int(num_beams)],
+                                             res_type, t, index_folder=index_folder)
         if data_1d.ndim == 1:
             n_cols = 1
         else:
@@ -1715,7 +2581,7 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -1739,7 +2605,7 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -1751,7 +2617,7 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
             elif res_type == 'at_t':
                 # read rotation at index t for each hinge
                 aux = abs(data_1d)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = data_1d
@@ -1789,7 +2655,7 @@ def get_beam_response_time(results_folder, beam_list, filenames, res_type='Max',
 
     return beam_results
 
-def get_beam_response(results_folder, beam_list, filenames, def_desired='rot'):
+def get_beam_response(results_folder, beam_list, filenames, def_desired='rot', cache=None):
     # Read response for beams, currently takes either the maximum or the last of the time history
     #
     # INPUTS
@@ -1812,6 +2678,7 @@ def get_beam_response(results_folder, beam_list, filenames, def_desired='rot'):
     #                     'shear'
     #                     'rot'
     #                     Only applies for hinge_left/right and def_left/right
+    #   cache           = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    beam_results = dictionary with all results for the beams, one key for each filename
@@ -1821,55 +2688,23 @@ def get_beam_response(results_folder, beam_list, filenames, def_desired='rot'):
 
     n_stories, n_bays = beam_list.shape
     num_beams = np.sum(beam_list)
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     # Read results as 1d array
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        # Read requested data (always at end-2 of analysis)
-        with open(filepath) as f:
-            last_line = 0
-            prev_line = 0
-            pp_line = 0
-            for line in f:
-                ppp_line = pp_line
-                pp_line = prev_line
-                prev_line = last_line
-                if line == '\n' or type(line) == int:  # skip blank lines
-                    last_line = last_line
-                else:
-                    last_line = line
-
-            # try:
-            aux = last_line.split()  # read last line in a time history
-            # except:
-            #     print('ERROR: ' + filepath)
-
-            try:
-                aux = [float(x) for x in aux]  # convert to list of floats
-            except:
-                aux = np.array([0, 0])
-            # only keeps lines with results for all the columns (possible issues when inconvergence)
-            if (len(aux) != int(3 * num_beams)) or (len(aux) != int(num_beams)):
-                try:
-                    aux = prev_line.split()
-                    aux = [float(x) for x in aux]  # convert to list of floats
-                except:
-                    aux = np.array([0, 0])
-                if (len(aux) != int(3 * num_beams)) or (len(aux) != int(num_beams)):
-                    try:
-                        aux = pp_line.split()
-                        aux = [float(x) for x in aux]  # convert to list of floats
-                    except:
-                        aux = np.array([0, 0])
-                    if (len(aux) != int(3 * num_beams)) or (len(aux) != int(num_beams)):
-                        try:
-                            aux = ppp_line.split()
-                            aux = [float(x) for x in aux]  # convert to list of floats
-                        except:
-                            aux = np.array([0, 0])
-            aux = [float(x) for x in aux]  # convert to list of floats
-            data_1d = np.abs(aux)
+        # Read requested data (last row with results for all the beams, possible issues when inconvergence)
+        rows = cache.tail(filepath, [int(num_beams), int(3 * num_beams)])
+        if len(rows) == 0:
+            # take the last row with any result to report the inconsistency below
+            rows = cache.tail(filepath)
+        if len(rows) == 0:
+            aux = np.array([0, 0])
+        else:
+            aux = rows[-1]
+        data_1d = np.abs(aux)
 
         n_cols = len(data_1d)
 
@@ -1911,7 +2746,7 @@ def get_beam_response(results_folder, beam_list, filenames, def_desired='rot'):
 
 
 def get_splice_response_time(results_folder, splice_list, beam_list, column_list, filenames, res_type='Max', t=0,
-                        def_desired='rot'):
+                        def_desired='rot', index_folder=None):
     # Read response for columns, currently takes the maximum of the time history
     #
     # INPUTS
@@ -1925,6 +2760,9 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
     #                       'at_t': return the response at the given time t
     #                       'all_t': return the response history
     #    t                = index for deformed shape plot
+    #                       (slice with 'all_t' to read only that window of the history)
+    #    index_folder     = path to folder to save the row indexes used by 'at_t' and windows of 'all_t' (None to save
+    #                       them next to the recorders), see get_row_index
     #   def_desired       = 'axial'
     #                       'shear'
     #                       'rot'
@@ -1947,7 +2785,9 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        data_1d = np.loadtxt(filepath)
+        data_1d, i_t = read_response_history(filepath, [int(2 * num_splices), int(10 * num_splices), int(3 * num_splices),
+                                                        int(6 * num_splices), int(num_splices)], res_type, t,
+                                             index_folder=index_folder)
         _, n_cols = data_1d.shape
 
         if n_cols == int(2 * num_splices):
@@ -1968,7 +2808,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -1991,7 +2831,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -2015,7 +2855,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(res)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = res
@@ -2037,7 +2877,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
                     aux = abs(M_bot)
                 elif 'top' in file:
                     aux = abs(M_top)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 if 'bot' in file:
@@ -2052,7 +2892,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
             elif res_type == 'at_t':
                 # read response at index t for each hinge
                 aux = abs(data_1d)
-                results_1d = aux[t]
+                results_1d = aux[i_t]
             else:
                 # read response history
                 results_1d = data_1d
@@ -2086,7 +2926,7 @@ def get_splice_response_time(results_folder, splice_list, beam_list, column_list
     return column_results
 
 def get_splice_response(results_folder, splice_list, column_list, filenames, res_type='Max',
-                        def_desired='rot'):
+                        def_desired='rot', cache=None):
     # Read response for columns, currently takes the maximum of the time history
     #
     # INPUTS
@@ -2105,6 +2945,7 @@ def get_splice_response(results_folder, splice_list, column_list, filenames, res
     #                       'strain'
     #                       'stress'
     #                       Only applies for hinge_left/right and def_left/right
+    #   cache             = RecorderCache of the ground motion to reuse the files already read (None to read them here)
     #
     # OUTPUTS
     #    column_results   = dictionary with all results for the columns, one key for each filename
@@ -2117,44 +2958,27 @@ def get_splice_response(results_folder, splice_list, column_list, filenames, res
     # splice_list[n_stories_splice-1 : n_stories:n_stories_splice] = np.ones([n_pier])
     num_splices = np.sum(splice_list)
     max_res = 0
+    if cache is None:
+        cache = RecorderCache(results_folder)
 
     # Read results as 1d array
     for file in filenames:
         filepath = os.path.join(results_folder, file + '.out')
 
-        # data_1d = np.loadtxt(filepath)
-        # _, n_cols = data_1d.shape
-        with open(filepath) as f:
-            last_line = 0
-            for line in f:
-                prev_line = last_line
-                try:
-                    aux = line.split()
-                    aux = [abs(float(x)) for x in aux]  # convert to list of floats, empty "line" gives an error here
-
-                    # Initialize max_res vector if not exist yet
-                    if type(max_res) == int:
-                        max_res = np.zeros(len(aux))
-
-                    # only keep row with complete data
-                    if ((len(aux) == int(2 * num_splices)) or (len(aux) == int(10 * num_splices)) or
-                            (len(aux) == int(3 * num_splices)) or (len(aux) == int(6 * num_splices)) or
-                            (len(aux) == int(num_splices))):
-                        last_line = line
-                        max_res = np.max([max_res, aux], axis=0)
-                    else:
-                        last_line = last_line
-                except:
-                    last_line = last_line
+        complete_cols = [int(2 * num_splices), int(10 * num_splices), int(3 * num_splices), int(6 * num_splices),
+                         int(num_splices)]
+        if res_type == 'Max':
+            # only keep rows with complete data
+            data = cache.read(filepath, complete_cols)
+            if len(data) > 0:
+                max_res = np.max(np.abs(data), axis=0)
 
-            if res_type == 'Max':
-                # Take the max value in the history
-                data_1d = max_res
-            else:
-                # Taking last value
-                aux = prev_line.split()
-                aux = [float(x) for x in aux]  # convert to list of floats
-                data_1d = np.abs(aux)
+            # Take the max value in the history
+            data_1d = max_res
+        else:
+            # Taking second to last complete row since the last one sometimes has errors
+            rows = cache.tail(filepath, complete_cols, n_rows=2)
+            data_1d = np.abs(rows[0])
 
         n_cols = len(data_1d)
 
@@ -2259,7 +3083,8 @@ def collect_endState_single_response(model_name_all, save_results_folder_all, st
                                      beam_list_x_all,
                                      beam_list_y_all, column_list_x_all, column_list_y_all, pz_list_x_all,
                                      pz_list_y_all, splice_all, colSplice_x_all,
-                                     colSplice_y_all, case_i):
+                                     colSplice_y_all, case_i, resume=False,
+                                     n_workers=1, layout='groups'):
     # INPUTS
     # All the inputs include information per case (different from the EDP collector that breaks each case into independent jobs per stripe
     #    model_name_all           = list of str with the case name to collect results from
@@ -2275,6 +3100,11 @@ def collect_endState_single_response(model_name_all, save_results_folder_all, st
     #    splice_all               = list of boolean if splice are considered or ignored
     #    colSplice_x_all          = list of 2D np.array indicating which stories have a splice in the X frame
     #    colSplice_y_all          = list of 2D np.array indicating which stories have a splice in the X frame
+    #    resume                   = True to update the .h5 file of a previous collection, collecting only the new ground
+    #                               motions or those with files changed since then
+    #    n_workers                = number of processes to parse the ground motions in parallel (1 to parse them here).
+    #                               Only this process writes in the .h5 file, see collect_stripe_endState
+    #    layout                   = layout of the stripe groups of the .h5 file, see collect_endState_singleDir_response
     #
 
     # Parse case to execute
@@ -2338,15 +3168,22 @@ def collect_endState_single_response(model_name_all, save_results_folder_all, st
     # if os.path.isfile(results_filename):
     #     os.remove(results_filename)
     #     print(results_filename + ' already exists, so deleted it')
+    check_endState_layout(layout)
+    parameters = get_collection_parameters(model_name=model_name, beam_list=beam_list, column_list=column_list,
+                                           pz_list=pz_list, splice=splice, colSplice=colSplice if splice == 1 else 0,
+                                           **get_layout_parameters(layout))
+    check_endState_file(results_filename, parameters, resume)
 
-    # if True: (Collects only data for those building without data)
-    if not os.path.isfile(results_filename):
+    # if True: (Collects only data for those building without data, or updates it if resume)
+    if resume or not os.path.isfile(results_filename):
 
         # Collect results and store in HDF file
-        with h5py.File(results_filename, 'w') as hf:
+        with h5py.File(results_filename, 'a') as hf, get_executor(n_workers) as executor:
             # prepare data groups per return period
+            hf.attrs['collection_parameters'] = parameters
             for group in stripe_folders:
-                _ = hf.create_group('/' + group)
+                if group not in hf:
+                    _ = hf.create_group('/' + group)
 
             # collect bldg response for each gm in each stripe
             for i in range(n_stripes):
@@ -2355,102 +3192,18 @@ def collect_endState_single_response(model_name_all, save_results_folder_all, st
                 print('RP = ' + str(stripe_folders[i]) + 'years')
                 # print(stripe_folder_path)
 
-                gm_ids = os.listdir(stripe_folder_path)
-                for j in range(len(gm_ids)):
-                    # print(gm_ids[j])
-
-                    # collect results for this gm
-                    results_gm = os.path.join(stripe_folder_path, gm_ids[j])
-
-                    # check if acc results available (gm finished?)
-                    pfa_gm = get_EDPstory_response(results_gm, n_stories, 'acc_env')
-                    if type(pfa_gm) == int:  # did not finish RHA, so skip the ground motion
-                        print('Did not finish GM' + str(gm_ids[j]))
-                    else:
-                        #    Panel zones
-                        # pz_response     = get_pz_response(results_gm, beam_list, column_list, num_pz, ['all_disp', 'pz_rot'])
-                        pz_response = get_pz_response(results_gm, pz_list, ['all_disp', 'pz_rot'])
-                        #    beams and columns
-                        if 'cvn' in model_name:
-                            column_response = get_column_response(results_gm, column_list, ['hinge_bot', 'hinge_top'])
-                            beam_plas_rot = get_beam_response(results_gm, beam_list, ['hinge_left', 'hinge_right'])
-                            frac_simulated = get_beam_response(results_gm, beam_list,
-                                                               ['frac_LB', 'frac_LT', 'frac_RB', 'frac_RT'])
-                            FI_simulated = get_beam_response(results_gm, beam_list,
-                                                               ['FI_LB', 'FI_LT', 'FI_RB', 'FI_RT'])
-                        else:
-                            beam_plas_rot = get_beam_response(results_gm, beam_list, ['hinge_left', 'hinge_right'])
-                            column_response = get_column_response(results_gm, column_list, ['hinge_bot', 'hinge_top'])
-                        #    Splices
-                        if splice == 1:
-                            splice_response = get_splice_response(results_gm, colSplice, column_list, ['ss_splice'],
-                                                                  res_type='Max', def_desired='strain')
-                            splice_frac = splice_response['ss_splice'] > 2 * 60 / 29000
-
-                        # create gm group
-                        rp_group = hf['/' + stripe_folders[i]]
-                        gm_record_group = rp_group.create_group(gm_ids[j])
-
-                        # Save in h5 file's building_group
-                        if 'cvn' in model_name:
-                            key = 'all_disp'
-                            _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                            key = 'pz_rot'
-                            _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                            key = 'hinge_bot'
-                            _ = gm_record_group.create_dataset(key, data=column_response[key])
-                            key = 'hinge_top'
-                            _ = gm_record_group.create_dataset(key, data=column_response[key])
-                            key = 'hinge_left'
-                            _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                            key = 'hinge_right'
-                            _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                            key = 'frac_LB'
-                            _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                            key = 'frac_LT'
-                            _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                            key = 'frac_RB'
-                            _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                            key = 'frac_RT'
-                            _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                            key = 'FI_LB'
-                            _ = gm_record_group.create_dataset(key, data=FI_simulated[key])
-                            key = 'FI_LT'
-                            _ = gm_record_group.create_dataset(key, data=FI_simulated[key])
-                            key = 'FI_RB'
-                            _ = gm_record_group.create_dataset(key, data=FI_simulated[key])
-                            key = 'FI_RT'
-                            _ = gm_record_group.create_dataset(key, data=FI_simulated[key])
-                            if splice == 1:
-                                key = 'ss_splice'
-                                _ = gm_record_group.create_dataset(key, data=splice_response[key])
-                                key = 'splice_frac'
-                                _ = gm_record_group.create_dataset(key, data=splice_frac)
-                        else:
-                            key = 'all_disp'
-                            _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                            key = 'pz_rot'
-                            _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                            key = 'hinge_bot'
-                            _ = gm_record_group.create_dataset(key, data=column_response[key])
-                            key = 'hinge_top'
-                            _ = gm_record_group.create_dataset(key, data=column_response[key])
-                            key = 'hinge_left'
-                            _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                            key = 'hinge_right'
-                            _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                            if splice == 1:
-                                key = 'ss_splice'
-                                _ = gm_record_group.create_dataset(key, data=splice_response[key])
-                                key = 'splice_frac'
-                                _ = gm_record_group.create_dataset(key, data=splice_frac)
-
-
+                # collect results for each gm (parsed by the workers of the executor if given, only this process
+                # writes in the file)
+                collect_stripe_endState(stripe_folder_path, hf['/' + stripe_folders[i]], beam_list, column_list,
+                                        pz_list, splice, colSplice if splice == 1 else None,
+                                        fracture='cvn' in model_name, fracture_index='cvn' in model_name,
+                                        resume=resume, executor=executor, layout=layout)
 
 
 def collect_endStateXandY_response(model_name_all, save_results_folder_all, stripe_folders_all, msa_folders_all, beam_list_x_all,
                                    beam_list_y_all, column_list_x_all, column_list_y_all, pz_list_x_all, pz_list_y_all, splice_all, colSplice_x_all,
-                                   colSplice_y_all, case_i):
+                                   colSplice_y_all, case_i, resume=False,
+                                   n_workers=1, layout='groups'):
     # INPUTS
     # All the inputs include information per case (different from the EDP collector that breaks each case into independent jobs per stripe
     #    model_name_all           = list of str with the case name to collect results from
@@ -2466,6 +3219,11 @@ def collect_endStateXandY_response(model_name_all, save_results_folder_all, stri
     #    splice_all               = list of boolean if splice are considered or ignored
     #    colSplice_x_all          = list of 2D np.array indicating which stories have a splice in the X frame
     #    colSplice_y_all          = list of 2D np.array indicating which stories have a splice in the X frame
+    #    resume                   = True to update the .h5 file of a previous collection, collecting only the new ground
+    #                               motions or those with files changed since then
+    #    n_workers                = number of processes to parse the ground motions in parallel (1 to parse them here).
+    #                               Only this process writes in the .h5 file, see collect_stripe_endState
+    #    layout                   = layout of the stripe groups of the .h5 file, see collect_endState_singleDir_response
     #
 
     # Parse case to execute
@@ -2483,6 +3241,7 @@ def collect_endStateXandY_response(model_name_all, save_results_folder_all, stri
     if splice == 1:
         colSplice_x = colSplice_x_all[case_i]
         colSplice_y = colSplice_y_all[case_i]
+    check_endState_layout(layout)
 
     dirCases = ['X', 'Y']
     n_stripes = len(stripe_folders)
@@ -2530,15 +3289,22 @@ def collect_endStateXandY_response(model_name_all, save_results_folder_all, stri
         # if os.path.isfile(results_filename):
         #     os.remove(results_filename)
         #     print(results_filename + ' already exists, so deleted it')
+        parameters = get_collection_parameters(model_name=model_name, beam_list=beam_list, column_list=column_list,
+                                               pz_list=pz_list, splice=splice,
+                                               colSplice=colSplice if splice == 1 else 0,
+                                               **get_layout_parameters(layout))
+        check_endState_file(results_filename, parameters, resume)
 
-        # if True (Collects only data for those building without data)
-        if not os.path.isfile(results_filename):
+        # if True (Collects only data for those building without data, or updates it if resume)
+        if resume or not os.path.isfile(results_filename):
 
             # Collect results and store in HDF file
-            with h5py.File(results_filename, 'w') as hf:
+            with h5py.File(results_filename, 'a') as hf, get_executor(n_workers) as executor:
                 # prepare data groups per return period
+                hf.attrs['collection_parameters'] = parameters
                 for group in stripe_folders:
-                    _ = hf.create_group('/' + group)
+                    if group not in hf:
+                        _ = hf.create_group('/' + group)
 
                 # collect bldg response for each gm in each stripe
                 for i in range(n_stripes):
@@ -2547,81 +3313,11 @@ def collect_endStateXandY_response(model_name_all, save_results_folder_all, stri
                     print('RP = ' + str(stripe_folders[i]) + 'years')
                     # print(stripe_folder_path)
 
-                    gm_ids = os.listdir(stripe_folder_path)
-                    for j in range(len(gm_ids)):
-                        # print(gm_ids[j])
+                    # collect results for each gm (parsed by the workers of the executor if given, only this process
+                    # writes in the file)
+                    collect_stripe_endState(stripe_folder_path, hf['/' + stripe_folders[i]], beam_list, column_list,
+                                            pz_list, splice, colSplice if splice == 1 else None,
+                                            fracture='cvn' in model_name, fracture_index=False, resume=resume,
+                                            executor=executor, layout=layout)
 
-                        # collect results for this gm
-                        results_gm = os.path.join(stripe_folder_path, gm_ids[j])
 
-                        # check if acc results available (gm finished?)
-                        pfa_gm = get_EDPstory_response(results_gm, n_stories, 'acc_env')
-                        if type(pfa_gm) == int:  # did not finish RHA, so skip the ground motion
-                            print('Did not finish GM' + str(gm_ids[j]))
-                        else:
-                            #    Panel zones
-                            # pz_response     = get_pz_response(results_gm, beam_list, column_list, num_pz, ['all_disp', 'pz_rot'])
-                            pz_response = get_pz_response(results_gm, pz_list, ['all_disp', 'pz_rot'])
-                            #    beams and columns
-                            if 'cvn' in model_name:
-                                column_response = get_column_response(results_gm, column_list, ['hinge_bot','hinge_top'])
-                                beam_plas_rot = get_beam_response(results_gm, beam_list, ['hinge_left', 'hinge_right'])
-                                frac_simulated  = get_beam_response(results_gm, beam_list, ['frac_LB','frac_LT','frac_RB','frac_RT'])
-                            else:
-                                beam_plas_rot   = get_beam_response(results_gm, beam_list, ['hinge_left','hinge_right'])
-                                column_response = get_column_response(results_gm, column_list, ['hinge_bot','hinge_top'])
-                            #    Splices
-                            if splice == 1:
-                                splice_response = get_splice_response(results_gm, colSplice, column_list, ['ss_splice'],
-                                                  res_type='Max', def_desired='strain')
-                                splice_frac = splice_response['ss_splice'] > 2*60/29000
-
-                            # create gm group
-                            rp_group = hf['/' + stripe_folders[i]]
-                            gm_record_group = rp_group.create_group(gm_ids[j])
-
-                            # Save in h5 file's building_group
-                            if 'cvn' in model_name:
-                                key = 'all_disp'
-                                _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                                key = 'pz_rot'
-                                _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                                key = 'hinge_bot'
-                                _ = gm_record_group.create_dataset(key, data=column_response[key])
-                                key = 'hinge_top'
-                                _ = gm_record_group.create_dataset(key, data=column_response[key])
-                                key = 'hinge_left'
-                                _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                                key = 'hinge_right'
-                                _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                                key = 'frac_LB'
-                                _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                                key = 'frac_LT'
-                                _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                                key = 'frac_RB'
-                                _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                                key = 'frac_RT'
-                                _ = gm_record_group.create_dataset(key, data=frac_simulated[key])
-                                if splice == 1:
-                                    key = 'ss_splice'
-                                    _ = gm_record_group.create_dataset(key, data=splice_response[key])
-                                    key = 'splice_frac'
-                                    _ = gm_record_group.create_dataset(key, data=splice_frac)
-                            else:
-                                key = 'all_disp'
-                                _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                                key = 'pz_rot'
-                                _ = gm_record_group.create_dataset(key, data=pz_response[key])
-                                key = 'hinge_bot'
-                                _ = gm_record_group.create_dataset(key, data=column_response[key])
-                                key = 'hinge_top'
-                                _ = gm_record_group.create_dataset(key, data=column_response[key])
-                                key = 'hinge_left'
-                                _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                                key = 'hinge_right'
-                                _ = gm_record_group.create_dataset(key, data=beam_plas_rot[key])
-                                if splice == 1:
-                                    key = 'ss_splice'
-                                    _ = gm_record_group.create_dataset(key, data=splice_response[key])
-                                    key = 'splice_frac'
-                                    _ = gm_record_group.create_dataset(key, data=splice_frac)
@@ -0,0 +1,207 @@
+from .base import *
+from .collect_nrha_results import *
+
+
+def get_edp_direction(column):
+    # Direction of an EDP column in the pelicun format, e.g. 2 for '1-PID-3-2', '1-DSC-3-2011' or '1-DSS-2-201'
+    # (1 for EndCriteria and EndCriteriaX, 2 for EndCriteriaY)
+    if column.startswith('EndCriteria'):
+        return 2 if column == 'EndCriteriaY' else 1
+    parts = column.split('-')
+    if parts[1] == 'DSC' or parts[1] == 'DSS':
+        return int(parts[-1][0])
+    return int(parts[-1])
+
+
+def set_edp_direction(column, direction):
+    # Same EDP column for another direction, e.g. '1-PID-3-1' -> '1-PID-3-2'
+    parts = column.split('-')
+    if parts[1] == 'DSC' or parts[1] == 'DSS':
+        parts[-1] = str(direction) + parts[-1][1:]
+    else:
+        parts[-1] = str(direction)
+    return '-'.join(parts)
+
+
+def split_edp_directions(results, direction=None):
+    # Splits an EDP table in one table per direction with its own EndCriteria
+    #
+    # INPUTS
+    #    results   = EDP table of collect_gmset_response (one direction) or collect_XandY_response (both directions)
+    #    direction = int to save a single direction table as this direction, renaming its EDP columns (e.g. the
+    #                table of a *_dirY case collected with collect_single_response). None to take the direction
+    #                from the column names
+    #
+    # OUTPUTS
+    #    tables    = dictionary direction: pd.DataFrame with EndCriteria and the EDPs of that direction
+    #
+
+    if direction is not None:
+        table = results[[column for column in results.columns if not column.startswith('EndCriteria') or
+                         column == 'EndCriteria']]
+        table = table.rename(columns=dict([(column, set_edp_direction(column, direction))
+                                           for column in table.columns if column != 'EndCriteria']))
+        return {direction: table}
+
+    # EDP columns per direction
+    directions = dict()
+    for column in results.columns:
+        if not column.startswith('EndCriteria'):
+            directions.setdefault(get_edp_direction(column), []).append(column)
+
+    tables = dict()
+    for column_direction in directions:
+        if 'EndCriteriaX' in results.columns:
+            # table of both directions, with the EndCriteria of each direction
+            end_criteria = 'EndCriteriaX' if column_direction == 1 else 'EndCriteriaY'
+        else:
+            end_criteria = 'EndCriteria'
+        table = results[[end_criteria] + directions[column_direction]]
+        tables[column_direction] = table.rename(columns={end_criteria: 'EndCriteria'})
+
+    return tables
+
+
+def save_edp_store(results, store_filename, stripe, direction=None, compression='gzip'):
+    # Saves the EDP table of a stripe in the EDP store of a building, replacing only the groups of that stripe and
+    # the directions in the table
+    #
+    # INPUTS
+    #    results        = EDP table of collect_gmset_response or collect_XandY_response
+    #    store_filename = path to the .h5 file of the store (created if it does not exist)
+    #    stripe         = name of the stripe
+    #    direction      = see split_edp_directions
+    #    compression    = HDF5 compression filter for the EDP arrays (None for no compression)
+    #
+    # STORE LAYOUT
+    #    /<stripe>/<direction>/gm_ids      = name of each ground motion (rows)
+    #    /<stripe>/<direction>/EndCriteria = int8 code of the EndCriteria of each ground motion
+    #                                        attrs: categories (end_criteria_categories, -1 if missing)
+    #    /<stripe>/<direction>/edp         = 2D float array with the EDPs (ground motions x EDPs), chunked
+    #                                        attrs: columns (names of the EDPs in the pelicun format)
+    #
+    # NOTES
+    #    Only one process can write in the store at the same time. Collect the stripes in parallel as usual and
+    #    save them in the store afterwards (see build_edp_store).
+    #
+
+    tables = split_edp_directions(results, direction=direction)
+
+    with h5py.File(store_filename, 'a') as hf:
+        hf.attrs['layout'] = 'edp_store'
+        stripe_group = hf.require_group(stripe)
+        for table_direction, table in tables.items():
+            key = str(table_direction)
+            if key in stripe_group:
+                del stripe_group[key]
+            group = stripe_group.create_group(key)
+
+            group.create_dataset('gm_ids', data=np.array(table.index.astype(str), dtype=object),
+                                 dtype=h5py.string_dtype())
+
+            end_criteria = pd.Categorical(table['EndCriteria'].astype(str), categories=end_criteria_categories)
+            dataset = group.create_dataset('EndCriteria', data=end_criteria.codes.astype(np.int8))
+            dataset.attrs['categories'] = end_criteria_categories
+
+            columns = [column for column in table.columns if column != 'EndCriteria']
+            edp = table[columns].to_numpy(dtype=float)
+            if edp.size > 0:
+                dataset = group.create_dataset('edp', data=edp, chunks=(min(len(edp), 1024), min(edp.shape[1], 64)),
+                                               compression=compression, shuffle=compression is not None)
+            else:
+                dataset = group.create_dataset('edp', data=edp)
+            dataset.attrs['columns'] = columns
+
+
+def build_edp_store(save_results_folder, model_name, stripes, store_filename=None, compression='gzip'):
+    # Saves the EDP tables of every stripe of a building (EDP_<model_name>_<stripe>) in a single EDP store
+    #
+    # INPUTS
+    #    save_results_folder = path to the collected results
+    #    model_name          = str with the case name, or dictionary direction: case name to join cases collected
+    #                          per direction (e.g. {1: 'Bldg_dirX', 2: 'Bldg_dirY'})
+    #    stripes             = list with the name of the stripes to save (the other stripes already in the store are
+    #                          kept)
+    #    store_filename      = path to the .h5 file of the store (default: save_results_folder/EDP_<model_name>.h5,
+    #                          with the name of the first case if model_name is a dictionary)
+    #    compression         = see save_edp_store
+    #
+    # OUTPUTS
+    #    store_filename      = path to the store
+    #
+
+    if type(model_name) == dict:
+        cases = model_name
+    else:
+        cases = {None: model_name}
+    if store_filename is None:
+        store_filename = os.path.join(save_results_folder, 'EDP_' + list(cases.values())[0] + '.h5')
+
+    for direction, case_name in cases.items():
+        for stripe in stripes:
+            results_filename = None
+            for edp_format in ['feather', 'parquet', 'csv']:
+                filename = get_edp_filename(save_results_folder, case_name, stripe, edp_format=edp_format)
+                if os.path.isfile(filename):
+                    results_filename = filename
+                    break
+            if results_filename is None:
+                print('No EDP table for ' + case_name + ' stripe ' + stripe)
+                continue
+            save_edp_store(read_edp_table(results_filename), store_filename, stripe, direction=direction,
+                           compression=compression)
+
+    return store_filename
+
+
+def read_edp_store(store_filename, stripes=None, directions=None, columns=None):
+    # Reads the EDP store of a building in a single table
+    #
+    # INPUTS
+    #    store_filename = path to the .h5 file of the store
+    #    stripes        = list with the name of the stripes to read, in the order of the rows (None to read all)
+    #    directions     = list with the directions to read, e.g. [1] (None to read all)
+    #    columns        = list of the columns to read, with their names or their EDP type (e.g. ['EndCriteria',
+    #                     'PID']). None to read every column. Only the EDP columns requested are read from the file
+    #
+    # OUTPUTS
+    #    results        = pd.DataFrame indexed by (stripe, gm_id, direction) with EndCriteria as a categorical column
+    #                     and the EDPs of every direction as columns (NaN for the EDPs of the other directions)
+    #
+
+    tables = []
+    with h5py.File(store_filename, 'r') as hf:
+        for stripe in (stripes if stripes is not None else list(hf)):
+            if stripe not in hf:
+                continue
+            for key in hf[stripe]:
+                if directions is not None and int(key) not in directions:
+                    continue
+                group = hf[stripe][key]
+                gm_ids = [gm_id.decode() if type(gm_id) == bytes else gm_id for gm_id in group['gm_ids'][()]]
+
+                table = pd.DataFrame(index=pd.MultiIndex.from_arrays([[stripe] * len(gm_ids), gm_ids,
+                                                                      [int(key)] * len(gm_ids)],
+                                                                     names=['stripe', 'gm_id', 'direction']))
+                if columns is None or 'EndCriteria' in columns:
+                    table['EndCriteria'] = pd.Categorical.from_codes(group['EndCriteria'][()],
+                                                                     categories=end_criteria_categories)
+
+                stored_columns = list(group['edp'].attrs['columns'])
+                selected = select_edp_columns(stored_columns, columns)
+                if len(selected) == len(stored_columns):
+                    edp = group['edp'][()]
+                elif len(selected) > 0 and len(gm_ids) > 0:
+                    edp = group['edp'][:, [stored_columns.index(column) for column in selected]]
+                else:
+                    edp = np.zeros([len(gm_ids), len(selected)])
+                table = pd.concat([table, pd.DataFrame(edp, index=table.index, columns=selected)], axis=1)
+                tables.append(table)
+
+    if len(tables) == 0:
+        return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], [], []], names=['stripe', 'gm_id', 'direction']))
+    results = pd.concat(tables)
+    if 'EndCriteria' in results.columns:
+        results['EndCriteria'] = pd.Categorical(results['EndCriteria'], categories=end_criteria_categories)
+
+    return results
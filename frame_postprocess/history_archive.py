@@ -0,0 +1,273 @@
+from .base import *
+from .collect_nrha_results import *
+
+
+# histories that can be saved in the archive and the reader of each one:
+#    'disp', 'drift'            = story response of each floor (story<i>_disp.out, story<i>_drift.out), see
+#                                 get_story_response
+#    'all_disp', 'pz_rot'       = panel zone response, see get_pz_response_time
+#    'hinge_bot', 'hinge_top'   = column hinges, see get_column_response_time
+#    'hinge_left', 'hinge_right', 'frac_LB', 'frac_LT', 'frac_RB', 'frac_RT'
+#                               = beam hinges and fracture flags, see get_beam_response_time
+history_quantities = ['all_disp', 'pz_rot', 'hinge_bot', 'hinge_top', 'hinge_left', 'hinge_right', 'frac_LB',
+                      'frac_LT', 'frac_RB', 'frac_RT']
+story_history_quantities = ['disp', 'drift']
+pz_history_quantities = ['all_disp', 'pz_rot']
+column_history_quantities = ['hinge_bot', 'hinge_top']
+beam_history_quantities = ['hinge_left', 'hinge_right', 'frac_LB', 'frac_LT', 'frac_RB', 'frac_RT']
+
+
+def collect_gm_history(results_gm, beam_list, column_list, quantities=None):
+    # Reads the complete histories of a ground motion to save in the time history archive
+    #
+    # INPUTS
+    #    results_gm  = path to folder with the results of NLRHA of the ground motion (raw folder or a folder inside a
+    #                  packed .h5 archive, see pack_msa_results)
+    #    beam_list   = 2D np.array indicating which beams exist
+    #    column_list = 2D np.array indicating which columns exist
+    #    quantities  = list with the histories to read (default: history_quantities), see story_history_quantities
+    #
+    # OUTPUTS
+    #    time        = 1D np.array with the time of each step (from all_disp.out, or the first story disp.out file
+    #                  when 'disp' is requested)
+    #    history     = dictionary with an array (n_stories, n_pier_or_bay, n_steps) per quantity ((n_stories,
+    #                  n_steps) for the story quantities), None if a story file is missing
+    #
+    # NOTES
+    #    Every history is cut to the number of steps of the shortest one, so the same index t is the same instant
+    #    in all of them.
+    #
+
+    if quantities is None:
+        quantities = history_quantities
+    for key in quantities:
+        if key not in story_history_quantities + pz_history_quantities + column_history_quantities + \
+                beam_history_quantities:
+            raise ValueError('Unknown history ' + str(key))
+
+    history = dict()
+    time = None
+
+    story_files = [key for key in quantities if key in story_history_quantities]
+    if len(story_files) > 0:
+        story_response = get_story_response(results_gm, beam_list, story_files)
+        if story_response is None:
+            return None, None
+        time = story_response.get('time')
+        for key in story_files:
+            history[key] = story_response[key]
+
+    # the time vector comes from all_disp.out even if it is not requested (the element recorders have no time)
+    pz_files = [key for key in quantities if key in pz_history_quantities]
+    if len(pz_files) > 0 or time is None:
+        pz_response = get_pz_response_time(results_gm, beam_list, column_list,
+                                           pz_files if 'all_disp' in pz_files else ['all_disp'] + pz_files,
+                                           res_type='all_t')
+        if time is None:
+            time = pz_response['time']
+        for key in pz_files:
+            history[key] = pz_response[key]
+
+    column_files = [key for key in quantities if key in column_history_quantities]
+    if len(column_files) > 0:
+        column_response = get_column_response_time(results_gm, beam_list, column_list, column_files,
+                                                   res_type='all_t')
+        for key in column_files:
+            history[key] = column_response[key]
+
+    beam_files = [key for key in quantities if key in beam_history_quantities]
+    if len(beam_files) > 0:
+        beam_response = get_beam_response_time(results_gm, beam_list, beam_files, res_type='all_t')
+        for key in beam_files:
+            history[key] = beam_response[key]
+
+    # same number of steps in every history
+    n_steps = min([len(time)] + [history[key].shape[-1] for key in history])
+    time = time[:n_steps]
+    for key in history:
+        history[key] = history[key][..., :n_steps]
+    # keep the order requested
+    history = dict([(key, history[key]) for key in quantities])
+
+    return time, history
+
+
+def get_chunk_steps(data, chunk_steps=None):
+    # Number of time steps per chunk of a history (chunks of about 64 kB with every element of a few steps)
+    if chunk_steps is None:
+        step_bytes = max(1, int(np.prod(data.shape[:-1])) * data.dtype.itemsize)
+        chunk_steps = max(1, 2 ** 16 // step_bytes)
+    return max(1, min(data.shape[-1], chunk_steps))
+
+
+def save_gm_history(stripe_group, gm_id, time, history, signature=None, chunk_steps=None, compression='gzip'):
+    # Saves the histories of a ground motion (output of collect_gm_history) in its group of the time history archive
+    #
+    # INPUTS
+    #    stripe_group = h5py group of the stripe
+    #    gm_id        = name of the ground motion folder
+    #    time         = 1D np.array with the time of each step
+    #    history      = dictionary with one array per quantity with the time in the last axis
+    #    signature    = signature of the files of the ground motion (None if not available), see check_collected_gm
+    #    chunk_steps  = number of time steps per HDF5 chunk (None for chunks of about 64 kB)
+    #    compression  = HDF5 compression filter (None for no compression)
+    #
+    # GROUP LAYOUT
+    #    /<stripe>/<gm_id>/time       = 1D array with the time of each step (dimension scale of the histories)
+    #    /<stripe>/<gm_id>/<quantity> = array (n_stories, n_pier_or_bay, n_steps) chunked along the time, with every
+    #                                   element in each chunk, so a window of steps reads only a few chunks
+    #
+
+    gm_group = stripe_group.create_group(gm_id)
+    if signature is not None:
+        gm_group.attrs['signature'] = signature
+
+    time = np.asarray(time, dtype=float)
+    if len(time) > 0:
+        time_dataset = gm_group.create_dataset('time', data=time, chunks=(get_chunk_steps(time, chunk_steps),),
+                                               compression=compression)
+    else:
+        time_dataset = gm_group.create_dataset('time', data=time)
+    time_dataset.make_scale('time')
+
+    for key, data in history.items():
+        if data.size > 0:
+            chunks = data.shape[:-1] + (get_chunk_steps(data, chunk_steps),)
+            dataset = gm_group.create_dataset(key, data=data, chunks=chunks, compression=compression,
+                                              shuffle=compression is not None)
+        else:
+            dataset = gm_group.create_dataset(key, data=data)
+        dataset.dims[data.ndim - 1].attach_scale(time_dataset)
+
+
+def collect_history_archive(model_name, msa_folder, stripe_folders, save_results_folder, beam_list, column_list,
+                            quantities=None, gm_ids=None, resume=False, n_workers=1, max_pending=8,
+                            chunk_steps=None, compression='gzip'):
+    # Saves the complete histories of the ground motions of a case in a time history archive
+    # (<model_name>_history.h5), to animate or plot the response at any time without reading the raw results again
+    #
+    # INPUTS
+    #    model_name          = str with the case name to use in the name of the archive
+    #    msa_folder          = path to the folder with one subfolder per stripe (AnalysisResult/MSA or a packed .h5
+    #                          archive, see pack_msa_results)
+    #    stripe_folders      = list with the name of the stripes to save
+    #    save_results_folder = path to save the archive
+    #    beam_list           = 2D np.array indicating which beams exist
+    #    column_list         = 2D np.array indicating which columns exist
+    #    quantities          = list with the histories to save, see collect_gm_history
+    #    gm_ids              = list with the ground motion folders to save in every stripe (None to save all)
+    #    resume              = True to update the archive of a previous collection with the same inputs, reading
+    #                          only the new ground motions or those with files changed since then
+    #    n_workers           = number of processes to read the ground motions in parallel (1 to read them here).
+    #                          Only this process writes in the archive
+    #    max_pending         = maximum number of ground motions read but not written yet (the histories are large)
+    #    chunk_steps, compression
+    #                        = see save_gm_history
+    #
+    # OUTPUTS
+    #    history_filename    = path to the archive, read with read_gm_history
+    #
+    # NOTES
+    #    The ground motions of tarballs and zip files are not supported (their files are only in memory).
+    #
+
+    if quantities is None:
+        quantities = history_quantities
+    if gm_ids is not None:
+        gm_ids = set(gm_ids)
+
+    history_filename = os.path.join(save_results_folder, model_name + '_history.h5')
+
+    # Removes existing file (unless resuming a collection with the same inputs)
+    parameters = get_collection_parameters(beam_list=beam_list, column_list=column_list, quantities=quantities)
+    check_endState_file(history_filename, parameters, resume)
+    if os.path.isfile(history_filename) and not resume:
+        os.remove(history_filename)
+        print(history_filename + ' already exists, so deleted it')
+
+    print('------- ' + model_name + ' -------')
+    with h5py.File(history_filename, 'a') as hf, get_executor(n_workers) as executor:
+        hf.attrs['collection_parameters'] = parameters
+        for stripe in stripe_folders:
+            print('RP = ' + str(stripe) + 'years')
+            stripe_folder_path = os.path.join(msa_folder, stripe)
+            stripe_group = hf.require_group(stripe)
+
+            manifest = get_stripe_manifest(stripe_folder_path, rescan=resume)
+            if resume:
+                remove_missing_gms(stripe_group, manifest)
+                if gm_ids is not None:
+                    for gm_id in list(stripe_group.keys()):
+                        if gm_id not in gm_ids:
+                            del stripe_group[gm_id]
+
+            def save_pending(gm_id, signature, history_gm):
+                if isinstance(history_gm, concurrent.futures.Future):
+                    history_gm = history_gm.result()
+                time, history = history_gm
+                if time is None:
+                    print('Did not finish GM' + str(gm_id))
+                else:
+                    save_gm_history(stripe_group, gm_id, time, history, signature=signature,
+                                    chunk_steps=chunk_steps, compression=compression)
+
+            pending = collections.deque()
+            for gm_id, results_gm, _ in iter_gm_results(stripe_folder_path, manifest=manifest):
+                if gm_ids is not None and gm_id not in gm_ids:
+                    continue
+
+                # keep the gm already saved from the same files
+                skip, signature = check_collected_gm(stripe_group, manifest, gm_id, resume)
+                if skip:
+                    continue
+                if gm_id in stripe_group:
+                    del stripe_group[gm_id]
+
+                if manifest is not None and manifest['gms'][gm_id]['status'] == 'no_acc_env':
+                    history_gm = (None, None)
+                elif executor is None:
+                    history_gm = collect_gm_history(results_gm, beam_list, column_list, quantities=quantities)
+                else:
+                    history_gm = executor.submit(collect_gm_history, results_gm, beam_list, column_list,
+                                                 quantities=quantities)
+                pending.append((gm_id, signature, history_gm))
+
+                while len(pending) > (max_pending if executor is not None else 0):
+                    save_pending(*pending.popleft())
+
+            while len(pending) > 0:
+                save_pending(*pending.popleft())
+
+    return history_filename
+
+
+def read_gm_history(history_filename, stripe, gm_id, quantities=None, t=None):
+    # Reads the histories of a ground motion from the time history archive
+    #
+    # INPUTS
+    #    history_filename = path to the archive (output of collect_history_archive)
+    #    stripe           = name of the stripe
+    #    gm_id            = name of the ground motion folder
+    #    quantities       = list with the histories to read (None to read all)
+    #    t                = index or slice of the time steps to read (None to read the complete history). Only the
+    #                       chunks with these steps are read, e.g. slice(1000, 1100) for a window of an animation
+    #
+    # OUTPUTS
+    #    history          = dictionary with 'time' and an array per quantity with the time in the last axis, same
+    #                       format as the *_response_time readers with res_type='all_t' (e.g. history['all_disp']
+    #                       for plot_building_at_t)
+    #
+
+    if t is None:
+        t = slice(None)
+
+    with h5py.File(history_filename, 'r') as hf:
+        gm_group = hf[stripe][gm_id]
+        if quantities is None:
+            quantities = [key for key in gm_group.keys() if key != 'time']
+        history = dict(keys=quantities)
+        history['time'] = gm_group['time'][t]
+        for key in quantities:
+            history[key] = gm_group[key][..., t]
+
+    return history
@@ -0,0 +1,1506 @@
+from .base import *
+import collections
+import concurrent.futures
+import hashlib
+import io
+import json
+import mmap
+import tarfile
+import zipfile
+
+
+def read_last_rows(filepath, n_cols=None, n_rows=1, min_cols=None, block_size=65536, buffer=None, max_lines=10000):
+    # Reads the last complete rows of an OpenSees text recorder by seeking backwards from the end of the file in
+    # blocks, so the cost depends on the number of rows requested and not on the length of the time history
+    #
+    # INPUTS
+    #    filepath   = path to the .out file
+    #    n_cols     = int or list of int with the number of columns that define a complete row
+    #    n_rows     = number of complete rows to return
+    #    min_cols   = int as minimum number of columns of a complete row (used if n_cols is None)
+    #    block_size = number of bytes read per step from the end of the file
+    #    buffer     = bytes with the content of the file if already in memory (None to read filepath)
+    #    max_lines  = maximum number of lines checked from the end of the file (None to check the whole file), so a
+    #                 file without the rows desired is not scanned line by line up to the start
+    #
+    # OUTPUTS
+    #    rows       = 2D np.array (n_found, n_cols) with the last complete rows in file order (n_found <= n_rows)
+    #                 2D np.array (0, 0) if the file has no complete row
+    #
+    # NOTES
+    #    Blank lines, rows with a different number of columns, rows that can not be converted to float and a
+    #    last row without end of line (the run was killed while writing it) are skipped.
+    #
+
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+    if n_cols is None and min_cols is None:
+        min_cols = 1
+
+    if buffer is None:
+        dataset = get_archive_item(filepath)
+        filepath = find_recorder(filepath)
+    if buffer is None and (dataset is not None or filepath.endswith('.bin')):
+        if dataset is None:
+            return select_last_rows(read_binary_recorder(filepath, n_cols), n_cols, n_rows, min_cols)
+        return select_last_rows(dataset, n_cols, n_rows, min_cols)
+
+    if buffer is None:
+        f = open(filepath, 'rb')
+    else:
+        f = io.BytesIO(buffer)
+
+    rows = []
+    row_width = None
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b''
+        end_found = False
+        n_lines = 0
+        while position > 0 and len(rows) < n_rows and (max_lines is None or n_lines < max_lines):
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + remainder
+            remainder = b''
+
+            lines = buffer.split(b'\n')
+            if not end_found:
+                # last row is incomplete if the file does not finish with an end of line (it may be longer than a
+                # block, so it is dropped until the first end of line is found)
+                if len(lines) == 1:
+                    continue
+                lines = lines[:-1]
+                end_found = True
+            if position > 0:
+                # first line of the buffer may be a piece of a row, keep it for the next block
+                remainder = lines[0]
+                lines = lines[1:]
+
+            for line in reversed(lines):
+                n_lines += 1
+                if max_lines is not None and n_lines > max_lines:
+                    break
+                aux = line.split()
+                if len(aux) == 0:
+                    continue  # skip blank lines
+                if (row_width is not None and len(aux) != row_width) or \
+                        (n_cols is not None and len(aux) not in n_cols) or \
+                        (n_cols is None and len(aux) < min_cols):
+                    continue  # skip rows that do not include all the elements
+                try:
+                    aux = [float(x) for x in aux]
+                except ValueError:
+                    continue  # skip rows with corrupted numbers
+                rows.append(aux)
+                row_width = len(aux)
+                if len(rows) == n_rows:
+                    break
+
+    if len(rows) == 0:
+        return np.zeros([0, 0])
+
+    return np.array(rows[::-1])
+
+
+
+def select_last_rows(data, n_cols=None, n_rows=1, min_cols=1):
+    # Same output as read_last_rows for a recorder already converted to a 2D array (binary file or archive dataset)
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+
+    n_found, width = data.shape
+    if n_found == 0 or (n_cols is None and width < min_cols) or (n_cols is not None and width not in n_cols):
+        return np.zeros([0, 0])
+
+    return np.array(data[max(n_found - n_rows, 0):n_found])
+
+def read_recorder(filepath, n_cols=None, report=False):
+    # Reads the complete time history of an OpenSees text recorder
+    #
+    # INPUTS
+    #    filepath  = path to the .out file
+    #    n_cols    = int or list of int with the number of columns that define a complete row
+    #                None to take the number of columns of the first row
+    #    report    = True to also return the integrity report of the file
+    #
+    # OUTPUTS
+    #    data      = 2D np.array (n_rows, n_cols) with all the complete rows of the file
+    #    integrity = dictionary with the integrity report of the file, only if report=True (see get_integrity_report)
+    #
+    # NOTES
+    #    If the .out file does not exist but a .bin file with the same name does, the binary file is read instead.
+    #    Paths inside an archive created by pack_msa_results are read from the archive.
+    #
+
+    dataset = get_archive_item(filepath)
+    if dataset is not None:
+        return read_archived_recorder(dataset, n_cols, report=report)
+
+    filepath = find_recorder(filepath)
+    if filepath.endswith('.bin'):
+        return read_binary_recorder(filepath, n_cols, report=report)
+
+    with open(filepath, 'rb') as f:
+        buffer = f.read()
+
+    return parse_recorder(buffer, n_cols, report=report)
+
+
+def parse_recorder(buffer, n_cols=None, report=False):
+    # Converts the content of an OpenSees text recorder to a dense array of complete rows. The numbers are parsed in
+    # a single pass by the C reader of numpy, rows are only checked one by one when the file is ragged
+    #
+    # INPUTS
+    #    buffer    = bytes with the content of the .out file
+    #    n_cols    = int or list of int with the number of columns that define a complete row
+    #                None to take the number of columns of the first row
+    #    report    = True to also return the integrity report of the file
+    #
+    # OUTPUTS
+    #    data      = 2D np.array (n_rows, n_cols) with all the complete rows
+    #    integrity = dictionary with the integrity report of the file, only if report=True (see get_integrity_report)
+    #
+    # NOTES
+    #    Blank lines, rows with a different number of columns, rows with corrupted numbers and a last row without
+    #    end of line (the run was killed while writing it) are skipped, as left by inconvergent runs.
+    #
+
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+
+    # complete rows finish with an end of line
+    body = buffer[:buffer.rfind(b'\n') + 1]
+    truncated = len(buffer[len(body):].strip()) > 0
+    lines = body.split(b'\n')
+    n_blank = lines.count(b'') - 1  # the split leaves an empty item after the final end of line
+    n_lines = len(lines) - n_blank - 1
+
+    if n_lines == 0:
+        data = np.zeros([0, 0 if n_cols is None else n_cols[0]])
+        return _with_report(data, report, buffer, n_lines, n_blank, truncated)
+
+    # Fast path: every non blank line has the same number of columns (numpy raises an error otherwise)
+    try:
+        data = np.loadtxt(io.BytesIO(body), ndmin=2)
+        if n_cols is None or data.shape[1] in n_cols:
+            return _with_report(data, report, buffer, n_lines, n_blank, truncated)
+    except ValueError:
+        pass
+
+    # Ragged file: keep only the rows with the most common number of columns
+    widths = np.array([len(line.split()) for line in lines])
+    if n_cols is None:
+        candidates = widths[widths > 0]
+    else:
+        candidates = widths[np.isin(widths, n_cols)]
+    if len(candidates) == 0:
+        data = np.zeros([0, 0 if n_cols is None else n_cols[0]])
+        return _with_report(data, report, buffer, n_lines, n_blank, truncated)
+    width = np.bincount(candidates).argmax()
+
+    # the rows kept are parsed together by the C reader, row by row only if some of them have corrupted numbers
+    kept = [line for line, line_width in zip(lines, widths) if line_width == width]
+    try:
+        data = np.loadtxt(io.BytesIO(b'\n'.join(kept)), ndmin=2).reshape(-1, width)
+    except ValueError:
+        rows = []
+        for line in kept:
+            try:
+                rows.append([float(x) for x in line.split()])
+            except ValueError:
+                pass  # skip rows with corrupted numbers
+        data = np.array(rows).reshape(-1, width)
+
+    return _with_report(data, report, buffer, n_lines, n_blank, truncated)
+
+
+def get_integrity_report(data, n_lines, n_blank, truncated, final_row_complete):
+    # Summary of what the parser kept from a recorder file
+    #
+    # INPUTS
+    #    data               = 2D np.array with the complete rows kept
+    #    n_lines            = number of non blank lines finished with an end of line
+    #    n_blank            = number of blank lines
+    #    truncated          = True if the file finishes with a partial row without end of line
+    #    final_row_complete = True if the final line of the file is a complete row of the width kept
+    #
+    # OUTPUTS
+    #    integrity          = dictionary with
+    #                         'n_rows'            : number of complete rows kept
+    #                         'n_cols'            : number of columns of the rows kept
+    #                         'rows_dropped'      : rows written but not kept (ragged, corrupted or partial rows)
+    #                         'blank_lines'       : number of blank lines
+    #                         'truncated'         : True if the run was killed while writing the last row
+    #                         'final_row_complete': True if the final line of the file is a complete row
+    #                         'last_time'         : first value of the last row kept, i.e., the last valid time if
+    #                                               the recorder has a time column (nan if no rows)
+    #
+
+    n_rows, n_cols = data.shape
+    integrity = dict()
+    integrity['n_rows'] = n_rows
+    integrity['n_cols'] = n_cols
+    integrity['rows_dropped'] = int(n_lines + truncated - n_rows)
+    integrity['blank_lines'] = int(n_blank)
+    integrity['truncated'] = bool(truncated)
+    integrity['final_row_complete'] = bool(final_row_complete)
+    if n_rows > 0 and n_cols > 0:
+        integrity['last_time'] = float(data[-1, 0])
+    else:
+        integrity['last_time'] = np.nan
+
+    return integrity
+
+
+def _with_report(data, report, buffer, n_lines, n_blank, truncated):
+    if not report:
+        return data
+    final_row_complete = len(data) > 0 and final_row_is_complete(buffer, data.shape[1])
+    return data, get_integrity_report(data, n_lines, n_blank, truncated, final_row_complete)
+
+
+
+
+def final_row_is_complete(buffer, n_cols):
+    # Checks if the final row written in a text recorder file is complete
+    #
+    # INPUTS
+    #    buffer = bytes with the content of the file
+    #    n_cols = int with the number of columns of a complete row
+    #
+    # OUTPUTS
+    #    True if the file finishes with a complete row
+    #
+
+    final_line = buffer[buffer.rfind(b'\n', 0, len(buffer) - 1) + 1:]
+    try:
+        return buffer.endswith(b'\n') and len([float(x) for x in final_line.split()]) == n_cols
+    except ValueError:
+        return False
+
+
+def find_recorder(filepath):
+    # Path of the recorder file to read: the .out file if it exists, otherwise the binary .bin file with the same
+    # name (written by OpenSees with -binary instead of -file)
+    #
+    # INPUTS
+    #    filepath = path to the .out file
+    #
+    # OUTPUTS
+    #    filepath = path to the existing file (the input if none of them exists)
+    #
+
+    if os.path.isfile(filepath) or not filepath.endswith('.out'):
+        return filepath
+
+    binary_path = filepath[:-len('.out')] + '.bin'
+    if os.path.isfile(binary_path):
+        return binary_path
+
+    return filepath
+
+
+def get_binary_width(raw, n_cols=None, max_cols=100000):
+    # Finds the number of columns of an OpenSees binary recorder. OpenSees writes each row as n_cols float64 values
+    # followed by an end of line character, so a width is valid if every complete row finishes with that character
+    #
+    # INPUTS
+    #    raw      = 1D np.array of uint8 with the content of the .bin file
+    #    n_cols   = int or list of int with the number of columns that define a complete row
+    #               None to check every width up to max_cols
+    #    max_cols = maximum number of columns to check if n_cols is None
+    #
+    # OUTPUTS
+    #    width    = int with the number of columns (0 if the file does not have any complete row)
+    #
+
+    size = len(raw)
+    if n_cols is None:
+        candidates = range(1, min(size // 9, max_cols) + 1)
+    else:
+        candidates = sorted(np.atleast_1d(n_cols).astype(int).tolist())
+
+    for width in candidates:
+        row_size = 8 * width + 1
+        n_rows = size // row_size
+        if n_rows == 0 or raw[row_size - 1] != ord('\n'):
+            continue
+        if np.all(raw[row_size - 1:n_rows * row_size:row_size] == ord('\n')):
+            return width
+
+    return 0
+
+
+def read_binary_recorder(filepath, n_cols=None, report=False):
+    # Reads an OpenSees binary recorder (-binary option) as a zero-copy read-only view of the file with the same
+    # shape of the text readers. A last row that was not completely written is ignored.
+    #
+    # INPUTS
+    #    filepath = path to the .bin file
+    #    n_cols   = int or list of int with the number of columns that define a complete row
+    #               None to find it from the file
+    #    report   = True to also return the integrity report of the file
+    #
+    # OUTPUTS
+    #    data     = 2D np.array (n_rows, n_cols) with all the complete rows of the file
+    #    integrity= dictionary with the integrity report of the file, only if report=True (see get_integrity_report)
+    #
+
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_binary_recorder(b'', n_cols, report=report)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return parse_binary_recorder(mm, n_cols, report=report)
+
+
+def parse_binary_recorder(buffer, n_cols=None, report=False):
+    # Same output as read_binary_recorder for the content of the file already in memory (bytes or mmap)
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    width = get_binary_width(raw, n_cols)
+    if width == 0:
+        data = np.zeros([0, 0 if n_cols is None else n_cols[0]])
+        if report:
+            return data, get_integrity_report(data, 0, 0, len(raw) > 0, False)
+        return data
+
+    row_type = np.dtype([('values', np.float64, (width,)), ('end_of_line', 'S1')])
+    records = np.frombuffer(buffer, dtype=row_type, count=len(raw) // row_type.itemsize)
+    data = records['values']
+
+    if report:
+        # a binary file only has complete rows plus the partial row being written if the run was killed
+        truncated = len(raw) % row_type.itemsize > 0
+        return data, get_integrity_report(data, len(data), 0, truncated, not truncated)
+    return data
+
+
+def get_row_index(filepath, index_folder=None, chunk_size=2**23):
+    # Gets the byte offsets of every row of an OpenSees text recorder. The file is scanned once and the index is
+    # saved as <file>.rowidx.npz next to the file (or in index_folder) to be reused while the file does not change
+    #
+    # INPUTS
+    #    filepath     = path to the .out file
+    #    index_folder = path to folder to save the index (None to save it next to the file). The index is named
+    #                   after the absolute path of the file, so a single folder keeps the indexes of every ground
+    #                   motion (see get_row_index_path)
+    #    chunk_size   = number of bytes scanned per step
+    #
+    # OUTPUTS
+    #    row_index    = dictionary with one entry per non blank complete row
+    #                   'starts': byte where the row starts
+    #                   'ends'  : byte with the end of line of the row
+    #                   'widths': number of columns of the row
+    #                   'valid' : True if the numbers of the row can be parsed
+    #
+
+    index_path = get_row_index_path(filepath, index_folder=index_folder)
+
+    stat = os.stat(filepath)
+    if os.path.isfile(index_path):
+        try:
+            with np.load(index_path) as saved:
+                if saved['size'] == stat.st_size and saved['mtime'] == stat.st_mtime_ns:
+                    return dict(starts=saved['starts'], ends=saved['ends'], widths=saved['widths'],
+                                valid=saved['valid'])
+        except (OSError, ValueError, KeyError):
+            pass  # corrupted index or saved by an older version, build it again
+
+    row_index = build_row_index(filepath, chunk_size=chunk_size)
+
+    try:
+        np.savez(index_path, size=stat.st_size, mtime=stat.st_mtime_ns, **row_index)
+    except OSError:
+        print('WARNING: could not save row index ' + index_path)
+
+    return row_index
+
+
+def get_row_index_path(filepath, index_folder=None):
+    # Path of the row index of a recorder: <file>.rowidx.npz next to the file, or <hash>_<file>.rowidx.npz in
+    # index_folder with the hash of the absolute path of the file (the recorders of every ground motion have the
+    # same names)
+    if index_folder is None:
+        return filepath + '.rowidx.npz'
+    path_hash = hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest()[:16]
+    return os.path.join(index_folder, path_hash + '_' + os.path.basename(filepath) + '.rowidx.npz')
+
+
+def build_row_index(filepath, chunk_size=2**23):
+    # Scans an OpenSees text recorder to find where each row starts and ends and its number of columns
+    #
+    # INPUTS
+    #    filepath   = path to the .out file
+    #    chunk_size = number of bytes scanned per step
+    #
+    # OUTPUTS
+    #    row_index  = dictionary described in get_row_index
+    #
+
+    starts = []
+    ends = []
+    widths = []
+    valid = []
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # complete rows finish with an end of line
+                size = mm.rfind(b'\n') + 1
+                position = 0
+                while position < size:
+                    stop = min(position + chunk_size, size)
+                    if stop < size:
+                        # finish the chunk at the end of a row
+                        last_end = mm.rfind(b'\n', position, stop)
+                        if last_end < 0:
+                            last_end = mm.find(b'\n', stop)
+                        stop = last_end + 1
+                    chunk = np.frombuffer(mm[position:stop], dtype=np.uint8)
+
+                    # a number starts where a non blank character follows a blank character or the start of a row
+                    blank = (chunk == ord(' ')) | (chunk == ord('\t')) | (chunk == ord('\r')) | (chunk == ord('\n'))
+                    number_start = ~blank
+                    number_start[1:] &= blank[:-1]
+                    n_numbers = np.cumsum(number_start, dtype=np.int32)
+
+                    line_ends = np.flatnonzero(chunk == ord('\n'))
+                    line_widths = np.diff(np.concatenate(([0], n_numbers[line_ends])))
+                    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+
+                    keep = line_widths > 0
+                    starts.append(line_starts[keep] + position)
+                    ends.append(line_ends[keep] + position)
+                    widths.append(line_widths[keep])
+                    valid.append(get_valid_rows(mm[position:stop], line_widths)[keep])
+                    position = stop
+
+    if len(starts) == 0:
+        return dict(starts=np.zeros(0, dtype=np.int64), ends=np.zeros(0, dtype=np.int64),
+                    widths=np.zeros(0, dtype=np.int32), valid=np.zeros(0, dtype=bool))
+
+    return dict(starts=np.concatenate(starts).astype(np.int64), ends=np.concatenate(ends).astype(np.int64),
+                widths=np.concatenate(widths).astype(np.int32), valid=np.concatenate(valid))
+
+
+def get_valid_rows(buffer, widths):
+    # Flags the rows of a block of complete rows whose numbers can be parsed (same criteria of parse_recorder). The
+    # rows with the same number of columns are parsed together, row by row only if some of them are corrupted
+    #
+    # INPUTS
+    #    buffer = bytes with complete rows finished with an end of line
+    #    widths = 1D np.array with the number of columns of each row
+    #
+    # OUTPUTS
+    #    valid  = 1D np.array of bool, True for the rows with numbers only
+    #
+
+    lines = buffer.split(b'\n')[:-1]
+    valid = np.ones(len(lines), dtype=bool)
+    for width in np.unique(widths[widths > 0]):
+        group = np.flatnonzero(widths == width)
+        try:
+            np.loadtxt(io.BytesIO(b'\n'.join([lines[i] for i in group])), ndmin=2)
+        except ValueError:
+            for i in group:
+                try:
+                    [float(x) for x in lines[i].split()]
+                except ValueError:
+                    valid[i] = False
+
+    return valid
+
+
+def read_recorder_rows(filepath, rows, n_cols=None, index_folder=None):
+    # Reads only some rows of an OpenSees text recorder using the row index and a memory map of the file, so the
+    # rest of the time history is never loaded in memory
+    #
+    # INPUTS
+    #    filepath     = path to the .out file
+    #    rows         = int, list of int or slice with the rows desired (same numbering of read_recorder)
+    #    n_cols       = int or list of int with the number of columns that define a complete row
+    #                   None to take the most common number of columns
+    #    index_folder = path to folder to save the row index (None to save it next to the file)
+    #
+    # OUTPUTS
+    #    data         = 2D np.array (n_rows, n_cols) with the rows requested
+    #
+    # NOTES
+    #    Rows with corrupted numbers are flagged in the row index and skipped, so the rows have the same numbering
+    #    of read_recorder.
+    #
+
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+
+    dataset = get_archive_item(filepath)
+    if dataset is not None:
+        # archived recorders are typed arrays, so only the chunks with the rows desired are read
+        n_found, width = dataset.shape
+        if n_found == 0 or (n_cols is not None and width not in n_cols):
+            return np.zeros([0, 0 if n_cols is None else n_cols[0]])
+        selected = np.atleast_1d(np.arange(n_found)[rows])
+        if len(selected) == 0:
+            return np.zeros([0, width])
+        block = dataset[selected.min():selected.max() + 1]
+        return block[selected - selected.min()]
+
+    filepath = find_recorder(filepath)
+    if filepath.endswith('.bin'):
+        # binary files have fixed size rows, so they are indexed directly
+        data = read_binary_recorder(filepath, n_cols)
+        return data[rows].reshape(-1, data.shape[1])
+
+    row_index = get_row_index(filepath, index_folder=index_folder)
+    widths = row_index['widths']
+
+    # rows with the most common number of columns (same criteria of parse_recorder)
+    if n_cols is None:
+        candidates = widths
+    else:
+        candidates = widths[np.isin(widths, n_cols)]
+    if len(candidates) == 0:
+        return np.zeros([0, 0 if n_cols is None else n_cols[0]])
+    width = np.bincount(candidates).argmax()
+
+    # the rows with corrupted numbers are not counted, as parse_recorder drops them
+    selected = np.flatnonzero((widths == width) & row_index['valid'])[rows]
+    starts = np.atleast_1d(row_index['starts'][selected])
+    ends = np.atleast_1d(row_index['ends'][selected])
+    if len(starts) == 0:
+        return np.zeros([0, width])
+
+    with open(filepath, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if np.all(starts[1:] == ends[:-1] + 1):
+                # consecutive rows are taken as a single block of bytes
+                buffer = mm[starts[0]:ends[-1] + 1]
+            else:
+                buffer = b''.join([mm[start:end + 1] for start, end in zip(starts, ends)])
+
+    return parse_recorder(buffer, width)
+
+
+def read_response_history(filepath, n_cols=None, res_type='Max', t=0, index_folder=None):
+    # Reads the part of an element recorder needed by the *_response_time collectors
+    #
+    # INPUTS
+    #    filepath     = path to the .out file
+    #    n_cols       = int or list of int with the number of columns that define a complete row
+    #    res_type     = 'Max'  : reads the complete history
+    #                   'at_t' : reads only the row at index t
+    #                   'all_t': reads the complete history or only the rows in t if it is a slice
+    #    t            = index (or slice for 'all_t') of the rows desired
+    #    index_folder = path to folder to save the row index used to read some rows (None to save it next to the
+    #                   file), see get_row_index
+    #
+    # OUTPUTS
+    #    data         = 2D np.array (n_rows, n_cols) with the rows read
+    #    i_t          = index of the row t in data
+    #
+
+    if res_type == 'at_t':
+        data = read_recorder_rows(filepath, [t], n_cols, index_folder=index_folder)
+        i_t = 0
+    elif res_type == 'all_t' and type(t) == slice:
+        data = read_recorder_rows(filepath, t, n_cols, index_folder=index_folder)
+        i_t = t
+    else:
+        data = read_recorder(filepath, n_cols)
+        i_t = t
+
+    return data, i_t
+
+
+def pack_msa_results(msa_folder, archive_filename, stripe_folders=None, compression='gzip', chunk_rows=1024):
+    # Packs the raw results of an MSA (msa_folder/<stripe>/<gm>/*.out) in a single HDF5 archive with one typed
+    # array per recorder file, so the collectors read one file instead of thousands of small text files.
+    #
+    # INPUTS
+    #    msa_folder       = path to the folder with one subfolder per stripe (AnalysisResult/MSA)
+    #    archive_filename = path to the .h5 file to create (overwritten if it exists)
+    #    stripe_folders   = list with the name of the stripes to pack (None to pack all of them)
+    #    compression      = HDF5 compression filter for the recorder arrays (None for no compression)
+    #    chunk_rows       = number of rows per HDF5 chunk
+    #
+    # OUTPUTS
+    #    index            = pd.DataFrame with one row per file packed (also saved in the archive as 'index')
+    #
+    # ARCHIVE LAYOUT
+    #    /<stripe>/<gm>/<name>.out = 2D float64 array with the complete rows of the recorder (.out or .bin file)
+    #                                attrs: source, size, mtime_ns and the integrity report (final_row_complete,
+    #                                truncated, rows_dropped, blank_lines)
+    #    /<stripe>/<gm>/<file>     = 1D uint8 array with the raw content of any other file (e.g. MSA.txt)
+    #    /index                    = stripe, gm, file, source, n_rows, n_cols, size and mtime_ns of every file
+    #
+    # USAGE
+    #    Any path inside the archive can be given to the collectors instead of the raw folders, for example
+    #    collect_gmset_response(os.path.join(archive_filename, '72'), ...)
+    #
+
+    if stripe_folders is None:
+        stripe_folders = sorted([folder for folder in os.listdir(msa_folder)
+                                 if os.path.isdir(os.path.join(msa_folder, folder))])
+
+    close_archives(archive_filename)
+
+    index = []
+    with h5py.File(archive_filename, 'w') as hf:
+        hf.attrs['msa_folder'] = os.path.abspath(msa_folder)
+        for stripe in stripe_folders:
+            stripe_group = hf.create_group(stripe)
+            stripe_folder_path = os.path.join(msa_folder, stripe)
+            for gm_id in sorted(os.listdir(stripe_folder_path)):
+                results_folder = os.path.join(stripe_folder_path, gm_id)
+                if not os.path.isdir(results_folder):
+                    continue
+                gm_group = stripe_group.create_group(gm_id)
+
+                files = sorted(os.listdir(results_folder))
+                for file in files:
+                    filepath = os.path.join(results_folder, file)
+                    name, extension = os.path.splitext(file)
+                    if not os.path.isfile(filepath) or file.endswith('.rowidx.npz'):
+                        continue
+                    if extension == '.bin' and name + '.out' in files:
+                        continue  # the text file has priority as in find_recorder
+                    stat = os.stat(filepath)
+
+                    if extension == '.out' or extension == '.bin':
+                        data, integrity = read_recorder(filepath, report=True)
+                        data = np.array(data)
+
+                        key = name + '.out'
+                        if data.size > 0:
+                            dataset = gm_group.create_dataset(key, data=data, chunks=(min(len(data), chunk_rows),
+                                                              data.shape[1]), compression=compression,
+                                                              shuffle=compression is not None)
+                        else:
+                            dataset = gm_group.create_dataset(key, data=data)
+                        for key_report in ['final_row_complete', 'truncated', 'rows_dropped', 'blank_lines']:
+                            dataset.attrs[key_report] = integrity[key_report]
+                        n_rows, n_cols = data.shape
+                    else:
+                        with open(filepath, 'rb') as f:
+                            buffer = f.read()
+                        key = file
+                        dataset = gm_group.create_dataset(key, data=np.frombuffer(buffer, dtype=np.uint8))
+                        n_rows, n_cols = len(buffer), 0
+
+                    dataset.attrs['source'] = file
+                    dataset.attrs['size'] = stat.st_size
+                    dataset.attrs['mtime_ns'] = stat.st_mtime_ns
+                    index.append((stripe, gm_id, key, file, n_rows, n_cols, stat.st_size, stat.st_mtime_ns))
+
+        index = pd.DataFrame(index, columns=['stripe', 'gm', 'file', 'source', 'n_rows', 'n_cols', 'size',
+                                             'mtime_ns'])
+        index_type = np.dtype([('stripe', h5py.string_dtype()), ('gm', h5py.string_dtype()),
+                               ('file', h5py.string_dtype()), ('source', h5py.string_dtype()),
+                               ('n_rows', np.int64), ('n_cols', np.int64), ('size', np.int64), ('mtime_ns', np.int64)])
+        hf.create_dataset('index', data=np.array([tuple(row) for row in index.itertuples(index=False)],
+                                                 dtype=index_type))
+
+    return index
+
+
+def read_archive_index(archive_filename):
+    # Reads the index of an archive created by pack_msa_results
+    #
+    # INPUTS
+    #    archive_filename = path to the .h5 archive
+    #
+    # OUTPUTS
+    #    index            = pd.DataFrame with one row per file packed
+    #
+
+    with h5py.File(archive_filename, 'r') as hf:
+        index = pd.DataFrame(hf['index'][()])
+    for column in ['stripe', 'gm', 'file', 'source']:
+        index[column] = index[column].str.decode('utf-8')
+
+    return index
+
+
+archive_handles = dict()
+
+
+def split_archive_path(filepath):
+    # Splits a path inside an archive created by pack_msa_results, e.g. 'Bldg1.h5/72/RSN100_GM0/story1_drift.out'
+    #
+    # INPUTS
+    #    filepath         = path to a file or folder
+    #
+    # OUTPUTS
+    #    archive_filename = path to the .h5 archive (None if the path is not inside an archive)
+    #    inner_path       = path inside the archive
+    #
+
+    if '.h5' not in filepath:
+        return None, filepath
+
+    parts = os.path.normpath(filepath).split(os.sep)
+    for i_part in range(len(parts)):
+        if parts[i_part].endswith('.h5'):
+            archive_filename = os.sep.join(parts[:i_part + 1])
+            if os.path.isfile(archive_filename):
+                return archive_filename, '/'.join(parts[i_part + 1:])
+
+    return None, filepath
+
+
+def open_archive(archive_filename):
+    # Keeps one read-only handle per archive, reopened if the archive was packed again
+    mtime = os.stat(archive_filename).st_mtime_ns
+    if archive_filename in archive_handles and archive_handles[archive_filename][1] != mtime:
+        close_archives(archive_filename)
+    if archive_filename not in archive_handles:
+        archive_handles[archive_filename] = (h5py.File(archive_filename, 'r'), mtime)
+
+    return archive_handles[archive_filename][0]
+
+
+def close_archives(archive_filename=None):
+    # Closes the handle of an archive (None to close all of them)
+    if archive_filename is None:
+        archive_filenames = list(archive_handles.keys())
+    else:
+        archive_filenames = [archive_filename]
+
+    for archive_filename in archive_filenames:
+        if archive_filename in archive_handles:
+            archive_handles.pop(archive_filename)[0].close()
+
+
+def get_archive_item(filepath):
+    # Dataset or group of an archive created by pack_msa_results
+    #
+    # INPUTS
+    #    filepath = path inside the archive
+    #
+    # OUTPUTS
+    #    item     = h5py dataset or group (None if the path is not inside an archive)
+    #
+
+    archive_filename, inner_path = split_archive_path(filepath)
+    if archive_filename is None:
+        return None
+
+    hf = open_archive(archive_filename)
+    if inner_path == '':
+        return hf
+    if inner_path not in hf:
+        raise FileNotFoundError('No such file in archive: ' + filepath)
+
+    return hf[inner_path]
+
+
+def read_archived_recorder(dataset, n_cols=None, report=False):
+    # Same output as read_recorder for a recorder stored in an archive
+    if n_cols is not None:
+        n_cols = np.atleast_1d(n_cols).astype(int).tolist()
+
+    n_rows, width = dataset.shape
+    if n_rows == 0 or (n_cols is not None and width not in n_cols):
+        data = np.zeros([0, 0 if n_cols is None else n_cols[0]])
+    else:
+        data = dataset[()]
+    if not report:
+        return data
+
+    # report of the file when it was packed (archives packed before the report only have final_row_complete)
+    attrs = dataset.attrs
+    truncated = bool(attrs.get('truncated', False))
+    n_lines = n_rows + int(attrs.get('rows_dropped', 0)) - truncated
+    integrity = get_integrity_report(data, n_lines, int(attrs.get('blank_lines', 0)), truncated,
+                                     len(data) > 0 and bool(attrs['final_row_complete']))
+    return data, integrity
+
+
+def list_results(folder_path):
+    # Same output as os.listdir for folders of the raw results or inside an archive created by pack_msa_results
+    item = get_archive_item(folder_path)
+    if item is None:
+        return [file for file in os.listdir(folder_path) if not file.endswith('.rowidx.npz')]
+
+    return [key for key in item.keys() if not (item.name == '/' and key == 'index')]
+
+
+
+stripe_manifests = dict()
+
+
+def get_stripe_manifest(stripe_folder_path, manifest_folder=None, rescan=False):
+    # Lists the ground motions of a stripe with a single pass of os.scandir per folder, recording which files each
+    # ground motion has, their size and the content of MSA.txt, so the collectors know which runs did not finish
+    # without opening their files. The manifest is kept in memory (and in manifest_folder if given) and reused by
+    # the later calls: the files of each ground motion are listed again and MSA.txt is only read again for new
+    # ground motions, ground motions that had not finished and those with files added, resized or modified since
+    # the last scan (e.g. a ground motion run again in place).
+    #
+    # INPUTS
+    #    stripe_folder_path = path to the stripe folder (raw results or inside an archive created by pack_msa_results)
+    #    manifest_folder    = path to folder to save the manifest as <stripe>.manifest.json (None to keep it only in
+    #                         memory). Use one folder per building since the file is named after the stripe
+    #    rescan             = True to scan every ground motion again ignoring the previous scan
+    #
+    # OUTPUTS
+    #    manifest           = dictionary (None for tarballs and zip files)
+    #                         'stripe_folder_path': path to the stripe folder
+    #                         'gm_ids'            : list with the ground motion folders in the order listed
+    #                         'gms'               : dictionary per gm_id with
+    #                             'mtime_ns': modification time of the ground motion folder
+    #                             'files'   : dictionary with the size in bytes of each file (filename: size)
+    #                             'files_mtime_ns': modification time of the newest file
+    #                             'msa'     : content of MSA.txt (None if missing)
+    #                             'status'  : 'finished', 'no_acc_env', 'no_drift' or 'no_msa' (see get_gm_status)
+    #
+
+    stripe_key = os.path.normpath(os.path.abspath(stripe_folder_path))
+    if split_archive_path(stripe_folder_path)[0] is not None:
+        return get_archive_manifest(stripe_folder_path, rescan=rescan)
+    if not os.path.isdir(stripe_folder_path):
+        return None
+
+    # Previous scan of the stripe
+    manifest_path = None
+    if manifest_folder is not None:
+        manifest_path = os.path.join(manifest_folder, os.path.basename(stripe_key) + '.manifest.json')
+    previous = None
+    if not rescan:
+        previous = stripe_manifests.get(stripe_key)
+        if previous is None and manifest_path is not None and os.path.isfile(manifest_path):
+            try:
+                with open(manifest_path, 'r') as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = None  # corrupted manifest, scan everything again
+    if previous is None:
+        previous = dict(gm_ids=[], gms=dict())
+
+    manifest = dict(stripe_folder_path=stripe_folder_path, gm_ids=[], gms=dict())
+    with os.scandir(stripe_folder_path) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            gm_id = entry.name
+            mtime_ns = entry.stat().st_mtime_ns
+            files, files_mtime_ns = list_gm_files(entry.path)
+            gm = previous['gms'].get(gm_id)
+            if gm is None or gm['status'] != 'finished' or gm['files'] != files or \
+                    gm.get('files_mtime_ns') != files_mtime_ns:
+                gm = scan_gm_folder(entry.path, files=files, files_mtime_ns=files_mtime_ns)
+            gm['mtime_ns'] = mtime_ns
+            manifest['gm_ids'].append(gm_id)
+            manifest['gms'][gm_id] = gm
+
+    # Keep the order of the previous scan so the rows of the collected tables do not move
+    order = dict([(gm_id, i) for i, gm_id in enumerate(previous['gm_ids'])])
+    manifest['gm_ids'].sort(key=lambda gm_id: order.get(gm_id, len(order)))
+
+    stripe_manifests[stripe_key] = manifest
+    if manifest_path is not None:
+        try:
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f)
+        except OSError:
+            print('WARNING: could not save manifest ' + manifest_path)
+
+    return manifest
+
+
+def list_gm_files(results_folder):
+    # Size of each file of a ground motion folder (filename: size) and modification time of the newest one
+    files = dict()
+    files_mtime_ns = 0
+    with os.scandir(results_folder) as entries:
+        for entry in entries:
+            if entry.is_file() and not entry.name.endswith('.rowidx.npz'):
+                stat = entry.stat()
+                files[entry.name] = stat.st_size
+                files_mtime_ns = max(files_mtime_ns, stat.st_mtime_ns)
+
+    return files, files_mtime_ns
+
+
+def scan_gm_folder(results_folder, files=None, files_mtime_ns=None):
+    # Entry of the manifest for one ground motion folder (see get_stripe_manifest), files and files_mtime_ns are
+    # listed here if not given (see list_gm_files)
+    if files is None:
+        files, files_mtime_ns = list_gm_files(results_folder)
+
+    msa = None
+    if files.get('MSA.txt', 0) > 0:
+        with open(os.path.join(results_folder, 'MSA.txt'), 'r') as f:
+            msa = f.read()
+
+    return dict(mtime_ns=None, files=files, files_mtime_ns=files_mtime_ns, msa=msa, status=get_gm_status(files))
+
+
+def get_archive_manifest(stripe_folder_path, rescan=False):
+    # Manifest of a stripe inside an archive created by pack_msa_results, built from the index of the archive
+    archive_filename, inner_path = split_archive_path(stripe_folder_path)
+    stripe_key = (os.path.abspath(archive_filename), inner_path, os.stat(archive_filename).st_mtime_ns)
+    if not rescan and stripe_key in stripe_manifests:
+        return stripe_manifests[stripe_key]
+
+    index = read_archive_index(archive_filename)
+    index = index[index['stripe'] == inner_path.strip('/')]
+
+    manifest = dict(stripe_folder_path=stripe_folder_path, gm_ids=[], gms=dict())
+    for gm_id in list_results(stripe_folder_path):
+        index_gm = index[index['gm'] == gm_id]
+        files = dict(zip(index_gm['file'], index_gm['size'].astype(int).tolist()))
+        msa = None
+        if files.get('MSA.txt', 0) > 0:
+            msa = get_archive_item(os.path.join(stripe_folder_path, gm_id, 'MSA.txt'))[()].tobytes().decode()
+        files_mtime_ns = int(index_gm['mtime_ns'].to_numpy().max(initial=0))
+        manifest['gm_ids'].append(gm_id)
+        manifest['gms'][gm_id] = dict(mtime_ns=None, files=files, files_mtime_ns=files_mtime_ns, msa=msa,
+                                      status=get_gm_status(files))
+
+    stripe_manifests[stripe_key] = manifest
+
+    return manifest
+
+
+def get_gm_signature(manifest, gm_id):
+    # Identifies the state of the files of a ground motion, so a ground motion run again after it was collected is
+    # noticed
+    #
+    # INPUTS
+    #    manifest  = output of get_stripe_manifest
+    #    gm_id     = name of the ground motion folder
+    #
+    # OUTPUTS
+    #    signature = str with the size of every file and the modification time of the newest one
+    #
+
+    gm = manifest['gms'][gm_id]
+    return json.dumps([gm.get('files_mtime_ns'), sorted(gm['files'].items())])
+
+
+def get_gm_status(files):
+    # Classifies a ground motion from the files in its folder without opening them
+    #
+    # INPUTS
+    #    files  = dictionary with the size in bytes of each file of the ground motion (filename: size)
+    #
+    # OUTPUTS
+    #    status = 'no_acc_env': story0_acc_env.out missing or empty (envelopes are only written when the RHA ends)
+    #             'no_drift'  : no storyN_drift.out file with results
+    #             'no_msa'    : MSA.txt missing or empty (OpenSees writes it when the RHA ends)
+    #             'finished'  : otherwise
+    #
+
+    acc_size = files.get('story0_acc_env.out', files.get('story0_acc_env.bin', 0))
+    if acc_size == 0:
+        return 'no_acc_env'
+
+    drift_available = False
+    for filename in files:
+        name, extension = os.path.splitext(filename)
+        if (name.startswith('story') and name.endswith('_drift') and name != 'story0_drift' and
+                extension in ['.out', '.bin'] and files[filename] > 0):
+            drift_available = True
+            break
+    if not drift_available:
+        return 'no_drift'
+
+    if files.get('MSA.txt', 0) == 0:
+        return 'no_msa'
+
+    return 'finished'
+
+
+stream_archive_extensions = ['.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar', '.zip']
+
+
+def find_stream_archive(stripe_folder_path):
+    # Finds the tarball or zip file that holds the results of a stripe when the folder itself does not exist, either
+    # with the name of the stripe folder (.../MSA/72.tar.gz) or given as a path inside the archive (.../MSA.zip/72)
+    #
+    # INPUTS
+    #    stripe_folder_path = path to the stripe folder
+    #
+    # OUTPUTS
+    #    archive_filename   = path to the archive (None if the results are not in a tarball or zip file)
+    #    stripe             = name of the stripe folder inside the archive
+    #    strict             = True if the members must be inside the stripe folder (archive with several stripes)
+    #
+
+    if os.path.isdir(stripe_folder_path) or split_archive_path(stripe_folder_path)[0] is not None:
+        return None, None, False
+
+    stripe_folder_path = os.path.normpath(stripe_folder_path)
+    for extension in stream_archive_extensions:
+        if os.path.isfile(stripe_folder_path + extension):
+            return stripe_folder_path + extension, os.path.basename(stripe_folder_path), False
+
+    parent, stripe = os.path.split(stripe_folder_path)
+    if os.path.isfile(parent) and parent.endswith(tuple(stream_archive_extensions)):
+        return parent, stripe, True
+
+    return None, None, False
+
+
+def split_member_name(name, stripe, strict):
+    # Ground motion and file name of a member of a tarball or zip file
+    #
+    # INPUTS
+    #    name     = name of the member (e.g. '72/RSN100_GM0/story1_drift.out')
+    #    stripe   = name of the stripe folder
+    #    strict   = True if the member must be inside the stripe folder
+    #
+    # OUTPUTS
+    #    gm_id    = name of the ground motion folder (None if the member is not part of the stripe)
+    #    filename = name of the file (None for the folder of the ground motion)
+    #
+
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ['', '.']]
+    if stripe in parts:
+        parts = parts[parts.index(stripe) + 1:]
+    elif strict:
+        return None, None
+
+    if len(parts) == 1:
+        return parts[0], None
+    if len(parts) == 2:
+        return parts[0], parts[1]
+
+    return None, None
+
+
+def iter_archive_members(archive_filename, stripe, strict=False):
+    # Reads the members of a tarball or zip file ground motion by ground motion. Tarballs are decompressed as a single
+    # stream, so the files of each ground motion must be stored together (as done by tar -czf)
+    #
+    # INPUTS
+    #    archive_filename = path to the .tar.gz, .tgz, .tar.bz2, .tar.xz, .tar or .zip file
+    #    stripe           = name of the stripe folder
+    #    strict           = True if the members must be inside the stripe folder
+    #
+    # OUTPUTS
+    #    generator of gm_id, files (dictionary with the content in bytes of each file of the ground motion)
+    #
+
+    if archive_filename.endswith('.zip'):
+        with zipfile.ZipFile(archive_filename) as zf:
+            gm_members = dict()
+            for info in zf.infolist():
+                gm_id, filename = split_member_name(info.filename, stripe, strict)
+                if gm_id is None:
+                    continue
+                if gm_id not in gm_members:
+                    gm_members[gm_id] = []
+                if filename is not None and not info.is_dir():
+                    gm_members[gm_id].append((filename, info))
+            for gm_id in gm_members:
+                yield gm_id, dict([(filename, zf.read(info)) for filename, info in gm_members[gm_id]])
+        return
+
+    with tarfile.open(archive_filename, 'r|*') as tf:
+        gm_done = []
+        current_gm = None
+        files = dict()
+        for member in tf:
+            gm_id, filename = split_member_name(member.name, stripe, strict)
+            if gm_id is None:
+                continue
+            if gm_id != current_gm:
+                if current_gm is not None:
+                    gm_done.append(current_gm)
+                    yield current_gm, files
+                if gm_id in gm_done:
+                    raise ValueError('Files of ' + gm_id + ' are not stored together in ' + archive_filename +
+                                     ', create the archive again with tar -czf')
+                current_gm = gm_id
+                files = dict()
+            if filename is not None and member.isfile():
+                files[filename] = tf.extractfile(member).read()
+        if current_gm is not None:
+            yield current_gm, files
+
+
+def read_whole_file(filepath):
+    # Content of a file in bytes (None if it can not be read, e.g. it was deleted after listing the folder)
+    try:
+        with open(filepath, 'rb') as file:
+            return file.read()
+    except OSError:
+        return None
+
+def prefetch_gm_files(results_folder, listing, executor, max_size=2**20):
+    # Starts reading in the background the recorder files of a ground motion that are small enough to read whole
+    # (envelopes, end states, MSA.txt), so the latency of network filesystems is overlapped with the parsing of
+    # the previous ground motions. Larger files (element time histories) are left to read only their last rows.
+    #
+    # INPUTS
+    #    results_folder = path to the ground motion folder
+    #    listing        = dictionary with the size in bytes of each file (filename: size), see get_stripe_manifest
+    #    executor       = concurrent.futures.ThreadPoolExecutor to read the files
+    #    max_size       = files larger than this [bytes] are not prefetched
+    #
+    # OUTPUTS
+    #    futures        = dictionary with the future of the content of each file (filename: future)
+    #
+
+    futures = dict()
+    for filename in listing:
+        if 0 < listing[filename] <= max_size:
+            futures[filename] = executor.submit(read_whole_file, os.path.join(results_folder, filename))
+    return futures
+
+def get_prefetched(futures):
+    # Waits for the files started with prefetch_gm_files and returns their content (filename: bytes)
+    prefetched = dict()
+    for filename in futures:
+        data = futures[filename].result()
+        if data is not None:
+            prefetched[filename] = data
+    return prefetched
+
+def iter_gm_results(stripe_folder_path, manifest=None, prefetch=0, prefetch_size=2**20, prefetch_threads=16):
+    # Goes through the ground motions of a stripe whether the results are raw folders, an archive created by
+    # pack_msa_results or a tarball/zip file (read as a stream, without extracting it)
+    #
+    # INPUTS
+    #    stripe_folder_path = path to the stripe folder (see find_stream_archive for tarballs and zip files)
+    #    manifest           = output of get_stripe_manifest to take the ground motions and their files from
+    #                         (None to list the folders here)
+    #    prefetch           = number of ground motions ahead whose small files are read in background threads while
+    #                         the current one is parsed, e.g. 4 on network filesystems (0 to read them when needed).
+    #                         Only for raw folders listed in a manifest
+    #    prefetch_size      = files larger than this [bytes] are not prefetched (see prefetch_gm_files)
+    #    prefetch_threads   = number of threads reading the files
+    #
+    # OUTPUTS
+    #    generator of gm_id, results_folder, cache
+    #        gm_id          = name of the ground motion folder
+    #        results_folder = path to the ground motion folder (virtual path for tarballs and zip files)
+    #        cache          = RecorderCache of the ground motion, cleared when the generator moves to the next one
+    #
+
+    if manifest is not None and (prefetch <= 0 or split_archive_path(stripe_folder_path)[0] is not None):
+        for gm_id in manifest['gm_ids']:
+            results_folder = os.path.join(stripe_folder_path, gm_id)
+            with RecorderCache(results_folder, listing=manifest['gms'][gm_id]['files']) as cache:
+                yield gm_id, results_folder, cache
+        return
+
+    if manifest is not None:
+        gm_ids = manifest['gm_ids']
+        with concurrent.futures.ThreadPoolExecutor(max_workers=prefetch_threads) as executor:
+            pending = collections.deque()
+            try:
+                for i, gm_id in enumerate(gm_ids):
+                    # keep the next ground motions being read
+                    while len(pending) <= prefetch and i + len(pending) < len(gm_ids):
+                        gm_next = gm_ids[i + len(pending)]
+                        pending.append(prefetch_gm_files(os.path.join(stripe_folder_path, gm_next),
+                                                         manifest['gms'][gm_next]['files'], executor,
+                                                         max_size=prefetch_size))
+                    results_folder = os.path.join(stripe_folder_path, gm_id)
+                    listing = manifest['gms'][gm_id]['files']
+                    with RecorderCache(results_folder, listing=listing,
+                                       prefetched=get_prefetched(pending.popleft())) as cache:
+                        yield gm_id, results_folder, cache
+            finally:
+                # do not wait for the files of ground motions that will not be used
+                for futures in pending:
+                    for filename in futures:
+                        futures[filename].cancel()
+        return
+
+    archive_filename, stripe, strict = find_stream_archive(stripe_folder_path)
+    if archive_filename is None:
+        for gm_id in list_results(stripe_folder_path):
+            results_folder = os.path.join(stripe_folder_path, gm_id)
+            with RecorderCache(results_folder) as cache:
+                yield gm_id, results_folder, cache
+        return
+
+    for gm_id, files in iter_archive_members(archive_filename, stripe, strict):
+        results_folder = os.path.join(stripe_folder_path, gm_id)
+        files = dict([(os.path.join(results_folder, filename), files[filename]) for filename in files])
+        with RecorderCache(results_folder, files=files) as cache:
+            yield gm_id, results_folder, cache
+
+def get_gm_integrity(results_folder, cache=None):
+    # Integrity report of every recorder file of a ground motion, e.g. to find out how far an inconvergent run got
+    #
+    # INPUTS
+    #    results_folder = path to folder with the results of NLRHA
+    #    cache          = RecorderCache of the ground motion to reuse the files already read (None to read them here)
+    #
+    # OUTPUTS
+    #    integrity      = pd.DataFrame with one row per recorder file and the keys of get_integrity_report as columns
+    #
+
+    if cache is None:
+        cache = RecorderCache(results_folder)
+
+    if cache.in_memory:
+        filenames = [os.path.basename(filepath) for filepath in cache.buffers]
+    elif cache.listing is not None:
+        filenames = list(cache.listing)
+    else:
+        filenames = list_results(results_folder)
+
+    # binary recorders are read with the name of the .out file
+    filenames = sorted(set([filename[:-len('.bin')] + '.out' if filename.endswith('.bin') else filename
+                            for filename in filenames]))
+
+    integrity = dict()
+    for filename in filenames:
+        if filename.endswith('.out'):
+            integrity[filename] = cache.integrity(os.path.join(results_folder, filename))
+
+    return pd.DataFrame.from_dict(integrity, orient='index')
+
+
+class RecorderCache:
+    # Keeps the recorder files of one ground motion folder already read and parsed, so every collector that needs
+    # a file reuses it instead of reading it again. Create one per ground motion and clear it (or leave the with
+    # block) once the folder is collected to release the memory.
+    #
+    # INPUTS
+    #    results_folder = path to folder with the results of NLRHA of the ground motion (for reference only)
+    #    files          = dictionary with the content in bytes of every file of the ground motion (path: bytes) when
+    #                     the files are not in disk, e.g. read from a tarball (None to read the files from disk)
+    #    listing        = filenames in the ground motion folder, e.g. from get_stripe_manifest, so the files that do
+    #                     not exist are known without looking for them (None to look for them in disk)
+    #    prefetched     = dictionary with the content in bytes of some files of the folder already read from disk
+    #                     (filename: bytes), see prefetch_gm_files. The other files are read from disk when needed
+    #    n_threads      = number of threads to read several files at once with preload (1 to read them one by one)
+    #
+    # USAGE
+    #    with RecorderCache(results_folder) as cache:
+    #        pfa_gm = get_EDPstory_response(results_folder, n_stories, 'acc_env', cache=cache)
+    #        ...
+    #
+    # NOTES
+    #    Files are identified by their full path. Missing files are remembered too, so a probe that fails is not
+    #    repeated. The arrays returned are shared between callers and are read-only.
+    #
+
+    def __init__(self, results_folder=None, files=None, listing=None, prefetched=None, n_threads=8):
+        self.results_folder = results_folder
+        self.listing = listing
+        self.n_threads = n_threads
+        self.buffers = dict()
+        self.parsed = dict()
+        self.reports = dict()
+        self.tails = dict()
+        self.missing = dict()
+
+        # files given in memory are the only files of the ground motion
+        self.in_memory = files is not None
+        self.binary = set()
+        if self.in_memory:
+            self.add_buffers(files, files)
+        if prefetched is not None:
+            self.add_buffers(dict([(os.path.join(results_folder, filename), prefetched[filename])
+                                   for filename in prefetched]),
+                             listing if listing is not None else prefetched, folder=results_folder)
+
+    def add_buffers(self, files, names, folder=None):
+        # Keeps the content of the files already read (path: bytes). names are the files of the folder (paths, or
+        # filenames inside folder) to find out if a .bin file is the only output of its recorder
+        for filepath in files:
+            filepath_out = filepath[:-len('.bin')] + '.out'
+            name_out = filepath_out if folder is None else os.path.basename(filepath_out)
+            if filepath.endswith('.bin') and name_out not in names:
+                # binary recorders are requested with the name of the .out file
+                self.buffers[filepath_out] = files[filepath]
+                self.binary.add(filepath_out)
+            else:
+                self.buffers[filepath] = files[filepath]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.clear()
+
+    def clear(self):
+        # Evicts every file of the ground motion
+        self.buffers.clear()
+        self.binary.clear()
+        self.parsed.clear()
+        self.reports.clear()
+        self.tails.clear()
+        self.missing.clear()
+
+    def is_listed(self, filepath):
+        # False only if the listing of the folder is known and the file (.out or .bin) is not in it
+        if self.listing is None or os.path.dirname(filepath) != self.results_folder:
+            return True
+        filename = os.path.basename(filepath)
+        return filename in self.listing or (filename.endswith('.out') and filename[:-len('.out')] + '.bin' in
+                                            self.listing)
+
+    def check_listed(self, filepath):
+        if filepath in self.missing:
+            raise self.missing[filepath]
+        if not self.is_listed(filepath):
+            self.missing[filepath] = FileNotFoundError('No such file: ' + filepath)
+            raise self.missing[filepath]
+
+    def exists(self, filepath):
+        if filepath in self.buffers or filepath in self.parsed or filepath in self.tails:
+            return True
+        if filepath in self.missing or self.in_memory or not self.is_listed(filepath):
+            return False
+        try:
+            if get_archive_item(filepath) is not None:
+                return True
+        except FileNotFoundError:
+            return False
+        return os.path.isfile(find_recorder(filepath))
+
+    def read_bytes(self, filepath):
+        # Content of the file as bytes (read from disk only once)
+        if filepath not in self.buffers:
+            self.check_listed(filepath)
+            if self.in_memory:
+                raise FileNotFoundError('No such file: ' + filepath)
+            try:
+                dataset = get_archive_item(filepath)
+                if dataset is not None:
+                    self.buffers[filepath] = dataset[()].tobytes()
+                else:
+                    with open(find_recorder(filepath), 'rb') as f:
+                        self.buffers[filepath] = f.read()
+            except OSError as error:
+                self.missing[filepath] = error
+                raise
+        return self.buffers[filepath]
+
+    def read(self, filepath, n_cols=None):
+        # Same output as read_recorder(filepath, n_cols)
+        key = (filepath, _cols_key(n_cols))
+        if key not in self.parsed:
+            self.check_listed(filepath)
+            if filepath in self.binary:
+                data, integrity = parse_binary_recorder(self.read_bytes(filepath), n_cols, report=True)
+            elif self.in_memory or filepath in self.buffers or (find_recorder(filepath).endswith('.out') and
+                                                                split_archive_path(filepath)[0] is None):
+                data, integrity = parse_recorder(self.read_bytes(filepath), n_cols, report=True)
+            else:
+                try:
+                    data, integrity = read_recorder(filepath, n_cols, report=True)
+                except OSError as error:
+                    self.missing[filepath] = error
+                    raise
+            data.setflags(write=False)
+            self.parsed[key] = data
+            self.reports[key] = integrity
+        return self.parsed[key]
+
+    def preload(self, filepaths, n_cols=None):
+        # Reads and parses at once the files that will be requested with read(filepath, n_cols), e.g. the file of
+        # every story, so the waits for the disk overlap. The files that can not be read are left for read to raise
+        # the error when requested
+        filepaths = [filepath for filepath in dict.fromkeys(filepaths)
+                     if (filepath, _cols_key(n_cols)) not in self.parsed and filepath not in self.buffers and
+                     filepath not in self.missing and split_archive_path(filepath)[0] is None]
+        if self.in_memory or self.n_threads <= 1 or len(filepaths) <= 1:
+            # nothing to wait for (files in memory or a single file)
+            return
+
+        def read_file(filepath):
+            try:
+                self.read(filepath, n_cols)
+            except Exception:
+                pass
+
+        list(get_file_pool(self.n_threads).map(read_file, filepaths))
+
+    def integrity(self, filepath, n_cols=None):
+        # Integrity report of the file parsed by read(filepath, n_cols), see get_integrity_report
+        self.read(filepath, n_cols)
+        return self.reports[(filepath, _cols_key(n_cols))]
+
+    def in_memory_files(self):
+        # Files given in memory with their original names, e.g. to send them to another process (None if the files
+        # are read from disk)
+        if not self.in_memory:
+            return None
+        files = dict()
+        for filepath in self.buffers:
+            if filepath in self.binary:
+                files[filepath[:-len('.out')] + '.bin'] = self.buffers[filepath]
+            else:
+                files[filepath] = self.buffers[filepath]
+        return files
+
+    def read_text(self, filepath):
+        # Content of a text file (e.g. MSA.txt)
+        return self.read_bytes(filepath).decode()
+
+    def final_row_complete(self, filepath, n_cols):
+        # True if the last row written in the file has n_cols values (the run was not killed while writing it)
+        return self.integrity(filepath, n_cols)['final_row_complete']
+
+    def tail(self, filepath, n_cols=None, n_rows=1, min_cols=None):
+        # Same output as read_last_rows(filepath, n_cols, n_rows, min_cols)
+        key = (filepath, _cols_key(n_cols), n_rows, min_cols)
+        key_parsed = (filepath, _cols_key(n_cols))
+        if key not in self.tails and min_cols is None and len(key_parsed[1] or []) == 1 and \
+                key_parsed in self.parsed:
+            # index the rows of the file already parsed instead of reading its end again
+            rows = select_last_rows(self.parsed[key_parsed], n_cols, n_rows)
+            rows.setflags(write=False)
+            self.tails[key] = rows
+        if key not in self.tails and min_cols is None and key_parsed[1] is not None:
+            # take the rows from the end of the file already read for more alternatives of n_cols, e.g. the frac_*.out
+            # files read by get_beam_response and then by get_DSC
+            for key_read, rows_read in self.tails.items():
+                if key_read[0] == filepath and key_read[3] is None and key_read[1] is not None and \
+                        key_read[2] >= n_rows and set(key_parsed[1]) <= set(key_read[1]) and \
+                        (len(rows_read) == 0 or rows_read.shape[1] in key_parsed[1]):
+                    rows = np.array(rows_read[max(len(rows_read) - n_rows, 0):]) if len(rows_read) > 0 else \
+                        np.zeros([0, 0])
+                    rows.setflags(write=False)
+                    self.tails[key] = rows
+                    break
+        if key not in self.tails:
+            self.check_listed(filepath)
+            try:
+                if filepath in self.binary:
+                    rows = select_last_rows(parse_binary_recorder(self.read_bytes(filepath), n_cols), n_cols, n_rows,
+                                            1 if min_cols is None else min_cols)
+                elif self.in_memory or filepath in self.buffers:
+                    rows = read_last_rows(filepath, n_cols, n_rows=n_rows, min_cols=min_cols,
+                                          buffer=self.read_bytes(filepath))
+                else:
+                    rows = read_last_rows(filepath, n_cols, n_rows=n_rows, min_cols=min_cols)
+            except OSError as error:
+                self.missing[filepath] = error
+                raise
+            rows.setflags(write=False)
+            self.tails[key] = rows
+        return self.tails[key]
+
+
+file_pools = dict()
+
+
+def get_file_pool(n_threads):
+    # Thread pool shared by every RecorderCache of this process to read files (a pool inherited from the parent
+    # process has no threads, so each process creates its own)
+    key = (os.getpid(), n_threads)
+    if key not in file_pools:
+        file_pools[key] = concurrent.futures.ThreadPoolExecutor(max_workers=n_threads)
+    return file_pools[key]
+
+
+def _cols_key(n_cols):
+    if n_cols is None:
+        return None
+    return tuple(np.atleast_1d(n_cols).astype(int).tolist())
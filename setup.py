@@ -11,6 +11,9 @@ setup(name='frame_postprocess',
       packages=find_packages(),
       include_package_data=True,
       platforms='any',
+      entry_points={
+             'console_scripts': ['frame-postprocess=frame_postprocess.cli:main'],
+      },
       install_requires=[
              'numpy',
              'pandas',
@@ -18,6 +21,9 @@ setup(name='frame_postprocess',
              'matplotlib',
              'scipy',
       ],
+      extras_require={
+             'parquet': ['pyarrow'],
+      },
       classifiers = [
              'Programming Language :: Python',
              'Natural Language :: English',
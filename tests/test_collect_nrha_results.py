@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+
+from frame_postprocess.collect_nrha_results import collect_gmset_response
+from frame_postprocess.recorder_io import stripe_manifests
+
+beam_list = np.array([[1, 1], [1, 1]])
+column_list = np.array([[1, 1, 1], [1, 1, 1]])
+splice_list = np.zeros([2, 3])
+
+
+def write_gm(gm_folder, peak_drift, msa='0.02000\n'):
+    # raw results of a ground motion of a 2 story frame
+    os.makedirs(gm_folder, exist_ok=True)
+    rows = dict()
+    for story in range(3):
+        rows['story%d_acc_env.out' % story] = [[-0.3], [0.2], [0.3]]
+    for story in range(1, 3):
+        drift = np.linspace(0, peak_drift / story, 50)
+        rows['story%d_drift_env.out' % story] = [[drift.min()], [drift.max()], [np.abs(drift).max()]]
+        rows['story%d_drift.out' % story] = np.c_[np.arange(50) * 0.01, drift]
+    for filename, data in rows.items():
+        np.savetxt(os.path.join(gm_folder, filename), data)
+    with open(os.path.join(gm_folder, 'MSA.txt'), 'w') as f:
+        f.write(msa)
+
+
+def collect(stripe_folder, **kwargs):
+    return collect_gmset_response(stripe_folder, beam_list, False, 1, False, splice_list, column_list, **kwargs)
+
+
+def test_collect_gm_run_again_in_place(tmp_path):
+    stripe_folder = str(tmp_path / 'MSA' / '475')
+    manifest_folder = str(tmp_path / 'manifests')
+    os.makedirs(manifest_folder)
+    write_gm(os.path.join(stripe_folder, 'RSN100_GM0'), 0.01)
+    write_gm(os.path.join(stripe_folder, 'RSN101_GM1'), 0.02)
+
+    results = collect(stripe_folder, manifest_folder=manifest_folder)
+    assert list(results['EndCriteria']) == ['nonCollapse', 'nonCollapse']
+    assert np.isclose(results.iloc[0, 1], 0.01)
+
+    # the ground motion is run again overwriting its files, so the folder keeps its modification time
+    gm_folder = os.path.join(stripe_folder, 'RSN100_GM0')
+    mtime_ns = os.stat(gm_folder).st_mtime_ns
+    write_gm(gm_folder, 0.15, msa='Collapsed\n')
+    os.utime(gm_folder, ns=(mtime_ns, mtime_ns))
+
+    for _ in range(2):
+        results = collect(stripe_folder, manifest_folder=manifest_folder)
+        assert list(results['EndCriteria']) == ['MaxDrift', 'nonCollapse']
+        assert np.isclose(results.iloc[0, 1], 0.15)
+        # the manifest saved in manifest_folder is also up to date in a new process
+        stripe_manifests.clear()
+
+    results = collect(stripe_folder, rescan=True)
+    assert list(results['EndCriteria']) == ['MaxDrift', 'nonCollapse']
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from frame_postprocess.recorder_io import read_last_rows, parse_recorder, read_recorder, read_recorder_rows, \
+    get_row_index
+
+
+def write_recorder(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 8, 64, 65536])
+def test_read_last_rows_truncated_row_longer_than_block(tmp_path, block_size):
+    # the run was killed while writing a row longer than a block
+    content = b'0.0 1.0 2.0\n0.1 1.1 2.1\n\n0.2 1.2 2.2\n' + b'0.3 1.3 2.3 ' * 5
+    filepath = write_recorder(tmp_path / 'hinge_left.out', content)
+    expected = parse_recorder(content, 3)
+
+    for n_rows in [1, 2, 5]:
+        rows = read_last_rows(filepath, 3, n_rows=n_rows, block_size=block_size)
+        np.testing.assert_array_equal(rows, expected[-n_rows:])
+        rows = read_last_rows(filepath, 3, n_rows=n_rows, block_size=block_size, buffer=content)
+        np.testing.assert_array_equal(rows, expected[-n_rows:])
+
+
+@pytest.mark.parametrize('block_size', [1, 8, 65536])
+def test_read_last_rows_without_complete_rows(tmp_path, block_size):
+    for content in [b'', b'0.3 1.3 2.3 0.3 1.3', b'\n\n', b'0.1 1.1\n0.2 1.2\n']:
+        filepath = write_recorder(tmp_path / 'frac_LB.out', content)
+        assert read_last_rows(filepath, 3, block_size=block_size).shape == (0, 0)
+        assert read_last_rows(filepath, 3, block_size=block_size, buffer=content).shape == (0, 0)
+
+
+def test_read_last_rows_max_lines(tmp_path):
+    # the rows desired are far from the end of the file
+    content = b'0.0 1.0 2.0\n' + b'0.1 1.1\n' * 100
+    filepath = write_recorder(tmp_path / 'pz_rot.out', content)
+
+    assert read_last_rows(filepath, 3, max_lines=50).shape == (0, 0)
+    np.testing.assert_array_equal(read_last_rows(filepath, 3, max_lines=None), [[0.0, 1.0, 2.0]])
+
+
+@pytest.mark.parametrize('chunk_size', [16, 2 ** 23])
+def test_read_recorder_rows_with_corrupted_rows(tmp_path, chunk_size):
+    # ragged file with a row of corrupted numbers before the rows desired
+    lines = [' '.join(['%.1f' % (i + j / 10) for j in range(6)]) for i in range(200)]
+    lines[40] = '0.1 0.2'
+    lines[91] = '9.1 -nan(ind) 9.3 9.4 9.5 9.6'
+    lines[120] = ''
+    filepath = write_recorder(tmp_path / 'hinge_left.out', ('\n'.join(lines) + '\n').encode())
+    expected = read_recorder(filepath, 6)
+    get_row_index(filepath, chunk_size=chunk_size)
+
+    for rows in [150, [0, 89, 90, 91, 150], slice(80, 100), slice(-3, None)]:
+        np.testing.assert_array_equal(read_recorder_rows(filepath, rows, 6).reshape(-1, 6),
+                                      expected[rows].reshape(-1, 6))